@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.db.export import flatten_payload
+
+# Encodings of GET /daos/{id}/metrics/history
+HISTORY_ENCODINGS = ("rows", "columns", "delta")
+
+FieldValue = Optional[Union[int, float, str]]
+
+# (timestamp, payload) points in time order
+HistoryPoints = Sequence[Tuple[datetime, Dict[str, Any]]]
+
+
+def flatten_point(payload: Dict[str, Any]) -> Dict[str, FieldValue]:
+    """
+    Flatten a payload to dotted field names, keeping numbers as numbers.
+
+    Integral values are returned as ints, so that counts are not sent as
+    "18671.0".
+    """
+    point: Dict[str, FieldValue] = {}
+    for field, value, value_text in flatten_payload(payload):
+        if value is None:
+            point[field] = value_text
+        else:
+            point[field] = int(value) if value.is_integer() else value
+    return point
+
+
+def encode_rows(points: HistoryPoints) -> List[Dict[str, Any]]:
+    """The full payload of every point (the default encoding)."""
+    return [{"timestamp": timestamp, "data": payload} for timestamp, payload in points]
+
+
+def encode_columns(points: HistoryPoints) -> Dict[str, Any]:
+    """
+    One array per field, aligned with the timestamps array.
+
+    Numeric fields go to ``fields`` and can be plotted as they are; other
+    values (strings, booleans, lists as JSON) go to ``text_fields``. A
+    field missing from a point is null there.
+    """
+    flat = [flatten_point(payload) for _, payload in points]
+    columns: Dict[str, List[FieldValue]] = {}
+    for i, values in enumerate(flat):
+        for field, value in values.items():
+            columns.setdefault(field, [None] * len(flat))[i] = value
+
+    numeric: Dict[str, List[FieldValue]] = {}
+    text: Dict[str, List[FieldValue]] = {}
+    for field, column in columns.items():
+        # A field that is not a number at every point is returned as text
+        is_numeric = all(not isinstance(value, str) for value in column)
+        (numeric if is_numeric else text)[field] = column
+
+    return {
+        "timestamps": [timestamp for timestamp, _ in points],
+        "fields": numeric,
+        "text_fields": text,
+    }
+
+
+def encode_delta(points: HistoryPoints) -> Dict[str, Any]:
+    """
+    The fields of every point that changed since the previous one.
+
+    The first change holds all fields of the first point; later ones only
+    the fields whose value differs, a removed field being set to null.
+    Replaying the changes in order rebuilds every point.
+    """
+    changes: List[Dict[str, FieldValue]] = []
+    previous: Dict[str, FieldValue] = {}
+    for _, payload in points:
+        current = flatten_point(payload)
+        change = {
+            field: value
+            for field, value in current.items()
+            if field not in previous or previous[field] != value
+        }
+        change.update({field: None for field in previous if field not in current})
+        changes.append(change)
+        previous = current
+
+    return {
+        "timestamps": [timestamp for timestamp, _ in points],
+        "changes": changes,
+    }
+
+
+def encode_history(points: HistoryPoints, encoding: str) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """Encode history points with one of HISTORY_ENCODINGS."""
+    if encoding == "columns":
+        return encode_columns(points)
+    if encoding == "delta":
+        return encode_delta(points)
+    return encode_rows(points)
@@ -183,4 +183,53 @@ class ErrorResponse(BaseModel):
     
     error: str
     code: Optional[int] = None
-    details: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    details: Optional[Dict[str, Any]] = None
+
+class BatchSubRequest(BaseModel):
+    """Schema for one request of a batch."""
+    
+    id: str = Field(..., description="Client-chosen key of the response")
+    path: str = Field(..., description="Path under the API prefix with its query, e.g. /daos/1?fields=...")
+    method: str = Field("GET", description="Only GET is supported")
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of sub-requests."""
+    
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    """Schema for the response to one request of a batch."""
+    
+    id: str
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for the responses to a batch, in request order."""
+    
+    responses: List[BatchSubResponse]
+
+
+class AddressLookupRequest(BaseModel):
+    """Schema for a bulk address lookup."""
+    
+    addresses: List[str]
+
+
+class AddressMatch(BaseModel):
+    """Schema for a contract or token configuration holding an address."""
+    
+    dao_id: int
+    kind: str
+    type: str
+    name: str
+
+
+class AddressLookupResponse(BaseModel):
+    """Schema for the DAOs of the addresses looked up, by normalized address."""
+    
+    matches: Dict[str, List[AddressMatch]]
+    unknown: List[str]
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+
+from fastapi import HTTPException, status
+
+# Query parameter pattern shared by all endpoints that accept a period
+PERIOD_REGEX = r"^\d+[dwm]$"
+
+
+def period_start(period: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Convert a period string into the start of the time window it covers.
+    
+    Args:
+        period: Time period (e.g., "30d" for 30 days, "4w" for 4 weeks, "2m" for 2 months)
+        now: End of the window, defaults to the current UTC time
+        
+    Returns:
+        The datetime at which the window starts
+        
+    Raises:
+        HTTPException: If the period format is invalid
+    """
+    now = now or datetime.utcnow()
+    
+    # Extract the numeric value and unit from the period string
+    value = int(period[:-1])
+    unit = period[-1]
+    
+    if unit == 'd':
+        return now - timedelta(days=value)
+    if unit == 'w':
+        return now - timedelta(weeks=value)
+    if unit == 'm':
+        return now - timedelta(days=value * 30)  # Approximation for months
+    
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid period format. Use e.g. '30d', '4w', '2m'"
+    )
+
+
+def parse_projection(
+    fields: Optional[str] = None, metrics: Optional[str] = None
+) -> Optional[Dict[str, Optional[Set[str]]]]:
+    """
+    Parse the ``fields`` / ``metrics`` query parameters of DAO responses.
+    
+    Args:
+        fields: Comma-separated "<metric_name>.<key>" entries, or bare
+            metric names to keep all of their keys
+        metrics: Comma-separated metric names to keep with all their keys
+        
+    Returns:
+        Mapping of metric name to the keys to return (None for all keys),
+        or None when neither parameter restricts the response
+        
+    Raises:
+        HTTPException: If an entry is empty or malformed
+    """
+    if not fields and not metrics:
+        return None
+    
+    projection: Dict[str, Optional[Set[str]]] = {}
+    for entry in (metrics or "").split(","):
+        entry = entry.strip()
+        if entry:
+            projection[entry] = None
+    
+    for entry in (fields or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        metric_name, _, key = entry.partition(".")
+        if not metric_name or (_ and not key):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid field '{entry}'. Use '<metric_name>' or '<metric_name>.<key>'"
+            )
+        if not key or (metric_name in projection and projection[metric_name] is None):
+            projection[metric_name] = None
+        else:
+            projection.setdefault(metric_name, set()).add(key)
+    
+    if not projection:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid fields or metrics provided"
+        )
+    return projection
@@ -0,0 +1,83 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+
+from app.api.schemas import AddressLookupRequest, AddressLookupResponse
+from app.core.config import settings
+from app.core.instrumentation import record_cache
+from app.db.address_index import AddressIndex, get_loaded_index
+
+router = APIRouter(tags=["Addresses"])
+
+
+def get_address_index() -> AddressIndex:
+    """
+    Get the in-memory address index.
+
+    Raises:
+        HTTPException: 503 when the index is disabled or not loaded yet;
+            loading it per request would read every configuration
+    """
+    index = get_loaded_index()
+    record_cache("address_index", hit=index is not None)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The address index is not enabled (ADDRESS_INDEX_ENABLED)"
+        )
+    return index
+
+
+@router.post("/addresses/lookup", response_model=AddressLookupResponse)
+async def lookup_addresses(
+    lookup: AddressLookupRequest,
+    index: AddressIndex = Depends(get_address_index)
+) -> JSONResponse:
+    """
+    Map contract and token addresses to the DAOs configuring them.
+
+    Addresses are matched case-insensitively and answered from memory,
+    without a query per address.
+
+    Args:
+        lookup: Addresses to look up
+        index: Address index
+
+    Returns:
+        Configurations of each known address and the unknown addresses,
+        by lowercase address
+
+    Raises:
+        HTTPException: If more than ADDRESS_LOOKUP_MAX_ADDRESSES are given,
+            or the address index is disabled
+    """
+    if len(lookup.addresses) > settings.ADDRESS_LOOKUP_MAX_ADDRESSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A lookup holds at most {settings.ADDRESS_LOOKUP_MAX_ADDRESSES} addresses"
+        )
+    matches, unknown = index.lookup(lookup.addresses)
+    # The index holds plain JSON values: skip re-validating thousands of
+    # matches against the response model
+    return JSONResponse({"matches": matches, "unknown": unknown})
+
+
+@router.get("/addresses/bloom", response_model=Dict[str, Any])
+async def get_address_bloom(index: AddressIndex = Depends(get_address_index)):
+    """
+    Bloom filter of the known addresses, lowercase, for clients to skip
+    certainly unknown addresses before calling /addresses/lookup
+    """
+    return {**index.bloom.to_dict(), "loaded_at": index.loaded_at.isoformat()}
+
+
+@router.get("/addresses/index", response_model=Dict[str, Any])
+async def get_address_index_stats():
+    """
+    Report the size, Bloom filter size and refresh time of the address index
+    """
+    index = get_loaded_index()
+    if index is None:
+        return {"enabled": False}
+    return {"enabled": True, **index.stats()}
@@ -0,0 +1,131 @@
+import asyncio
+import re
+from typing import Any, Dict, Tuple
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.api.schemas import BatchRequest, BatchResponse
+from app.core.config import settings
+from app.db.repository import MetricsRepository, current_repository
+
+router = APIRouter(tags=["Batch"])
+
+# GET endpoints that can be batched, matched on the decoded path. The
+# events stream, exports and the batch endpoint itself are left out
+BATCHABLE_PATHS = re.compile(
+    r"^/(daos|daos/suggest|daos/metrics/multi|daos/\d+|daos/\d+/enhanced_metrics"
+    r"|daos/\d+/metrics|daos/\d+/metrics/history|\d+/enhanced_metrics"
+    r"|kpis/(latest|ranking|fields|store)|chains/[^/]+/rollups|tasks/[^/]+"
+    r"|addresses/(bloom|index))$"
+)
+
+
+def _normalize_path(path: str) -> str:
+    """
+    The sub-request's path under the API prefix, as the router will see it.
+
+    Paths are matched after percent-decoding, and dot segments are
+    rejected, so that encoded or relative spellings of an endpoint are
+    checked like the endpoint itself.
+
+    Raises:
+        HTTPException: If the path is not a GET endpoint that can be batched
+    """
+    parts = urlsplit(path)
+    decoded = unquote(parts.path)
+    segments = decoded.split("/")[1:]
+    if (
+        parts.scheme or parts.netloc or not decoded.startswith("/")
+        or any(segment in ("", ".", "..") for segment in segments)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid path: {path}. Use a path under {settings.API_PREFIX}, e.g. /daos/1"
+        )
+    if not BATCHABLE_PATHS.match(decoded):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{path} cannot be batched"
+        )
+    # Dispatched as validated, whatever the client encoded
+    return urlunsplit(("", "", quote(decoded), parts.query, ""))
+
+
+def _response_body(response: httpx.Response) -> Any:
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return response.json()
+    return response.text
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(batch_request: BatchRequest, request: Request) -> Dict[str, Any]:
+    """
+    Run several GET requests in one round trip.
+
+    Sub-requests are dispatched concurrently to the application itself, in
+    process, through the same middleware as regular requests: they are
+    served from the response cache when possible. Identical sub-requests are
+    run once. The sub-requests share one metrics repository, on one session:
+    their DAO and latest-run lookups are coalesced into batched queries and
+    memoized across the whole batch. Endpoints that load their data
+    elsewhere (enhanced metrics, with a session of their own) hold at most
+    BATCH_MAX_CONCURRENCY connections.
+
+    Args:
+        batch_request: Sub-requests, as paths under the API prefix
+        request: The batch request
+
+    Returns:
+        Status and JSON body of each sub-request, in request order
+
+    Raises:
+        HTTPException: If the batch is too large or a sub-request is not a
+            GET of an endpoint listed in BATCHABLE_PATHS
+    """
+    sub_requests = batch_request.requests
+    if len(sub_requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch holds at most {settings.BATCH_MAX_REQUESTS} requests"
+        )
+    targets = {}
+    for sub_request in sub_requests:
+        if sub_request.method.upper() != "GET":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only GET requests can be batched, got {sub_request.method} {sub_request.path}"
+            )
+        targets[sub_request.path] = _normalize_path(sub_request.path)
+
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    client_address = (request.client.host, request.client.port) if request.client else ("127.0.0.1", 0)
+    transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False, client=client_address)
+
+    async with MetricsRepository.on_read_session() as repository, httpx.AsyncClient(
+        transport=transport,
+        base_url="http://batch",
+        # Cached responses are then served as stored, without compression
+        headers={"accept-encoding": "identity"},
+    ) as client:
+        async def dispatch(path: str) -> Tuple[int, Any]:
+            async with semaphore:
+                response = await client.get(f"{settings.API_PREFIX}{path}")
+            return response.status_code, _response_body(response)
+
+        # Sub-requests run in tasks created below, which inherit the repository
+        token = current_repository.set(repository)
+        try:
+            paths = list(dict.fromkeys(targets.values()))
+            outcomes = dict(zip(paths, await asyncio.gather(*(dispatch(path) for path in paths))))
+            results = {path: outcomes[target] for path, target in targets.items()}
+        finally:
+            current_repository.reset(token)
+
+    return {
+        "responses": [
+            {"id": sub_request.id, "status": results[sub_request.path][0], "body": results[sub_request.path][1]}
+            for sub_request in sub_requests
+        ]
+    }
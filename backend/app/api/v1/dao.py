@@ -1,22 +1,36 @@
 # app/api/v1/dao.py
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, and_, or_, func
+from sqlmodel import select, or_, func
 
-from app.db.models import DAO, MetricSnapshot, MetricRun
-from app.db.session import get_db
+from app.api.utils import parse_projection
+from app.api.v1.enhanced_metrics import get_projected_enhanced_dao
+from app.core.instrumentation import record_cache
+from app.db.dao_index import get_loaded_index
+from app.db.models import DAO
+from app.db.projection import Projection
+from app.db.repository import MetricsRepository, get_metrics_repository
+from app.db.session import read_session
 
 router = APIRouter(tags=["DAOs"])
 
+# Metric keys shown in the DAO list
+LIST_PROJECTION: Projection = {
+    "network_participation": {"participation_rate", "total_members"},
+    "accumulated_funds": {"treasury_value_usd"},
+    "voting_efficiency": {"total_proposals", "approval_rate"},
+    "health_metrics": {"network_health_score"},
+}
+
 @router.get("/daos", response_model=Dict[str, Any])
 async def get_daos(
     search: Optional[str] = None,
     chain_id: Optional[str] = None,
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    session: AsyncSession = Depends(get_db)
+    repository: MetricsRepository = Depends(get_metrics_repository)
 ):
     """
     Get a list of DAOs with filtering options
@@ -48,28 +62,24 @@ async def get_daos(
             select(DAO).where(DAO.chain_id == chain_id).subquery()
         )
     
-    total_count_result = await session.execute(count_query)
+    total_count_result = await repository.execute(count_query)
     total_count = total_count_result.scalar() or 0
     
     # Apply pagination
     query = query.offset(offset).limit(limit)
     
     # Execute query
-    result = await session.execute(query)
+    result = await repository.execute(query)
     daos = result.scalars().all()
+    repository.prime_daos(daos)
+    
+    # Latest metrics of the whole page in one set-based lookup
+    metrics_by_dao = await repository.get_metrics([dao.id for dao in daos], projection=LIST_PROJECTION)
     
     # Transform data for response
     dao_list = []
     for dao in daos:
-        # Get metrics directly from MetricSnapshot (same approach as enhanced_metrics)
-        metrics_query = select(MetricSnapshot).where(MetricSnapshot.dao_id == dao.id)
-        metrics_result = await session.execute(metrics_query)
-        metrics = metrics_result.scalars().all()
-        
-        # Create a dict of metrics
-        metrics_data = {}
-        for metric in metrics:
-            metrics_data[metric.metric_name] = metric.jsonb_payload
+        metrics_data = metrics_by_dao[dao.id]
         
         # Build the DAO object with metrics data
         dao_item = {
@@ -104,15 +114,66 @@ async def get_daos(
         "offset": offset
     }
 
+async def suggest_from_database(query: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Suggestions without the in-memory index: one ILIKE query, as the DAO
+    list search runs, with exact chain IDs and shorter names first.
+    """
+    query = " ".join(query.split())
+    if not query:
+        return []
+    async with read_session() as session:
+        result = await session.execute(
+            select(DAO.id, DAO.name, DAO.chain_id).where(or_(
+                DAO.name.ilike(f"%{query}%"),
+                DAO.chain_id == query
+            )).order_by(
+                (DAO.chain_id != query), func.length(DAO.name), DAO.name
+            ).limit(limit)
+        )
+        return [{"id": dao_id, "name": name, "chain_id": chain_id} for dao_id, name, chain_id in result.all()]
+
+
+# Registered before /daos/{dao_id}, which would otherwise match "suggest"
+@router.get("/daos/suggest", response_model=List[Dict[str, Any]])
+async def suggest_daos(
+    q: str = Query(..., max_length=100, description="Beginning of a DAO name or word, a substring of a name, or a chain ID"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Suggest DAOs as a name is typed, from memory: names starting with the
+    query first, then names with a word starting with it, names containing
+    it and DAOs of a matching chain. Without the in-memory index (see
+    DAO_INDEX_ENABLED), names containing the query are searched in the
+    database instead
+    """
+    index = get_loaded_index()
+    record_cache("dao_index", hit=index is not None)
+    if index is None:
+        return await suggest_from_database(q, limit)
+    return index.suggest(q, limit)
+
+
 @router.get("/daos/{dao_id}", response_model=Dict[str, Any])
-async def get_dao(dao_id: int, session: AsyncSession = Depends(get_db)):
+async def get_dao(
+    dao_id: int,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated metric keys to return, e.g. accumulated_funds.treasury_value_usd"
+    ),
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names to return"),
+    as_of: Optional[datetime] = Query(
+        None, description="Return the metrics of the latest successful run at or before this time"
+    ),
+    repository: MetricsRepository = Depends(get_metrics_repository)
+):
     """
-    Get a specific DAO by ID
+    Get a specific DAO by ID, optionally restricted to some metrics and keys,
+    as of a point in time
     """
+    projection = parse_projection(fields, metrics)
+    
     # Fetch the DAO
-    query = select(DAO).where(DAO.id == dao_id)
-    result = await session.execute(query)
-    dao = result.scalar_one_or_none()
+    dao = await repository.get_dao(dao_id)
     
     if not dao:
         raise HTTPException(
@@ -120,13 +181,8 @@ async def get_dao(dao_id: int, session: AsyncSession = Depends(get_db)):
             detail=f"DAO with ID {dao_id} not found"
         )
     
-    # Get the latest run for this DAO
-    latest_run_query = select(MetricRun).where(
-        MetricRun.dao_id == dao_id
-    ).order_by(MetricRun.run_timestamp.desc()).limit(1)
-    
-    latest_run_result = await session.execute(latest_run_query)
-    latest_run = latest_run_result.scalar_one_or_none()
+    # Get the latest successful run for this DAO, up to as_of if given
+    runs = await repository.get_runs([dao_id], as_of)
     
     # Create base response
     response = {
@@ -137,102 +193,46 @@ async def get_dao(dao_id: int, session: AsyncSession = Depends(get_db)):
         "created_at": dao.created_at.isoformat()
     }
     
-    if latest_run:
-        # Get metrics from this run
-        metrics_query = select(MetricSnapshot).where(
-            and_(
-                MetricSnapshot.dao_id == dao_id,
-                MetricSnapshot.run_id == latest_run.id
-            )
-        )
-        
-        metrics_result = await session.execute(metrics_query)
-        metrics = metrics_result.scalars().all()
-        
-        # Add metrics to response
-        for metric in metrics:
-            response[metric.metric_name] = metric.jsonb_payload
+    if as_of is not None:
+        response["as_of"] = as_of.isoformat()
+        response["run_timestamp"] = runs[dao_id][1].isoformat() if dao_id in runs else None
+    
+    # Add the metrics of this run, only the projected ones if requested
+    run_metrics = await repository.get_metrics([dao_id], as_of, projection)
+    response.update(run_metrics[dao_id])
     
     return response
 
 # Create a fixed version of the enhanced_metrics endpoint
 @router.get("/daos/{dao_id}/enhanced_metrics", response_model=Dict[str, Any])
-async def get_enhanced_dao(dao_id: int, session: AsyncSession = Depends(get_db)):
+async def get_enhanced_dao(
+    dao_id: int,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated metric keys to return, e.g. accumulated_funds.treasury_value_usd"
+    ),
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names to return"),
+    as_of: Optional[datetime] = Query(
+        None, description="Return the metrics of the latest successful run at or before this time"
+    ),
+):
     """
-    Get enhanced metrics for a specific DAO
+    Get enhanced metrics for a specific DAO, optionally restricted to some metrics and keys,
+    as of a point in time
     """
-    # Fetch the DAO
-    query = select(DAO).where(DAO.id == dao_id)
-    result = await session.execute(query)
-    dao = result.scalar_one_or_none()
-    
-    if not dao:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"DAO with ID {dao_id} not found"
-        )
-    
-    # Get metrics directly without requiring a run
-    metrics_query = select(MetricSnapshot).where(MetricSnapshot.dao_id == dao_id)
-    
-    metrics_result = await session.execute(metrics_query)
-    metrics = metrics_result.scalars().all()
-    
-    # Create a dict of metrics
-    metrics_data = {}
-    for metric in metrics:
-        metrics_data[metric.metric_name] = metric.jsonb_payload
-    
-    # Create enhanced response
-    response = {
-        "id": dao.id,
-        "name": dao.name,
-        "chain_id": dao.chain_id,
-        "timestamp": dao.created_at.isoformat(),
-        "network_participation": metrics_data.get("network_participation", {
-            "num_distinct_voters": 0,
-            "total_members": 0,
-            "participation_rate": 0,
-            "unique_proposers": 0
-        }),
-        "accumulated_funds": metrics_data.get("accumulated_funds", {
-            "treasury_value_usd": 0,
-            "circulating_supply": 0,
-            "total_supply": 0,
-            "circulating_token_percentage": 0,
-            "token_velocity": 0
-        }),
-        "voting_efficiency": metrics_data.get("voting_efficiency", {
-            "total_proposals": 0,
-            "approved_proposals": 0,
-            "approval_rate": 0,
-            "avg_voting_duration_days": 0,
-            "proposal_states": {}
-        }),
-        "decentralisation": metrics_data.get("decentralisation", {
-            "largest_holder_percent": 0,
-            "on_chain_automation": "No",
-            "token_distribution": {},
-            "proposer_concentration": 0
-        }),
-        "health_metrics": metrics_data.get("health_metrics", {
-            "network_health_score": 0,
-            "activity_ratio": 0,
-            "total_volume": 0,
-            "mean_daily_volume": 0
-        })
-    }
-    
-    return response
+    return await get_projected_enhanced_dao(dao_id, fields, metrics, as_of)
 
 
 @router.get("/daos/metrics/multi", response_model=List[Dict[str, Any]])
 async def get_multi_dao_metrics(
     dao_ids: str = Query(..., description="Comma-separated list of DAO IDs"),
-    session: AsyncSession = Depends(get_db)
+    as_of: Optional[datetime] = Query(
+        None, description="Return the metrics of each DAO's latest successful run at or before this time"
+    ),
+    repository: MetricsRepository = Depends(get_metrics_repository)
 ):
     """
-    Get metrics for multiple DAOs at once
+    Get the latest metrics of multiple DAOs at once, optionally as of a point
+    in time, in three queries whatever the number of DAOs
     """
     id_list = [int(id.strip()) for id in dao_ids.split(",") if id.strip().isdigit()]
     
@@ -242,40 +242,33 @@ async def get_multi_dao_metrics(
             detail="No valid DAO IDs provided"
         )
     
+    daos = await repository.get_daos(id_list)
+    runs = await repository.get_runs(list(daos), as_of)
+    metrics_by_dao = await repository.get_metrics(list(daos), as_of)
+    
     result = []
     for dao_id in id_list:
-        try:
-            # Use the same logic as the single DAO endpoint
-            dao_query = select(DAO).where(DAO.id == dao_id)
-            dao_result = await session.execute(dao_query)
-            dao = dao_result.scalar_one_or_none()
-            
-            if dao:
-                # Get metrics for this DAO
-                metrics_query = select(MetricSnapshot).where(MetricSnapshot.dao_id == dao_id)
-                metrics_result = await session.execute(metrics_query)
-                metrics = metrics_result.scalars().all()
-                
-                # Create metrics data
-                metrics_data = {}
-                for metric in metrics:
-                    metrics_data[metric.metric_name] = metric.jsonb_payload
-                
-                dao_response = {
-                    "id": dao.id,
-                    "name": dao.name,
-                    "chain_id": dao.chain_id,
-                    "timestamp": dao.created_at.isoformat(),
-                    "network_participation": metrics_data.get("network_participation", {}),
-                    "accumulated_funds": metrics_data.get("accumulated_funds", {}),
-                    "voting_efficiency": metrics_data.get("voting_efficiency", {}),
-                    "decentralisation": metrics_data.get("decentralisation", {}),
-                    "health_metrics": metrics_data.get("health_metrics", {})
-                }
-                
-                result.append(dao_response)
-        except Exception as e:
-            # Skip DAOs that cause errors
+        dao = daos.get(dao_id)
+        if not dao:
+            # Unknown DAOs are skipped
             continue
+        metrics_data = metrics_by_dao[dao_id]
+        dao_response = {
+            "id": dao.id,
+            "name": dao.name,
+            "chain_id": dao.chain_id,
+            "timestamp": dao.created_at.isoformat(),
+        }
+        if as_of is not None:
+            dao_response["as_of"] = as_of.isoformat()
+            dao_response["run_timestamp"] = runs[dao_id][1].isoformat() if dao_id in runs else None
+        dao_response.update({
+            "network_participation": metrics_data.get("network_participation", {}),
+            "accumulated_funds": metrics_data.get("accumulated_funds", {}),
+            "voting_efficiency": metrics_data.get("voting_efficiency", {}),
+            "decentralisation": metrics_data.get("decentralisation", {}),
+            "health_metrics": metrics_data.get("health_metrics", {})
+        })
+        result.append(dao_response)
     
-    return result
\ No newline at end of file
+    return result
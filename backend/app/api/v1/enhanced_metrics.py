@@ -1,79 +1,133 @@
-from typing import Dict, Any
+import copy
+import json
+from datetime import datetime
+from typing import Dict, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from fastapi import APIRouter, HTTPException, Query, status
 
-from app.db.models import DAO, MetricSnapshot
-from app.db.session import get_db
+from app.api.utils import parse_projection
+from app.core.singleflight import SingleFlight
+from app.db.projection import Projection, project_payload
+from app.db.repository import MetricsRepository
+from app.db.runs import as_utc
 
 router = APIRouter()
 
-@router.get("/{dao_id}/enhanced_metrics", response_model=Dict[str, Any])
-async def get_enhanced_dao(dao_id: int, session: AsyncSession = Depends(get_db)):
+# Concurrent requests for the same DAO, typically right after an ingest
+# invalidated downstream caches, share one query
+enhanced_metrics_flight = SingleFlight("enhanced_metrics")
+
+# Returned for the categories a DAO has no snapshot of
+DEFAULT_METRICS: Dict[str, Dict[str, Any]] = {
+    "network_participation": {
+        "num_distinct_voters": 0,
+        "total_members": 0,
+        "participation_rate": 0,
+        "unique_proposers": 0
+    },
+    "accumulated_funds": {
+        "treasury_value_usd": 0,
+        "circulating_supply": 0,
+        "total_supply": 0,
+        "circulating_token_percentage": 0,
+        "token_velocity": 0
+    },
+    "voting_efficiency": {
+        "total_proposals": 0,
+        "approved_proposals": 0,
+        "approval_rate": 0,
+        "avg_voting_duration_days": 0,
+        "proposal_states": {}
+    },
+    "decentralisation": {
+        "largest_holder_percent": 0,
+        "on_chain_automation": "No",
+        "token_distribution": {},
+        "proposer_concentration": 0
+    },
+    "health_metrics": {
+        "network_health_score": 0,
+        "activity_ratio": 0,
+        "total_volume": 0,
+        "mean_daily_volume": 0
+    },
+}
+
+
+async def load_enhanced_metrics(
+    dao_id: int, projection: Optional[Projection] = None, as_of: Optional[datetime] = None
+) -> Dict[str, Any]:
     """
-    Get enhanced metrics for a specific DAO
+    Load the enhanced metrics of a DAO in a session of its own, as the
+    result is shared with concurrent requests: the metrics of its latest
+    successful run, at or before as_of if given, restricted to the
+    projected metrics and keys if any
     """
-    # Fetch the DAO
-    query = select(DAO).where(DAO.id == dao_id)
-    result = await session.execute(query)
-    dao = result.scalar_one_or_none()
-    
-    if not dao:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"DAO with ID {dao_id} not found"
-        )
-    
-    # Get ALL metric snapshots for this DAO
-    metrics_query = select(MetricSnapshot).where(MetricSnapshot.dao_id == dao_id)
-    
-    metrics_result = await session.execute(metrics_query)
-    metrics = metrics_result.scalars().all()
-    
-    # Create a dict of metrics
-    metrics_data = {}
-    for metric in metrics:
-        metrics_data[metric.metric_name] = metric.jsonb_payload
-    
+    async with MetricsRepository.on_read_session() as repository:
+        dao = await repository.get_dao(dao_id)
+
+        if not dao:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"DAO with ID {dao_id} not found"
+            )
+
+        runs = await repository.get_runs([dao_id], as_of)
+        metrics_data = (await repository.get_metrics([dao_id], as_of, projection))[dao_id]
+
     # Return the structured response
     response = {
         "id": dao.id,
         "name": dao.name,
         "chain_id": dao.chain_id,
         "timestamp": dao.created_at.isoformat(),
-        "network_participation": metrics_data.get("network_participation", {
-            "num_distinct_voters": 0,
-            "total_members": 0,
-            "participation_rate": 0,
-            "unique_proposers": 0
-        }),
-        "accumulated_funds": metrics_data.get("accumulated_funds", {
-            "treasury_value_usd": 0,
-            "circulating_supply": 0,
-            "total_supply": 0,
-            "circulating_token_percentage": 0,
-            "token_velocity": 0
-        }),
-        "voting_efficiency": metrics_data.get("voting_efficiency", {
-            "total_proposals": 0,
-            "approved_proposals": 0,
-            "approval_rate": 0,
-            "avg_voting_duration_days": 0,
-            "proposal_states": {}
-        }),
-        "decentralisation": metrics_data.get("decentralisation", {
-            "largest_holder_percent": 0,
-            "on_chain_automation": "No",
-            "token_distribution": {},
-            "proposer_concentration": 0
-        }),
-        "health_metrics": metrics_data.get("health_metrics", {
-            "network_health_score": 0,
-            "activity_ratio": 0,
-            "total_volume": 0,
-            "mean_daily_volume": 0
-        })
     }
-    
+    if as_of is not None:
+        response["as_of"] = as_of.isoformat()
+        response["run_timestamp"] = runs[dao_id][1].isoformat() if dao_id in runs else None
+    for metric_name, default in DEFAULT_METRICS.items():
+        if projection is not None and metric_name not in projection:
+            continue
+        if metric_name in metrics_data:
+            response[metric_name] = metrics_data[metric_name]
+        else:
+            keys = projection[metric_name] if projection is not None else None
+            response[metric_name] = project_payload(copy.deepcopy(default), keys)
+
     return response
+
+
+async def get_projected_enhanced_dao(
+    dao_id: int, fields: Optional[str] = None, metrics: Optional[str] = None, as_of: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Enhanced metrics of a DAO; identical concurrent requests share one query
+    """
+    projection = parse_projection(fields, metrics)
+    key = str(dao_id)
+    if as_of is not None:
+        key += "@" + as_utc(as_of).isoformat()
+    if projection is not None:
+        key += ":" + json.dumps(
+            {name: sorted(keys) if keys is not None else None for name, keys in projection.items()},
+            sort_keys=True,
+        )
+    return await enhanced_metrics_flight.do(key, lambda: load_enhanced_metrics(dao_id, projection, as_of))
+
+
+@router.get("/{dao_id}/enhanced_metrics", response_model=Dict[str, Any])
+async def get_enhanced_dao(
+    dao_id: int,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated metric keys to return, e.g. accumulated_funds.treasury_value_usd"
+    ),
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names to return"),
+    as_of: Optional[datetime] = Query(
+        None, description="Return the metrics of the latest successful run at or before this time"
+    ),
+):
+    """
+    Get enhanced metrics for a specific DAO, optionally restricted to some metrics and keys,
+    as of a point in time
+    """
+    return await get_projected_enhanced_dao(dao_id, fields, metrics, as_of)
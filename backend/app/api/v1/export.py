@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.db.export import MEDIA_TYPES, encode_export, export_connection, iter_export_batches
+
+router = APIRouter(tags=["Export"])
+
+
+@router.get("/export")
+async def export_metrics(
+    format: str = Query("parquet", regex="^(parquet|arrow|csv)$"),
+    dao_ids: Optional[str] = Query(None, description="Comma-separated DAO IDs, all DAOs by default"),
+    chain_id: Optional[str] = None,
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names, all by default"),
+    start: Optional[datetime] = Query(None, description="Only runs at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only runs before this time"),
+    batch_size: int = Query(2000, ge=100, le=20000, description="Snapshots per batch"),
+) -> StreamingResponse:
+    """
+    Export the metric history as one long table, streamed.
+
+    Every numeric or text field of every snapshot of a succeeded run
+    becomes a row (dao_id, dao_name, chain_id, run_id, run_timestamp,
+    metric_name, field, value, value_text). Rows are read from a
+    server-side cursor and encoded batch by batch, so the export runs in
+    one pass with bounded memory.
+
+    Args:
+        format: parquet, arrow (IPC stream) or csv
+        dao_ids: Comma-separated list of DAO IDs to export
+        chain_id: Only export DAOs of this chain
+        metrics: Comma-separated list of metric names to export
+        start: Only export runs at or after this time
+        end: Only export runs before this time
+        batch_size: Snapshots per batch (one Parquet row group per batch)
+
+    Returns:
+        The streamed file
+    """
+    id_list = [int(id.strip()) for id in dao_ids.split(",") if id.strip().isdigit()] if dao_ids else None
+    metric_list = [name.strip() for name in metrics.split(",") if name.strip()] if metrics else None
+
+    async def body() -> AsyncIterator[bytes]:
+        async with export_connection() as conn:
+            batches = iter_export_batches(
+                conn, dao_ids=id_list, chain_id=chain_id, metrics=metric_list,
+                start=start, end=end, batch_size=batch_size,
+            )
+            async for chunk in encode_export(batches, format):
+                if chunk:
+                    yield chunk
+
+    filename = f"dao_metrics.{'arrows' if format == 'arrow' else format}"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.instrumentation import record_cache
+from app.db.kpi_store import KPIStore, get_loaded_store
+from app.db.repository import MetricsRepository, get_metrics_repository
+
+router = APIRouter(tags=["KPIs"])
+
+
+def get_kpi_store() -> KPIStore:
+    """
+    Get the in-memory KPI store.
+
+    Raises:
+        HTTPException: 503 when the store is disabled or not loaded yet;
+            rankings and field lists span every DAO, which the store exists
+            to avoid reading per request
+    """
+    store = get_loaded_store()
+    record_cache("kpi_store", hit=store is not None)
+    if store is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The KPI store is not enabled (KPI_STORE_ENABLED)"
+        )
+    return store
+
+
+async def load_latest_kpis(repository: MetricsRepository, dao_ids: List[int]) -> KPIStore:
+    """
+    Store of the latest KPIs of only ``dao_ids``, for when the in-memory
+    store is disabled: the DAOs and their latest runs are read through the
+    metrics repository, in batched queries.
+    """
+    daos = await repository.get_daos(dao_ids)
+    metrics = await repository.get_metrics(list(daos))
+    return KPIStore.from_rows(
+        (dao_id, dao.name, dao.chain_id, metric_name, payload)
+        for dao_id, dao in daos.items()
+        for metric_name, payload in metrics.get(dao_id, {}).items()
+    )
+
+
+@router.get("/kpis/latest", response_model=List[Dict[str, Any]])
+async def get_latest_kpis(
+    dao_ids: str = Query(..., description="Comma-separated list of DAO IDs"),
+    fields: Optional[str] = Query(None, description="Comma-separated KPI fields, all by default"),
+    repository: MetricsRepository = Depends(get_metrics_repository)
+):
+    """
+    Compare the latest numeric KPIs of several DAOs
+    """
+    id_list = [int(id.strip()) for id in dao_ids.split(",") if id.strip().isdigit()]
+    
+    if not id_list:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid DAO IDs provided"
+        )
+    
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    store = get_loaded_store()
+    record_cache("kpi_store", hit=store is not None)
+    if store is None:
+        store = await load_latest_kpis(repository, id_list)
+    return store.rows(id_list, field_list)
+
+
+@router.get("/kpis/ranking", response_model=List[Dict[str, Any]])
+async def get_kpi_ranking(
+    field: str = Query(..., description="KPI field, e.g. accumulated_funds.treasury_value_usd"),
+    order: str = Query("desc", regex="^(asc|desc)$"),
+    limit: int = Query(10, ge=1, le=1000),
+    chain_id: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    store: KPIStore = Depends(get_kpi_store)
+):
+    """
+    Rank DAOs by the latest value of a KPI field, with optional filters
+    """
+    if field not in store.columns:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown KPI field: {field}"
+        )
+    
+    return store.ranking(
+        field,
+        limit=limit,
+        descending=order == "desc",
+        chain_id=chain_id,
+        min_value=min_value,
+        max_value=max_value
+    )
+
+
+@router.get("/kpis/fields", response_model=List[str])
+async def get_kpi_fields(store: KPIStore = Depends(get_kpi_store)):
+    """
+    List the KPI fields available for comparison and ranking
+    """
+    return list(store.columns)
+
+
+@router.get("/kpis/store", response_model=Dict[str, Any])
+async def get_kpi_store_stats():
+    """
+    Report the size, memory footprint and refresh time of the in-memory KPI store
+    """
+    store = get_loaded_store()
+    if store is None:
+        return {"enabled": False}
+    return {"enabled": True, **store.stats()}
@@ -3,22 +3,30 @@ from typing import Dict, Any, Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, and_, desc
+from sqlmodel import select, and_
 
+from app.api.history import HISTORY_ENCODINGS, encode_history
 from app.api.schemas import MetricResponse, MetricSnapshotRead
+from app.core.config import settings
+from app.db.history import HISTORY_BUCKETS, bucketed_history
 from app.db.models import DAO, MetricRun, MetricSnapshot
+from app.db.repository import MetricsRepository, get_metrics_repository
+from app.db.runs import as_utc
 from app.db.session import get_db
-from app.workers.tasks import fetch_metrics_for_dao
+from app.workers.producer import FETCH_METRICS_FOR_DAO, send_task_once
 
 router = APIRouter(tags=["Metrics"])
 
+# Days per period unit, months being approximated as 30 days
+PERIOD_UNIT_DAYS = {"d": 1, "w": 7, "m": 30}
+
 
 @router.get("/daos/{dao_id}/metrics", response_model=MetricResponse)
 async def get_dao_metrics(
     dao_id: int,
     metric: Optional[str] = None,
     period: str = Query("30d", regex=r"^\d+[dwm]$"),
-    session: AsyncSession = Depends(get_db)
+    repository: MetricsRepository = Depends(get_metrics_repository)
 ) -> Dict[str, Any]:
     """
     Get metrics for a specific DAO.
@@ -27,7 +35,7 @@ async def get_dao_metrics(
         dao_id: The ID of the DAO
         metric: Filter by specific metric name
         period: Time period (e.g., "30d" for 30 days, "4w" for 4 weeks, "2m" for 2 months)
-        session: Database session
+        repository: Metrics repository of the request
         
     Returns:
         Dictionary containing DAO information and metrics
@@ -36,9 +44,7 @@ async def get_dao_metrics(
         HTTPException: If DAO not found or invalid period format
     """
     # Verify DAO exists
-    dao_query = select(DAO).where(DAO.id == dao_id)
-    result = await session.execute(dao_query)
-    dao = result.scalars().first()
+    dao = await repository.get_dao(dao_id)
     
     if not dao:
         raise HTTPException(
@@ -65,51 +71,24 @@ async def get_dao_metrics(
             detail="Invalid period format. Use e.g. '30d', '4w', '2m'"
         )
     
-    # Get metric runs within the time period
-    run_query = select(MetricRun).where(
-        and_(
-            MetricRun.dao_id == dao_id,
-            MetricRun.run_timestamp >= from_date,
-            MetricRun.succeeded == True
-        )
-    ).order_by(desc(MetricRun.run_timestamp))
-    
-    run_result = await session.execute(run_query)
-    runs = run_result.scalars().all()
+    # The latest successful run, if it falls within the time period
+    runs = await repository.get_runs([dao_id])
     
-    if not runs:
+    if dao_id not in runs or runs[dao_id][1] < as_utc(from_date):
         return {
             "dao_id": dao_id,
             "dao_name": dao.name,
             "metrics": {}
         }
     
-    # Get the latest run for metrics
-    latest_run = runs[0]
-    
-    # Get metrics from the latest run
-    snapshot_query = select(MetricSnapshot).where(
-        and_(
-            MetricSnapshot.run_id == latest_run.id,
-            MetricSnapshot.dao_id == dao_id
-        )
-    )
-    
-    if metric:
-        snapshot_query = snapshot_query.where(MetricSnapshot.metric_name == metric)
-    
-    snapshot_result = await session.execute(snapshot_query)
-    snapshots = snapshot_result.scalars().all()
-    
-    # Transform data for response
-    metrics_data = {}
-    for snapshot in snapshots:
-        metrics_data[snapshot.metric_name] = snapshot.jsonb_payload
+    # Get metrics from the latest run, only the requested one if any
+    projection = {metric: None} if metric else None
+    metrics_data = (await repository.get_metrics([dao_id], projection=projection))[dao_id]
     
     return {
         "dao_id": dao_id,
         "dao_name": dao.name,
-        "run_timestamp": latest_run.run_timestamp,
+        "run_timestamp": runs[dao_id][1],
         "metrics": metrics_data
     }
 
@@ -119,7 +98,19 @@ async def get_dao_metrics_history(
     dao_id: int,
     metric: str = Query(..., description="The metric name to get history for"),
     period: str = Query("30d", regex=r"^\d+[dwm]$"),
-    session: AsyncSession = Depends(get_db)
+    encoding: str = Query(
+        "rows",
+        regex=f"^({'|'.join(HISTORY_ENCODINGS)})$",
+        description="rows: full payload per point; columns: one array per field; "
+                    "delta: only the fields changed since the previous point",
+    ),
+    bucket: Optional[str] = Query(
+        None,
+        regex=f"^({'|'.join(HISTORY_BUCKETS)})$",
+        description="One point per UTC day, week or month: its latest run. "
+                    "Past buckets are served from the history cache",
+    ),
+    repository: MetricsRepository = Depends(get_metrics_repository)
 ) -> Dict[str, Any]:
     """
     Get historical metrics for a specific DAO.
@@ -128,7 +119,9 @@ async def get_dao_metrics_history(
         dao_id: The ID of the DAO
         metric: The specific metric name to get history for
         period: Time period (e.g., "30d" for 30 days, "4w" for 4 weeks, "2m" for 2 months)
-        session: Database session
+        encoding: Shape of the history ("rows", "columns" or "delta")
+        bucket: Downsample to one point per "day", "week" or "month" (every run when None)
+        repository: Metrics repository of the request
         
     Returns:
         Dictionary containing DAO information and historical metrics
@@ -137,9 +130,7 @@ async def get_dao_metrics_history(
         HTTPException: If DAO not found or invalid period format
     """
     # Verify DAO exists
-    dao_query = select(DAO).where(DAO.id == dao_id)
-    result = await session.execute(dao_query)
-    dao = result.scalars().first()
+    dao = await repository.get_dao(dao_id)
     
     if not dao:
         raise HTTPException(
@@ -154,6 +145,14 @@ async def get_dao_metrics_history(
     value = int(period[:-1])
     unit = period[-1]
     
+    # Bucketed points are cached per DAO and metric: bound what one
+    # request can compute and store
+    if bucket and value * PERIOD_UNIT_DAYS.get(unit, 1) > settings.HISTORY_BUCKET_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bucketed history covers at most {settings.HISTORY_BUCKET_MAX_DAYS} days"
+        )
+    
     if unit == 'd':
         from_date = now - timedelta(days=value)
     elif unit == 'w':
@@ -166,43 +165,38 @@ async def get_dao_metrics_history(
             detail="Invalid period format. Use e.g. '30d', '4w', '2m'"
         )
     
-    # Get metric snapshots for the specified metric within the time period
-    # Join with metric_run to get timestamps
-    snapshot_query = select(MetricSnapshot, MetricRun.run_timestamp).join(
-        MetricRun, MetricSnapshot.run_id == MetricRun.id
-    ).where(
-        and_(
-            MetricSnapshot.dao_id == dao_id,
-            MetricSnapshot.metric_name == metric,
-            MetricRun.run_timestamp >= from_date,
-            MetricRun.succeeded == True
-        )
-    ).order_by(MetricRun.run_timestamp)
-    
-    snapshot_result = await session.execute(snapshot_query)
-    snapshot_data = snapshot_result.all()
-    
-    if not snapshot_data:
-        return {
-            "dao_id": dao_id,
-            "dao_name": dao.name,
-            "metric": metric,
-            "history": []
-        }
-    
-    # Transform data for response
-    history = []
-    for snapshot, timestamp in snapshot_data:
-        history.append({
-            "timestamp": timestamp,
-            "data": snapshot.jsonb_payload
-        })
+    if bucket:
+        # One point per bucket, closed buckets coming from the history cache
+        points = await bucketed_history(repository, dao_id, metric, bucket, from_date)
+    else:
+        # Get metric snapshots for the specified metric within the time period
+        # Join with metric_run to get timestamps
+        snapshot_query = select(MetricRun.run_timestamp, MetricSnapshot.jsonb_payload).join(
+            MetricRun, and_(
+                MetricSnapshot.run_id == MetricRun.id,
+                MetricSnapshot.run_timestamp == MetricRun.run_timestamp
+            )
+        ).where(
+            and_(
+                MetricSnapshot.dao_id == dao_id,
+                MetricSnapshot.metric_name == metric,
+                # Filter both sides so that only the period's partitions are scanned
+                MetricSnapshot.run_timestamp >= from_date,
+                MetricRun.run_timestamp >= from_date,
+                MetricRun.succeeded == True
+            )
+        ).order_by(MetricRun.run_timestamp)
+        
+        snapshot_result = await repository.execute(snapshot_query)
+        points = snapshot_result.all()
     
     return {
         "dao_id": dao_id,
         "dao_name": dao.name,
         "metric": metric,
-        "history": history
+        "bucket": bucket,
+        "encoding": encoding,
+        "history": encode_history(points, encoding)
     }
 
 
@@ -214,6 +208,9 @@ async def poll_dao_metrics(
     """
     Trigger a metrics fetch for a specific DAO.
     
+    Repeated polls while a fetch for the DAO is queued or running, or
+    within TASK_DEBOUNCE_SECONDS after it finished, return that task's ID.
+    
     Args:
         dao_id: The ID of the DAO
         session: Database session
@@ -235,11 +232,18 @@ async def poll_dao_metrics(
             detail=f"DAO with ID {dao_id} not found"
         )
     
-    # Trigger Celery task
-    task = fetch_metrics_for_dao.delay(dao_id)
+    # Trigger Celery task, unless one for this DAO is queued, running or just finished
+    task_id, deduplicated = await send_task_once(
+        FETCH_METRICS_FOR_DAO, f"{FETCH_METRICS_FOR_DAO}:{dao_id}", args=[dao_id]
+    )
     
+    if deduplicated:
+        message = f"Metrics fetch already requested for DAO: {dao.name}"
+    else:
+        message = f"Started metrics fetch for DAO: {dao.name}"
     return {
-        "task_id": task.id,
+        "task_id": task_id,
         "status": "accepted",
-        "message": f"Started metrics fetch for DAO: {dao.name}",
+        "deduplicated": deduplicated,
+        "message": message,
     }
\ No newline at end of file
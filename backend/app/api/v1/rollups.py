@@ -0,0 +1,77 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, and_
+
+from app.api.utils import PERIOD_REGEX, period_start
+from app.db.models import ChainMetricRollup
+from app.db.rollups import GLOBAL_CHAIN_ID
+from app.db.session import get_read_db
+
+router = APIRouter(tags=["Rollups"])
+
+
+@router.get("/chains/{chain_id}/rollups", response_model=Dict[str, Any])
+async def get_chain_rollups(
+    chain_id: str,
+    fields: str = Query(
+        ...,
+        description="Comma-separated KPI fields, e.g. accumulated_funds.treasury_value_usd"
+    ),
+    period: str = Query("90d", regex=PERIOD_REGEX),
+    session: AsyncSession = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Get daily rollups of KPI fields across all DAOs of a chain.
+    
+    Args:
+        chain_id: The chain ID, or "all" for the rollups across every chain
+        fields: Comma-separated list of "<metric_name>.<key>" fields
+        period: Time period (e.g., "30d" for 30 days, "4w" for 4 weeks, "2m" for 2 months)
+        session: Database session
+        
+    Returns:
+        Dictionary containing one daily series (count, sum, mean, min, max) per field
+        
+    Raises:
+        HTTPException: If no field is given or invalid period format
+    """
+    field_list = [field.strip() for field in fields.split(",") if field.strip()]
+    if not field_list:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid fields provided"
+        )
+    
+    from_date = period_start(period)
+    
+    # One range scan over the (chain_id, metric_field, day) primary key
+    rollup_query = select(ChainMetricRollup).where(
+        and_(
+            ChainMetricRollup.chain_id == chain_id,
+            ChainMetricRollup.metric_field.in_(field_list),
+            ChainMetricRollup.day >= from_date.date()
+        )
+    ).order_by(ChainMetricRollup.metric_field, ChainMetricRollup.day)
+    
+    rollup_result = await session.execute(rollup_query)
+    rollups = rollup_result.scalars().all()
+    
+    series = {field: [] for field in field_list}
+    for rollup in rollups:
+        series[rollup.metric_field].append({
+            "day": rollup.day.isoformat(),
+            "count": rollup.count,
+            "sum": rollup.sum,
+            "mean": rollup.mean,
+            "min": rollup.min,
+            "max": rollup.max
+        })
+    
+    return {
+        "chain_id": chain_id,
+        "is_global": chain_id == GLOBAL_CHAIN_ID,
+        "period": period,
+        "series": series
+    }
@@ -0,0 +1,62 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional, Set
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.core import events
+
+router = APIRouter(tags=["Events"])
+
+# Comment lines sent on idle connections so proxies keep them open and
+# closed clients are noticed
+HEARTBEAT_SECONDS = 15.0
+# Delay before the browser's EventSource reconnects after a drop
+RETRY_MILLISECONDS = 5000
+
+
+def format_event(event: dict) -> str:
+    """Encode an event as a Server-Sent Events message."""
+    return f"event: {event.get('event', 'message')}\ndata: {json.dumps(event)}\n\n"
+
+
+async def event_stream(dao_ids: Set[int]) -> AsyncIterator[str]:
+    async with events.stream() as queue:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if dao_ids and event.get("dao_id") not in dao_ids:
+                continue
+            yield format_event(event)
+
+
+@router.get("/events")
+async def stream_events(
+    dao_ids: Optional[str] = Query(None, description="Comma-separated DAO IDs, all DAOs by default")
+) -> StreamingResponse:
+    """
+    Stream metric events as Server-Sent Events.
+
+    Clients receive a ``run_committed`` event ({"event", "dao_id", "run_id"})
+    whenever ingestion commits a new metric run for one of ``dao_ids``, and
+    can refetch that DAO's data instead of polling for changes.
+
+    Args:
+        dao_ids: Comma-separated list of DAO IDs to receive events for
+
+    Returns:
+        A text/event-stream response that stays open until the client leaves
+    """
+    id_set = {int(id.strip()) for id in (dao_ids or "").split(",") if id.strip().isdigit()}
+
+    return StreamingResponse(
+        event_stream(id_set),
+        media_type="text/event-stream",
+        # Keep proxies (nginx) from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
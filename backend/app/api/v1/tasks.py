@@ -0,0 +1,38 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+
+from app.workers.producer import get_task_status
+
+router = APIRouter(tags=["Tasks"])
+
+# Interval between result backend lookups while waiting for a task
+WAIT_POLL_INTERVAL_SECONDS = 0.25
+
+
+@router.get("/tasks/{task_id}", response_model=Dict[str, Any])
+async def get_task(
+    task_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the task to finish")
+) -> Dict[str, Any]:
+    """
+    Get the status of a background task, e.g. one started by a poll.
+
+    Args:
+        task_id: The task ID returned when the task was queued
+        wait: Seconds to wait for the task to finish before answering
+
+    Returns:
+        The task state (PENDING, STARTED, SUCCESS, FAILURE, ...) and, once
+        finished, its result or error
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        # The result backend client is blocking, keep it off the event loop
+        status = await run_in_threadpool(get_task_status, task_id)
+        if status["ready"] or time.monotonic() >= deadline:
+            return status
+        await asyncio.sleep(WAIT_POLL_INTERVAL_SECONDS)
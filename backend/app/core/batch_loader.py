@@ -0,0 +1,82 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Coalesces the loads of one event loop iteration into a single batch call,
+    and memoizes the results.
+
+    Keys requested by concurrent coroutines before the loop gets back to the
+    loader are loaded together by one call of ``batch_fn``, typically one
+    ``IN`` query. Results are kept for the life of the loader (one request),
+    so a key is loaded at most once.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]]) -> None:
+        """
+        Args:
+            batch_fn: Loads a list of keys, returning the value of each key
+                found; missing keys load as None
+        """
+        self._batch_fn = batch_fn
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._pending: List[K] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _future(self, key: K) -> asyncio.Future:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._load(keys))
+        # Keep a reference until the batch is done
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, keys: List[K]) -> None:
+        futures = [self._futures[key] for key in keys]
+        try:
+            values = await self._batch_fn(keys)
+        except Exception as e:
+            for key, future in zip(keys, futures):
+                # Failed keys are loaded again on their next request
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(values.get(key))
+
+    def prime(self, key: K, value: V) -> None:
+        """Memoize a value loaded by other means, unless already loaded."""
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    async def load(self, key: K) -> Optional[V]:
+        return await asyncio.shield(self._future(key))
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """
+        Returns:
+            Values of the keys found, in the order of ``keys``
+        """
+        futures = {key: self._future(key) for key in keys}
+        # Shielded: a cancelled caller must not cancel loads other callers share
+        values = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return {key: value for key, value in zip(futures, values) if value is not None}
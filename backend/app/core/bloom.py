@@ -0,0 +1,56 @@
+import base64
+import hashlib
+import math
+from typing import Any, Dict, Iterable, List
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Bit positions use double hashing of the 16-byte BLAKE2b digest of the
+    UTF-8 value: position i is ``(h1 + i * h2) % bits``, with h1 and h2 the
+    little-endian halves of the digest. Bit p is bit ``p % 8`` of byte
+    ``p // 8``. Clients can test membership from ``to_dict()`` alone.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        Args:
+            capacity: Number of values the filter is sized for
+            error_rate: False positive rate at capacity
+        """
+        capacity = max(capacity, 1)
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+
+    @classmethod
+    def from_values(cls, values: Iterable[str], error_rate: float = 0.01) -> "BloomFilter":
+        values = list(values)
+        bloom = cls(len(values), error_rate)
+        for value in values:
+            bloom.add(value)
+        return bloom
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little")
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Size, hash count and base64 bit array of the filter."""
+        return {
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "hash": "blake2b-128",
+            "filter": base64.b64encode(bytes(self.array)).decode(),
+        }
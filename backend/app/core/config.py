@@ -18,6 +18,24 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
+    # Observability
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    
+    # Per-request query profiling: requests over budget or repeating a
+    # statement N times (likely N+1) are logged. Disabling it also drops the
+    # per-request SQL figures from /metrics
+    QUERY_PROFILER_ENABLED: bool = os.getenv("QUERY_PROFILER_ENABLED", "True").lower() == "true"
+    QUERY_BUDGET_COUNT: int = int(os.getenv("QUERY_BUDGET_COUNT", "20"))
+    QUERY_BUDGET_MS: float = float(os.getenv("QUERY_BUDGET_MS", "250"))
+    QUERY_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "5"))
+    
+    # OpenTelemetry tracing; spans go to the console unless an OTLP/HTTP
+    # collector is configured, with the standard variables: a base URL
+    # (e.g. http://localhost:4318, spans go to /v1/traces) or a full traces URL
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "False").lower() == "true"
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+    OTEL_EXPORTER_OTLP_TRACES_ENDPOINT: str = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "")
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[Union[str, AnyHttpUrl]] = ["http://localhost:3000"]
 
@@ -45,7 +63,30 @@ class Settings(BaseSettings):
     def SQLALCHEMY_DATABASE_URI_SYNC(self) -> str:
         """Get synchronous SQLAlchemy database URI for Celery."""
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
-    
+
+    # Connection pool of each API engine (per worker process); a pool size
+    # of 0 disables in-process pooling. DB_PGBOUNCER is for PgBouncer >= 1.21
+    # in transaction pooling mode with max_prepared_statements set; read
+    # sessions then use BEGIN READ ONLY instead of a startup parameter
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "False").lower() == "true"
+
+    # Read replicas (comma separated asyncpg URLs) serving GET requests.
+    # A replica lagging more than DB_REPLICA_MAX_LAG_SECONDS, or unreachable,
+    # is skipped until its next lag check; reads then fall back to the primary
+    DB_REPLICA_URLS: str = os.getenv("DB_REPLICA_URLS", "")
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+
+    @property
+    def SQLALCHEMY_REPLICA_URIS(self) -> List[str]:
+        """Get SQLAlchemy URIs of the read replicas."""
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
     # Redis
     REDIS_HOST: str = os.getenv("REDIS_HOST", "redis")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
@@ -56,6 +97,93 @@ class Settings(BaseSettings):
         """Get Redis URL."""
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
     
+    # Pub/sub channel on which ingestion announces committed metric runs
+    METRICS_EVENTS_CHANNEL: str = os.getenv("METRICS_EVENTS_CHANNEL", "dao_portal:metrics_events")
+    
+    # Deduplication of queued tasks: a poll returns the task already queued
+    # or running for the DAO, or the one that finished less than
+    # TASK_DEBOUNCE_SECONDS ago. The in-flight marker expires after
+    # TASK_INFLIGHT_TTL_SECONDS in case a worker dies mid-task
+    TASK_DEBOUNCE_SECONDS: int = int(os.getenv("TASK_DEBOUNCE_SECONDS", "30"))
+    TASK_INFLIGHT_TTL_SECONDS: int = int(os.getenv("TASK_INFLIGHT_TTL_SECONDS", "900"))
+    
+    # Celery rate limit of the per-DAO fetches queued by scheduled refreshes,
+    # per bulk worker (Celery syntax: "10/s", "100/m"; empty to disable)
+    CELERY_BULK_RATE_LIMIT: str = os.getenv("CELERY_BULK_RATE_LIMIT", "10/s")
+    
+    # Staleness-driven refreshes: every REFRESH_SCHEDULER_INTERVAL_SECONDS,
+    # DAOs whose latest successful run is older than their refresh interval
+    # (REFRESH_TARGET_SECONDS unless set on the DAO) are queued, most stale
+    # first, up to REFRESH_BUDGET_PER_HOUR across the hour. REFRESH_JITTER
+    # is the largest fraction of the interval a refresh may come early
+    REFRESH_SCHEDULER_INTERVAL_SECONDS: int = int(os.getenv("REFRESH_SCHEDULER_INTERVAL_SECONDS", "300"))
+    REFRESH_TARGET_SECONDS: int = int(os.getenv("REFRESH_TARGET_SECONDS", str(24 * 3600)))
+    REFRESH_BUDGET_PER_HOUR: int = int(os.getenv("REFRESH_BUDGET_PER_HOUR", "600"))
+    REFRESH_JITTER: float = float(os.getenv("REFRESH_JITTER", "0.1"))
+    REFRESH_RETRY_SECONDS: int = int(os.getenv("REFRESH_RETRY_SECONDS", "3600"))
+    
+    # Coalescing of concurrent identical reads (app.core.singleflight); across
+    # processes via a Redis lock, sharing the result for a short TTL
+    SINGLEFLIGHT_REDIS_ENABLED: bool = os.getenv("SINGLEFLIGHT_REDIS_ENABLED", "False").lower() == "true"
+    SINGLEFLIGHT_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("SINGLEFLIGHT_LOCK_TIMEOUT_SECONDS", "5"))
+    SINGLEFLIGHT_RESULT_TTL_SECONDS: float = float(os.getenv("SINGLEFLIGHT_RESULT_TTL_SECONDS", "1"))
+    
+    # Precompressed cache of rendered DAO documents (app.core.response_cache);
+    # a committed run retires the entries of its DAO and of the DAO list
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "False").lower() == "true"
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+    RESPONSE_CACHE_BROTLI_QUALITY: int = int(os.getenv("RESPONSE_CACHE_BROTLI_QUALITY", "9"))
+    RESPONSE_CACHE_ZSTD_LEVEL: int = int(os.getenv("RESPONSE_CACHE_ZSTD_LEVEL", "10"))
+    
+    # metric_run and metric_snapshot are partitioned by run month; the daily
+    # maintenance task creates partitions PARTITION_MONTHS_AHEAD in advance
+    # and downsamples the history to one run per DAO and day for
+    # RETENTION_DAILY_DAYS, per week until RETENTION_WEEKLY_DAYS, then per
+    # month. With RETENTION_DETACH_MONTHS > 0, partitions older than that
+    # many months are detached for archival. Compaction is opt-in: enable it
+    # once the migration step has split the runs older imports shared
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    RETENTION_ENABLED: bool = os.getenv("RETENTION_ENABLED", "False").lower() == "true"
+    RETENTION_DAILY_DAYS: int = int(os.getenv("RETENTION_DAILY_DAYS", "90"))
+    RETENTION_WEEKLY_DAYS: int = int(os.getenv("RETENTION_WEEKLY_DAYS", "365"))
+    RETENTION_DETACH_MONTHS: int = int(os.getenv("RETENTION_DETACH_MONTHS", "0"))
+
+    # Bucketed metric history (app.core.history_cache): buckets that ended
+    # more than HISTORY_CACHE_GRACE_SECONDS ago are cached for
+    # HISTORY_CACHE_TTL_SECONDS after their last update. The grace covers
+    # runs still in flight when their bucket ends (up to the task time
+    # limit). Bucketed periods longer than HISTORY_BUCKET_MAX_DAYS are
+    # rejected
+    HISTORY_CACHE_ENABLED: bool = os.getenv("HISTORY_CACHE_ENABLED", "True").lower() == "true"
+    HISTORY_CACHE_GRACE_SECONDS: int = int(os.getenv("HISTORY_CACHE_GRACE_SECONDS", "3600"))
+    HISTORY_CACHE_TTL_SECONDS: int = int(os.getenv("HISTORY_CACHE_TTL_SECONDS", str(30 * 86400)))
+    HISTORY_BUCKET_MAX_DAYS: int = int(os.getenv("HISTORY_BUCKET_MAX_DAYS", "3650"))
+
+    # POST /batch runs up to BATCH_MAX_REQUESTS GET sub-requests in process,
+    # BATCH_MAX_CONCURRENCY at a time so that one batch cannot take the
+    # whole connection pool
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    
+    # In-memory columnar store of the latest KPIs
+    KPI_STORE_ENABLED: bool = os.getenv("KPI_STORE_ENABLED", "False").lower() == "true"
+    KPI_STORE_REFRESH_DELAY_SECONDS: float = float(os.getenv("KPI_STORE_REFRESH_DELAY_SECONDS", "1.0"))
+    
+    # In-memory address-to-DAO index of contract and token configurations,
+    # loaded at startup when enabled. Configurations are written outside
+    # the app, so besides configs_changed events the index is reloaded every
+    # ADDRESS_INDEX_RELOAD_SECONDS (0 to rely on events only)
+    ADDRESS_INDEX_ENABLED: bool = os.getenv("ADDRESS_INDEX_ENABLED", "False").lower() == "true"
+    ADDRESS_INDEX_REFRESH_DELAY_SECONDS: float = float(os.getenv("ADDRESS_INDEX_REFRESH_DELAY_SECONDS", "1.0"))
+    ADDRESS_INDEX_RELOAD_SECONDS: float = float(os.getenv("ADDRESS_INDEX_RELOAD_SECONDS", "300"))
+    ADDRESS_BLOOM_ERROR_RATE: float = float(os.getenv("ADDRESS_BLOOM_ERROR_RATE", "0.01"))
+    ADDRESS_LOOKUP_MAX_ADDRESSES: int = int(os.getenv("ADDRESS_LOOKUP_MAX_ADDRESSES", "10000"))
+    
+    # In-memory typeahead index of DAO names and chain IDs, loaded at
+    # startup when enabled
+    DAO_INDEX_ENABLED: bool = os.getenv("DAO_INDEX_ENABLED", "False").lower() == "true"
+    DAO_INDEX_REFRESH_DELAY_SECONDS: float = float(os.getenv("DAO_INDEX_REFRESH_DELAY_SECONDS", "1.0"))
+    
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change_this_in_production")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", str(60 * 24 * 8)))  # 8 days
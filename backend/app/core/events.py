@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event types published on settings.METRICS_EVENTS_CHANNEL
+RUN_COMMITTED = "run_committed"
+# Contract or token configurations were added, changed or removed
+CONFIGS_CHANGED = "configs_changed"
+# DAOs were created, renamed or removed
+DAOS_CHANGED = "daos_changed"
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_handlers: List[EventHandler] = []
+_streams: Set[asyncio.Queue] = set()
+_listener_task: Optional[asyncio.Task] = None
+_sync_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+
+def _encode(event: str, fields: Dict[str, Any]) -> str:
+    return json.dumps({"event": event, **fields})
+
+
+def publish_sync(event: str, **fields: Any) -> None:
+    """
+    Publish an event from synchronous code (Celery tasks).
+    
+    Publishing is best effort: subscribers only use events to refresh
+    derived state, so a Redis outage must never fail ingestion.
+    """
+    global _sync_client
+    try:
+        if _sync_client is None:
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+        _sync_client.publish(settings.METRICS_EVENTS_CHANNEL, _encode(event, fields))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to publish {event} event: {str(e)}")
+
+
+async def publish(event: str, **fields: Any) -> None:
+    """Publish an event from async code (API, importers)."""
+    global _async_client
+    try:
+        if _async_client is None:
+            _async_client = aioredis.Redis.from_url(settings.REDIS_URL)
+        await _async_client.publish(settings.METRICS_EVENTS_CHANNEL, _encode(event, fields))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to publish {event} event: {str(e)}")
+
+
+def subscribe(handler: EventHandler) -> None:
+    """Register a coroutine called with every event received by this process."""
+    _handlers.append(handler)
+
+
+async def _listen() -> None:
+    """Dispatch channel messages to the handlers, reconnecting on errors."""
+    while True:
+        try:
+            client = aioredis.Redis.from_url(settings.REDIS_URL)
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(settings.METRICS_EVENTS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        event = json.loads(message["data"])
+                    except ValueError:
+                        logger.warning(f"Ignoring malformed event: {message['data']!r}")
+                        continue
+                    for handler in _handlers:
+                        try:
+                            await handler(event)
+                        except Exception as e:
+                            logger.error(f"Event handler {handler.__name__} failed: {str(e)}")
+                    for queue in _streams:
+                        try:
+                            queue.put_nowait(event)
+                        except asyncio.QueueFull:
+                            # A stuck consumer must not hold up the others
+                            logger.warning("Dropping event for a slow stream consumer")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Event listener disconnected, retrying: {str(e)}")
+            await asyncio.sleep(5)
+
+
+@asynccontextmanager
+async def stream(max_pending: int = 100) -> AsyncIterator[asyncio.Queue]:
+    """
+    Receive the events of this process on a queue while the block runs.
+    
+    Used by long-lived client connections (Server-Sent Events); the
+    listener is started on demand, so processes without streams or
+    handlers never subscribe to Redis.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+    _streams.add(queue)
+    start_listener()
+    try:
+        yield queue
+    finally:
+        _streams.discard(queue)
+
+
+def start_listener() -> None:
+    """Start listening for events if any handler or stream has been registered."""
+    global _listener_task
+    if (_handlers or _streams) and _listener_task is None:
+        _listener_task = asyncio.create_task(_listen())
+
+
+async def stop_listener() -> None:
+    """Stop the background event listener."""
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -0,0 +1,125 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# One hash per DAO, metric and bucket unit, with a field per closed bucket
+KEY_PREFIX = "dao_portal:history_cache:"
+
+# Point of a bucket: (run timestamp, payload), None for an empty bucket
+BucketPoint = Optional[Tuple[datetime, Dict[str, Any]]]
+
+_sync_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+
+def _get_redis() -> aioredis.Redis:
+    global _async_client
+    if _async_client is None:
+        # Requests are served from the database when Redis is slow or down
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+    return _async_client
+
+
+def cache_key(dao_id: int, metric: str, bucket: str) -> str:
+    return f"{KEY_PREFIX}{dao_id}:{bucket}:{metric}"
+
+
+def encode_point(point: BucketPoint) -> str:
+    if point is None:
+        return "null"
+    timestamp, payload = point
+    return json.dumps([timestamp.isoformat(), payload])
+
+
+def decode_point(value: bytes) -> BucketPoint:
+    point = json.loads(value)
+    if point is None:
+        return None
+    timestamp, payload = point
+    return datetime.fromisoformat(timestamp), payload
+
+
+async def get_buckets(
+    dao_id: int, metric: str, bucket: str, starts: List[datetime]
+) -> Dict[datetime, BucketPoint]:
+    """
+    Cached points of closed buckets, in one round trip.
+
+    Args:
+        dao_id: The ID of the DAO
+        metric: Metric name
+        bucket: Bucket unit ("day", "week" or "month")
+        starts: Start of each bucket to look up
+
+    Returns:
+        Points by bucket start, for the buckets found in the cache
+    """
+    if not settings.HISTORY_CACHE_ENABLED or not starts:
+        return {}
+    try:
+        values = await _get_redis().hmget(
+            cache_key(dao_id, metric, bucket), [start.isoformat() for start in starts]
+        )
+    except redis.RedisError as e:
+        logger.warning(f"History cache lookup failed: {str(e)}")
+        return {}
+    return {start: decode_point(value) for start, value in zip(starts, values) if value is not None}
+
+
+async def put_buckets(
+    dao_id: int, metric: str, bucket: str, points: Dict[datetime, BucketPoint]
+) -> None:
+    """
+    Cache the points of closed buckets for HISTORY_CACHE_TTL_SECONDS.
+
+    Closed buckets only change when old history is compacted or detached,
+    which calls invalidate_sync. The TTL only bounds how long the hashes
+    of DAOs and metrics nobody asks for anymore stay in Redis.
+    """
+    if not settings.HISTORY_CACHE_ENABLED or not points:
+        return
+    key = cache_key(dao_id, metric, bucket)
+    try:
+        async with _get_redis().pipeline(transaction=False) as pipe:
+            pipe.hset(
+                key, mapping={start.isoformat(): encode_point(point) for start, point in points.items()}
+            )
+            pipe.expire(key, settings.HISTORY_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"History cache update failed: {str(e)}")
+
+
+def invalidate_sync() -> int:
+    """
+    Drop every cached bucket, from synchronous code (Celery tasks).
+
+    Returns:
+        Number of hashes deleted
+    """
+    global _sync_client
+    deleted = 0
+    try:
+        if _sync_client is None:
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+        keys = []
+        for key in _sync_client.scan_iter(match=f"{KEY_PREFIX}*", count=1000):
+            keys.append(key)
+            if len(keys) == 1000:
+                deleted += _sync_client.unlink(*keys)
+                keys = []
+        if keys:
+            deleted += _sync_client.unlink(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate the history cache: {str(e)}")
+    return deleted
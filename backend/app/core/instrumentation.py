@@ -0,0 +1,95 @@
+from typing import Dict
+
+from fastapi import FastAPI
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
+from prometheus_fastapi_instrumentator.metrics import Info
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db.profiler import current_profile
+
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "dao_portal_db_statements_per_request",
+    "Number of SQL statements executed while handling a request.",
+    labelnames=("method", "handler"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "dao_portal_db_time_per_request_seconds",
+    "Total time spent executing SQL statements while handling a request.",
+    labelnames=("method", "handler"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "dao_portal_db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the database pool.",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "dao_portal_db_pool_connections",
+    "Connections of the database pool by state.",
+    labelnames=("pool", "state"),
+)
+# Hit ratio: rate(...{result="hit"}) / rate(...) per cache
+CACHE_REQUESTS = Counter(
+    "dao_portal_cache_requests_total",
+    "Lookups of in-process and Redis caches by result.",
+    labelnames=("cache", "result"),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup towards the hit ratio of ``cache``."""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def observe_pool_checkout(pool: str, seconds: float) -> None:
+    """Record how long a connection checkout from ``pool`` took."""
+    DB_POOL_CHECKOUT_SECONDS.labels(pool=pool).observe(seconds)
+
+
+def instrument_pool(name: str, engine: AsyncEngine) -> None:
+    """Export the connection gauges of ``engine``'s pool."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        # NullPool keeps no connections to report
+        return
+    DB_POOL_CONNECTIONS.labels(pool=name, state="size").set_function(pool.size)
+    DB_POOL_CONNECTIONS.labels(pool=name, state="checked_out").set_function(pool.checkedout)
+    DB_POOL_CONNECTIONS.labels(pool=name, state="checked_in").set_function(pool.checkedin)
+    DB_POOL_CONNECTIONS.labels(pool=name, state="overflow").set_function(pool.overflow)
+
+
+def _db_stats_per_request(info: Info) -> None:
+    query_profile = current_profile()
+    if query_profile is None:
+        return
+    labels = {"method": info.method, "handler": info.modified_handler}
+    DB_STATEMENTS_PER_REQUEST.labels(**labels).observe(query_profile.count)
+    DB_TIME_PER_REQUEST.labels(**labels).observe(query_profile.seconds)
+
+
+def setup(app: FastAPI, engines: Dict[str, AsyncEngine]) -> None:
+    """
+    Expose Prometheus metrics on /metrics.
+
+    Adds per-route latency histograms, per-request SQL statement counts and
+    DB time, pool gauges for ``engines`` and cache lookup counters. The SQL
+    figures come from the request's query profile, so QueryProfilerMiddleware
+    must wrap the app and QUERY_PROFILER_ENABLED be on.
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    for name, engine in engines.items():
+        instrument_pool(name, engine)
+
+    # Event streams stay open for the whole session and would skew latencies
+    instrumentator = Instrumentator(excluded_handlers=["/metrics", f"{settings.API_PREFIX}/events"])
+    # Custom instrumentations replace the defaults, so add them back explicitly
+    instrumentator.add(metrics.default())
+    instrumentator.add(_db_stats_per_request)
+    instrumentator.instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
@@ -0,0 +1,340 @@
+import gzip
+import hashlib
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import redis
+import redis.asyncio as aioredis
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.instrumentation import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Rendered documents served from the cache: DAO list pages, DAO details
+# and enhanced metrics (under /daos and at the router's legacy path). The
+# dao_id group scopes an entry to its DAO's version
+CACHEABLE_PATHS = [
+    re.compile(rf"^{re.escape(settings.API_PREFIX)}/daos/?$"),
+    re.compile(rf"^{re.escape(settings.API_PREFIX)}/daos/(?P<dao_id>\d+)$"),
+    re.compile(rf"^{re.escape(settings.API_PREFIX)}(/daos)?/(?P<dao_id>\d+)/enhanced_metrics$"),
+]
+
+# Retires every entry, e.g. after a bulk import
+VERSION_KEY = "dao_portal:response_cache:version"
+VERSION_PREFIX = "dao_portal:response_cache:version:"
+# Set for DB_REPLICA_MAX_LAG_SECONDS after a version bump: a replica may not
+# have the new data yet, so responses are served but not stored meanwhile
+SETTLING_PREFIX = "dao_portal:response_cache:settling:"
+ENTRY_PREFIX = "dao_portal:response_cache:entry:"
+# Scope of the DAO list, which shows every DAO's latest metrics
+LIST_SCOPE = "list"
+
+# Bodies smaller than this are only stored uncompressed
+MIN_COMPRESS_BYTES = 256
+
+
+def _compress_brotli(body: bytes) -> bytes:
+    import brotli
+    return brotli.compress(body, quality=settings.RESPONSE_CACHE_BROTLI_QUALITY)
+
+
+def _compress_zstd(body: bytes) -> bytes:
+    import zstandard
+    return zstandard.ZstdCompressor(level=settings.RESPONSE_CACHE_ZSTD_LEVEL).compress(body)
+
+
+def _compress_gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def _available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Encoders in order of preference; brotli and zstandard are optional."""
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    try:
+        import zstandard  # noqa: F401
+        encoders["zstd"] = _compress_zstd
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+        encoders["br"] = _compress_brotli
+    except ImportError:
+        pass
+    encoders["gzip"] = _compress_gzip
+    return encoders
+
+
+ENCODERS = _available_encoders()
+
+_sync_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+
+def _get_redis() -> aioredis.Redis:
+    global _async_client
+    if _async_client is None:
+        # A slow or unreachable Redis must not hold up requests, which are
+        # then served uncached
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+    return _async_client
+
+
+def dao_scope(dao_id: int) -> str:
+    return f"dao:{dao_id}"
+
+
+def _invalidation_keys(dao_id: Optional[int]) -> Tuple[List[str], List[str]]:
+    """Version keys to bump, and the settling keys to set with them."""
+    if dao_id is None:
+        scopes = [None]
+        versions = [VERSION_KEY]
+    else:
+        scopes = [dao_scope(dao_id), LIST_SCOPE]
+        versions = [f"{VERSION_PREFIX}{scope}" for scope in scopes]
+    settling = []
+    if settings.SQLALCHEMY_REPLICA_URIS and settings.DB_REPLICA_MAX_LAG_SECONDS > 0:
+        settling = [f"{SETTLING_PREFIX}{scope or 'all'}" for scope in scopes]
+    return versions, settling
+
+
+def invalidate_sync(dao_id: Optional[int] = None) -> None:
+    """
+    Invalidate the cached responses of a DAO (and the DAO list), or every
+    cached response, from synchronous code (Celery tasks).
+
+    Called after ingestion commits, before the run is announced, so that
+    clients refetching on the event get the new data. Best effort like
+    event publishing: entries expire after RESPONSE_CACHE_TTL_SECONDS anyway.
+    """
+    global _sync_client
+    versions, settling = _invalidation_keys(dao_id)
+    try:
+        if _sync_client is None:
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+        with _sync_client.pipeline(transaction=False) as pipe:
+            for key in versions:
+                pipe.incr(key)
+            for key in settling:
+                pipe.set(key, 1, px=int(settings.DB_REPLICA_MAX_LAG_SECONDS * 1000))
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate the response cache: {str(e)}")
+
+
+async def invalidate(dao_id: Optional[int] = None) -> None:
+    """``invalidate_sync`` from async code (importers)."""
+    versions, settling = _invalidation_keys(dao_id)
+    try:
+        async with _get_redis().pipeline(transaction=False) as pipe:
+            for key in versions:
+                pipe.incr(key)
+            for key in settling:
+                pipe.set(key, 1, px=int(settings.DB_REPLICA_MAX_LAG_SECONDS * 1000))
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate the response cache: {str(e)}")
+
+
+def negotiate(accept_encoding: str) -> str:
+    """
+    Pick the content coding of the response.
+
+    Args:
+        accept_encoding: Accept-Encoding header of the request
+
+    Returns:
+        The preferred available coding accepted by the client (zstd, br,
+        gzip), or "identity"
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip()] = q
+
+    best, best_q = "identity", 0.0
+    for coding in ENCODERS:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def encode_variants(body: bytes) -> Dict[str, bytes]:
+    """Render every stored representation of a response body."""
+    variants = {"identity": body}
+    if len(body) >= MIN_COMPRESS_BYTES:
+        for coding, encoder in ENCODERS.items():
+            variants[coding] = encoder(body)
+    return variants
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """Entry key of a request; query parameters are sorted."""
+    query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+    return f"{ENTRY_PREFIX}{path}?{query}"
+
+
+def cache_scope(scope) -> Optional[str]:
+    """Version scope of a cacheable request, or None if it is not cacheable."""
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return None
+    for pattern in CACHEABLE_PATHS:
+        match = pattern.match(scope["path"])
+        if match:
+            dao_id = match.groupdict().get("dao_id")
+            return dao_scope(int(dao_id)) if dao_id else LIST_SCOPE
+    return None
+
+
+def is_cacheable(scope) -> bool:
+    return cache_scope(scope) is not None
+
+
+def etag(digest: bytes, coding: str) -> bytes:
+    """Strong ETag of one representation: each content coding has its own."""
+    if coding == "identity":
+        return b'"' + digest + b'"'
+    return b'"' + digest + b"-" + coding.encode() + b'"'
+
+
+def etag_matches(if_none_match: Optional[bytes], tag: bytes) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(b",")]
+    return b"*" in candidates or tag in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving cacheable documents precompressed.
+
+    The first successful response for a URL is stored in Redis with its
+    zstd, brotli and gzip encodings, all rendered once. Later requests get
+    the representation matching their Accept-Encoding straight from Redis,
+    without touching the database or compressing anything. Entries carry
+    the versions current when they were rendered: the global one and the
+    one of their DAO (or of the list). A committed run bumps its DAO's and
+    the list's version, retiring only their entries. For
+    DB_REPLICA_MAX_LAG_SECONDS after a bump, responses are rendered but not
+    stored, since a replica may still serve the previous data.
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        version_scope = cache_scope(scope) if settings.RESPONSE_CACHE_ENABLED else None
+        if version_scope is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        coding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        key = cache_key(scope["path"], scope["query_string"])
+        state_keys = [
+            VERSION_KEY,
+            f"{VERSION_PREFIX}{version_scope}",
+            f"{SETTLING_PREFIX}all",
+            f"{SETTLING_PREFIX}{version_scope}",
+        ]
+
+        # Only the negotiated representation leaves Redis
+        fields = [b"version", b"etag", b"content-type", coding.encode()]
+        client = _get_redis()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                state, values = await pipe.mget(state_keys).hmget(key, fields).execute()
+            global_version, scoped_version, *settling = state
+            version = b"%s:%s" % (global_version or b"0", scoped_version or b"0")
+            entry = dict(zip(fields, values))
+            hit = entry[b"version"] == version
+            if hit and entry[coding.encode()] is None:
+                # Small bodies are only stored uncompressed
+                coding = "identity"
+                entry[b"identity"] = await client.hget(key, b"identity")
+                hit = entry[b"identity"] is not None
+        except redis.RedisError as e:
+            logger.warning(f"Response cache unavailable: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+
+        record_cache("response", hit)
+        if hit:
+            tag = etag(entry[b"etag"], coding)
+            if etag_matches(headers.get(b"if-none-match"), tag):
+                await self._send(send, 304, entry, coding, b"", b"HIT")
+                return
+            await self._send(send, 200, entry, coding, entry[coding.encode()], b"HIT")
+            return
+
+        status, response_headers, body = await self._render(scope, receive)
+        if status != 200:
+            await self._forward(send, status, response_headers, body)
+            return
+
+        variants = await run_in_threadpool(encode_variants, body)
+        entry = {
+            b"version": version,
+            b"etag": hashlib.blake2b(body, digest_size=16).hexdigest().encode(),
+            b"content-type": dict(response_headers).get(b"content-type", b"application/json"),
+            **{coding_name.encode(): data for coding_name, data in variants.items()},
+        }
+        if not any(settling):
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    await pipe.hset(key, mapping=entry).expire(key, settings.RESPONSE_CACHE_TTL_SECONDS).execute()
+            except redis.RedisError as e:
+                logger.warning(f"Failed to store response of {scope['path']}: {str(e)}")
+
+        if coding not in variants:
+            coding = "identity"
+        await self._send(send, 200, entry, coding, variants[coding], b"MISS")
+
+    async def _render(self, scope, receive) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        """Run the request through the app, buffering the response."""
+        start = {}
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send_wrapper)
+        return start["status"], list(start.get("headers", [])), b"".join(chunks)
+
+    @staticmethod
+    async def _forward(send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _send(
+        send, status: int, entry: Dict[bytes, bytes], coding: str, body: bytes, cache: bytes
+    ) -> None:
+        headers = [
+            (b"content-type", entry[b"content-type"]),
+            (b"etag", etag(entry[b"etag"], coding)),
+            (b"vary", b"Accept-Encoding"),
+            (b"x-cache", cache),
+        ]
+        if coding != "identity":
+            headers.append((b"content-encoding", coding.encode()))
+        if status == 200:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+from redis.exceptions import LockError
+
+from app.core.config import settings
+from app.core.instrumentation import record_cache
+
+logger = logging.getLogger(__name__)
+
+_redis_client: Optional[aioredis.Redis] = None
+
+
+def _get_redis() -> aioredis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = aioredis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task and get the same result or exception.
+    The task does not belong to any caller, so a disconnecting client does
+    not cancel it for the others, and the loader must open its own
+    resources (e.g. a database session) rather than borrow the caller's.
+
+    With SINGLEFLIGHT_REDIS_ENABLED the call is also coalesced across
+    processes: the process holding a Redis lock for the key runs it and
+    shares the JSON-encoded result for SINGLEFLIGHT_RESULT_TTL_SECONDS,
+    while other processes wait for that result. Any Redis failure falls
+    back to running the call locally.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of ``fn()``, shared with concurrent calls for ``key``.
+
+        Args:
+            key: Identity of the call, e.g. the DAO ID
+            fn: Coroutine function producing the result
+
+        Returns:
+            The result of the single execution of ``fn`` for ``key``
+        """
+        task = self._calls.get(key)
+        record_cache(f"singleflight_{self.name}", hit=task is not None)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller went away
+            task.exception()
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.SINGLEFLIGHT_REDIS_ENABLED:
+            return await fn()
+
+        redis_key = f"singleflight:{self.name}:{key}"
+        try:
+            return await self._run_shared(redis_key, fn)
+        except redis.RedisError as e:
+            logger.warning(f"Singleflight {self.name} falling back to a local call: {str(e)}")
+            return await fn()
+
+    async def _run_shared(self, redis_key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        client = _get_redis()
+        lock_key = f"{redis_key}:lock"
+        result_key = f"{redis_key}:result"
+        lock_timeout = settings.SINGLEFLIGHT_LOCK_TIMEOUT_SECONDS
+        deadline = time.monotonic() + lock_timeout
+
+        lock = client.lock(lock_key, timeout=lock_timeout)
+        while True:
+            cached = await client.get(result_key)
+            if cached is not None:
+                return json.loads(cached)
+            if await lock.acquire(blocking=False):
+                break
+            if time.monotonic() >= deadline:
+                # The lock holder is stuck or failed: stop waiting for it
+                return await fn()
+            await asyncio.sleep(0.02)
+
+        try:
+            result = await fn()
+            await client.set(
+                result_key, json.dumps(result),
+                px=int(settings.SINGLEFLIGHT_RESULT_TTL_SECONDS * 1000),
+            )
+            return result
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                # Expired while the call ran; another process may hold it now
+                pass
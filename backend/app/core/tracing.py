@@ -0,0 +1,93 @@
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import trace
+except ImportError:  # Tracing is optional
+    trace = None
+
+
+def setup_tracing(service_name: str) -> bool:
+    """
+    Install a tracer provider exporting spans for ``service_name``.
+
+    Spans go to an OTLP/HTTP collector when OTEL_EXPORTER_OTLP_ENDPOINT or
+    OTEL_EXPORTER_OTLP_TRACES_ENDPOINT is set, and to the console otherwise,
+    so tracing works without any collector running.
+
+    Returns:
+        True if tracing is enabled and the OpenTelemetry SDK is available
+    """
+    if not settings.TRACING_ENABLED:
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("TRACING_ENABLED is set but the OpenTelemetry SDK is not installed")
+        return False
+
+    if settings.OTEL_EXPORTER_OTLP_ENDPOINT or settings.OTEL_EXPORTER_OTLP_TRACES_ENDPOINT:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        # The exporter reads both variables itself and appends /v1/traces
+        # to the base URL of OTEL_EXPORTER_OTLP_ENDPOINT
+        exporter = OTLPSpanExporter()
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(resource=Resource.create({
+        "service.name": service_name,
+        "deployment.environment": settings.ENVIRONMENT,
+    }))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+def instrument_app(app: Any) -> None:
+    """Create a server span for every FastAPI request."""
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="health,metrics,events")
+
+
+def instrument_engines(*engines: Any) -> None:
+    """Create a span for every statement on the given (sync or async) engines."""
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    SQLAlchemyInstrumentor().instrument(
+        engines=[getattr(engine, "sync_engine", engine) for engine in engines]
+    )
+
+
+def instrument_celery() -> None:
+    """
+    Trace Celery publish and execution.
+
+    The trace context travels in the task headers, so a worker span is a
+    child of the request span that queued the task.
+    """
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    CeleryInstrumentor().instrument()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """
+    Trace the enclosed block as a child of the current span.
+
+    A no-op when OpenTelemetry is not installed or no provider is set up.
+    """
+    if trace is None:
+        yield None
+        return
+
+    with trace.get_tracer("dao_portal").start_as_current_span(name) as current:
+        for key, value in attributes.items():
+            current.set_attribute(key, value)
+        yield current
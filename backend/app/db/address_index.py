@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core import events
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.db.models import ContractConfig, TokenConfig
+from app.db.session import async_session
+
+logger = logging.getLogger(__name__)
+
+# (address, dao_id, kind, type, name), kind being "contract" or "token"
+AddressRow = Tuple[str, int, str, str, str]
+
+
+def normalize_address(address: str) -> str:
+    """Addresses are matched case-insensitively (EIP-55 checksums are mixed case)."""
+    return address.strip().lower()
+
+
+class AddressIndex:
+    """
+    In-memory index of the contract and token addresses of every DAO.
+
+    Maps each normalized address to the configurations holding it, and
+    keeps a Bloom filter of the addresses that clients can use to skip
+    addresses that are certainly unknown.
+    """
+
+    def __init__(self, entries: Dict[str, List[Dict[str, Any]]], refresh_seconds: float = 0.0) -> None:
+        self.entries = entries
+        self.bloom = BloomFilter.from_values(entries, settings.ADDRESS_BLOOM_ERROR_RATE)
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at = datetime.utcnow()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[AddressRow], refresh_seconds: float = 0.0) -> "AddressIndex":
+        entries: Dict[str, List[Dict[str, Any]]] = {}
+        for address, dao_id, kind, type_, name in rows:
+            entries.setdefault(normalize_address(address), []).append(
+                {"dao_id": dao_id, "kind": kind, "type": type_, "name": name}
+            )
+        return cls(entries, refresh_seconds=refresh_seconds)
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "AddressIndex":
+        """Load the addresses of every contract and token configuration."""
+        started = time.perf_counter()
+        rows: List[AddressRow] = []
+        for model, kind in ((ContractConfig, "contract"), (TokenConfig, "token")):
+            result = await session.execute(select(model.address, model.dao_id, model.type, model.name))
+            rows.extend((address, dao_id, kind, type_, name) for address, dao_id, type_, name in result.all())
+        return cls.from_rows(rows, refresh_seconds=time.perf_counter() - started)
+
+    def lookup(self, addresses: Iterable[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """
+        Returns:
+            Configurations of each known address, and the unknown addresses,
+            all normalized and deduplicated in request order
+        """
+        matches: Dict[str, List[Dict[str, Any]]] = {}
+        unknown: Dict[str, None] = {}
+        for address in addresses:
+            address = normalize_address(address)
+            found = self.entries.get(address)
+            if found is not None:
+                matches[address] = found
+            else:
+                unknown[address] = None
+        return matches, list(unknown)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, Bloom filter size and refresh time of the index."""
+        return {
+            "address_count": len(self.entries),
+            "bloom_bits": self.bloom.bits,
+            "bloom_hashes": self.bloom.hashes,
+            "refresh_seconds": round(self.refresh_seconds, 6),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+_index: Optional[AddressIndex] = None
+_refresh_handle: Optional[asyncio.TimerHandle] = None
+_reload_task: Optional[asyncio.Task] = None
+# Refreshes in progress, referenced until they are done
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+def get_loaded_index() -> Optional[AddressIndex]:
+    """The process-wide index, or None when it is disabled or not loaded yet."""
+    return _index
+
+
+async def refresh_index() -> AddressIndex:
+    """Reload the process-wide index from the database."""
+    global _index
+    async with async_session() as session:
+        index = await AddressIndex.load(session)
+    _index = index
+    logger.info(
+        f"Address index refreshed: {len(index.entries)} addresses "
+        f"in {index.refresh_seconds * 1000:.1f} ms"
+    )
+    return index
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    _refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Address index refresh failed: {task.exception()!r}")
+
+
+async def _on_event(event: Dict[str, Any]) -> None:
+    """Schedule a refresh once a burst of configuration changes has settled."""
+    global _refresh_handle
+    if event.get("event") != events.CONFIGS_CHANGED or _refresh_handle is not None:
+        return
+
+    def _refresh() -> None:
+        global _refresh_handle
+        _refresh_handle = None
+        task = asyncio.create_task(refresh_index())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_done)
+
+    loop = asyncio.get_running_loop()
+    _refresh_handle = loop.call_later(settings.ADDRESS_INDEX_REFRESH_DELAY_SECONDS, _refresh)
+
+
+async def _reload_periodically() -> None:
+    """Catch configuration changes made without publishing an event."""
+    while True:
+        await asyncio.sleep(settings.ADDRESS_INDEX_RELOAD_SECONDS)
+        try:
+            await refresh_index()
+        except Exception as e:
+            logger.error(f"Address index reload failed: {str(e)}")
+
+
+async def start() -> None:
+    """
+    Load the index and keep it up to date with configuration change
+    events, and every ADDRESS_INDEX_RELOAD_SECONDS.
+    """
+    global _reload_task
+    await refresh_index()
+    events.subscribe(_on_event)
+    if settings.ADDRESS_INDEX_RELOAD_SECONDS > 0:
+        _reload_task = asyncio.create_task(_reload_periodically())
+
+
+async def stop() -> None:
+    """Cancel the pending and running refreshes and the periodic reload."""
+    global _refresh_handle, _reload_task
+    if _refresh_handle is not None:
+        _refresh_handle.cancel()
+        _refresh_handle = None
+    if _reload_task is not None:
+        _reload_task.cancel()
+        try:
+            await _reload_task
+        except asyncio.CancelledError:
+            pass
+        _reload_task = None
+    for task in list(_refresh_tasks):
+        task.cancel()
+    await asyncio.gather(*_refresh_tasks, return_exceptions=True)
@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core import events
+from app.core.config import settings
+from app.db.models import DAO
+from app.db.session import async_session
+
+logger = logging.getLogger(__name__)
+
+WORD_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+# Sorts after any character of a key, to bound a prefix range
+KEY_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PrefixTable:
+    """
+    Sorted keys, each with the rank of a DAO; the keys starting with a
+    prefix form one range, found by bisection.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int]]) -> None:
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.ranks = np.fromiter((rank for _, rank in entries), dtype=np.int32, count=len(entries))
+
+    def top(self, prefix: str, limit: int) -> np.ndarray:
+        """Lowest distinct ranks of the keys starting with ``prefix``, in order."""
+        ranks = self.ranks[
+            bisect.bisect_left(self.keys, prefix):bisect.bisect_left(self.keys, prefix + KEY_END)
+        ]
+        # A DAO may hold several keys of the range: partition a margin first
+        margin = 4 * limit
+        if len(ranks) > margin:
+            lowest = np.unique(np.partition(ranks, margin)[:margin])
+            if len(lowest) >= limit:
+                return lowest[:limit]
+        return np.unique(ranks)[:limit]
+
+
+class DAOIndex:
+    """
+    In-memory typeahead index of DAO names and chain IDs.
+
+    DAOs are ranked by name length, then name. Matches come from, best
+    first: names starting with the query, names with a later word starting
+    with it, names containing it (three characters or more, through a
+    trigram index), chain IDs equal to it, then chain IDs starting with it.
+    Each prefix kind is a sorted table, so a query costs a bisection and a
+    partial sort of the ranks in range, whatever the number of DAOs.
+    """
+
+    def __init__(self, daos: Iterable[Tuple[int, str, str]], refresh_seconds: float = 0.0) -> None:
+        """
+        Args:
+            daos: (id, name, chain_id) of every DAO
+            refresh_seconds: Time spent loading the DAOs
+        """
+        self.daos = sorted(daos, key=lambda dao: (len(dao[1]), dao[1].lower(), dao[0]))
+        self.names = [normalize(name) for _, name, _ in self.daos]
+
+        words: List[Tuple[str, int]] = []
+        postings: Dict[str, List[int]] = {}
+        for rank, name in enumerate(self.names):
+            # The first word is a prefix of the name itself
+            words.extend((word, rank) for word in set(WORD_SEPARATORS.split(name)[1:]) if word)
+            for trigram in trigrams(name):
+                postings.setdefault(trigram, []).append(rank)
+
+        self.tables = [
+            PrefixTable((name, rank) for rank, name in enumerate(self.names)),
+            PrefixTable(words),
+        ]
+        self.chains = PrefixTable((chain_id.lower(), rank) for rank, (_, _, chain_id) in enumerate(self.daos))
+        # Typing "1" means chain 1 before chains 10 and 100
+        self.chain_ranks: Dict[str, List[int]] = {}
+        for rank, (_, _, chain_id) in enumerate(self.daos):
+            self.chain_ranks.setdefault(chain_id.lower(), []).append(rank)
+        self.trigrams = postings
+
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at = datetime.utcnow()
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "DAOIndex":
+        """Load the name and chain of every DAO in a single query."""
+        started = time.perf_counter()
+        result = await session.execute(select(DAO.id, DAO.name, DAO.chain_id))
+        rows = result.all()
+        return cls(rows, refresh_seconds=time.perf_counter() - started)
+
+    def _substrings(self, query: str) -> Iterable[int]:
+        """Ranks of the names containing ``query``, in order, lazily."""
+        if len(query) < 3:
+            return []
+        postings = [self.trigrams.get(trigram, []) for trigram in trigrams(query)]
+        # Every match holds the rarest trigram of the query; its postings
+        # are in rank order, so the scan stops at the last match needed
+        return (rank for rank in min(postings, key=len) if query in self.names[rank])
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Best matches of a typed query.
+
+        Returns:
+            At most ``limit`` DAOs as {"id", "name", "chain_id"}, best first
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        # A DAO found by an earlier kind of match is skipped by later ones:
+        # asking each kind for ``limit`` ranks is always enough
+        ranked: Dict[int, None] = {}
+        sources = [lambda table=table: table.top(query, limit).tolist() for table in self.tables]
+        sources += [
+            lambda: self._substrings(query),
+            lambda: self.chain_ranks.get(query, [])[:limit],
+            lambda: self.chains.top(query, limit).tolist(),
+        ]
+        for source in sources:
+            for rank in source():
+                ranked.setdefault(rank)
+                if len(ranked) == limit:
+                    break
+            if len(ranked) == limit:
+                break
+
+        return [
+            {"id": self.daos[rank][0], "name": self.daos[rank][1], "chain_id": self.daos[rank][2]}
+            for rank in ranked
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and refresh time of the index."""
+        return {
+            "dao_count": len(self.daos),
+            "key_count": sum(len(table.keys) for table in self.tables) + len(self.chains.keys),
+            "trigram_count": len(self.trigrams),
+            "refresh_seconds": round(self.refresh_seconds, 6),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+_index: Optional[DAOIndex] = None
+_refresh_handle: Optional[asyncio.TimerHandle] = None
+# Running refreshes, referenced until they finish
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+def get_loaded_index() -> Optional[DAOIndex]:
+    """The process-wide index, or None when it is disabled or not loaded yet."""
+    return _index
+
+
+async def refresh_index() -> DAOIndex:
+    """Reload the process-wide index from the database."""
+    global _index
+    async with async_session() as session:
+        index = await DAOIndex.load(session)
+    _index = index
+    logger.info(
+        f"DAO index refreshed: {len(index.daos)} DAOs in {index.refresh_seconds * 1000:.1f} ms"
+    )
+    return index
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    _refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"DAO index refresh failed: {task.exception()!r}")
+
+
+async def _on_event(event: Dict[str, Any]) -> None:
+    """Schedule a refresh once a burst of DAO changes has settled."""
+    global _refresh_handle
+    if event.get("event") != events.DAOS_CHANGED or _refresh_handle is not None:
+        return
+
+    def _refresh() -> None:
+        global _refresh_handle
+        _refresh_handle = None
+        task = asyncio.create_task(refresh_index())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_done)
+
+    loop = asyncio.get_running_loop()
+    _refresh_handle = loop.call_later(settings.DAO_INDEX_REFRESH_DELAY_SECONDS, _refresh)
+
+
+async def start() -> None:
+    """Load the index and keep it up to date with DAO change events."""
+    await refresh_index()
+    events.subscribe(_on_event)
+
+
+async def stop() -> None:
+    """Cancel the pending and running refreshes, before the engine is disposed."""
+    global _refresh_handle
+    if _refresh_handle is not None:
+        _refresh_handle.cancel()
+        _refresh_handle = None
+    for task in list(_refresh_tasks):
+        task.cancel()
+    await asyncio.gather(*_refresh_tasks, return_exceptions=True)
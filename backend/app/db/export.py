@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.concurrency import run_in_threadpool
+
+from app.db.models import DAO, MetricRun, MetricSnapshot
+from app.db.session import replica_router
+
+FORMATS = ("parquet", "arrow", "csv")
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "csv": "text/csv",
+}
+
+# One row per (run, metric, field): the long format most analysis tools pivot from
+COLUMNS = [
+    "dao_id", "dao_name", "chain_id", "run_id", "run_timestamp",
+    "metric_name", "field", "value", "value_text",
+]
+
+
+def flatten_payload(payload: Any, prefix: str = "") -> Iterator[Tuple[str, Optional[float], Optional[str]]]:
+    """
+    Flatten a snapshot payload into (field, value, value_text) triples.
+
+    Nested objects become dotted field names. Numbers go to ``value``;
+    strings, booleans and lists (as JSON) go to ``value_text``.
+    """
+    if isinstance(payload, dict):
+        for key, item in payload.items():
+            yield from flatten_payload(item, f"{prefix}.{key}" if prefix else str(key))
+    elif payload is None:
+        return
+    elif isinstance(payload, bool):
+        yield prefix, None, "true" if payload else "false"
+    elif isinstance(payload, (int, float)):
+        yield prefix, float(payload), None
+    elif isinstance(payload, str):
+        yield prefix, None, payload
+    else:
+        yield prefix, None, json.dumps(payload)
+
+
+@asynccontextmanager
+async def export_connection() -> AsyncIterator[AsyncConnection]:
+    """
+    Connection for an export, on a replica when one is fresh enough.
+
+    The export runs in a single REPEATABLE READ transaction: server-side
+    cursors need a transaction, and the whole export sees one snapshot
+    even while ingestion commits new runs.
+    """
+    _, engine = await replica_router.choose()
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+        async with conn.begin():
+            yield conn
+
+
+async def iter_export_batches(
+    conn: AsyncConnection,
+    dao_ids: Optional[List[int]] = None,
+    chain_id: Optional[str] = None,
+    metrics: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Dict[str, List[Any]]]:
+    """
+    Read the flattened snapshots of succeeded runs in column batches.
+
+    Snapshots are fetched ``batch_size`` at a time from a server-side
+    cursor, so memory stays bounded whatever the size of the export.
+
+    Args:
+        conn: Connection inside a transaction (see ``export_connection``)
+        dao_ids: Only export these DAOs
+        chain_id: Only export DAOs of this chain
+        metrics: Only export these metric names
+        start: Only export runs at or after this time
+        end: Only export runs before this time
+        batch_size: Snapshots per batch
+
+    Yields:
+        Dictionaries mapping every column of COLUMNS to a list of values
+    """
+    query = (
+        select(
+            DAO.id, DAO.name, DAO.chain_id, MetricRun.id, MetricRun.run_timestamp,
+            MetricSnapshot.metric_name, MetricSnapshot.jsonb_payload,
+        )
+        .join(MetricRun, and_(
+            MetricRun.id == MetricSnapshot.run_id,
+            MetricRun.run_timestamp == MetricSnapshot.run_timestamp,
+        ))
+        .join(DAO, DAO.id == MetricSnapshot.dao_id)
+        .where(MetricRun.succeeded == True)
+        .order_by(MetricSnapshot.id)
+    )
+    if dao_ids:
+        query = query.where(MetricSnapshot.dao_id.in_(dao_ids))
+    if chain_id:
+        query = query.where(DAO.chain_id == chain_id)
+    if metrics:
+        query = query.where(MetricSnapshot.metric_name.in_(metrics))
+    # Filtered on the snapshots' copy of the run timestamp, which prunes
+    # the partitions of both tables
+    if start:
+        query = query.where(MetricSnapshot.run_timestamp >= start)
+    if end:
+        query = query.where(MetricSnapshot.run_timestamp < end)
+
+    result = await conn.stream(query.execution_options(max_row_buffer=batch_size))
+    async for rows in result.partitions(batch_size):
+        # Flattening a batch takes milliseconds: keep it off the event loop
+        batch = await run_in_threadpool(_flatten_rows, rows)
+        if batch["dao_id"]:
+            yield batch
+
+
+def _flatten_rows(rows: List[Any]) -> Dict[str, List[Any]]:
+    batch: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+    for dao_id, dao_name, dao_chain_id, run_id, run_timestamp, metric_name, payload in rows:
+        for field, value, value_text in flatten_payload(payload):
+            batch["dao_id"].append(dao_id)
+            batch["dao_name"].append(dao_name)
+            batch["chain_id"].append(dao_chain_id)
+            batch["run_id"].append(run_id)
+            batch["run_timestamp"].append(run_timestamp)
+            batch["metric_name"].append(metric_name)
+            batch["field"].append(field)
+            batch["value"].append(value)
+            batch["value_text"].append(value_text)
+    return batch
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting what pyarrow writes until it is drained."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("dao_id", pa.int64()),
+        ("dao_name", pa.string()),
+        ("chain_id", pa.string()),
+        ("run_id", pa.int64()),
+        ("run_timestamp", pa.timestamp("us", tz="UTC")),
+        ("metric_name", pa.string()),
+        ("field", pa.string()),
+        ("value", pa.float64()),
+        ("value_text", pa.string()),
+    ])
+
+
+async def encode_export(
+    batches: AsyncIterator[Dict[str, List[Any]]], format: str
+) -> AsyncIterator[bytes]:
+    """
+    Encode column batches as Parquet (one row group per batch), an Arrow
+    IPC stream or CSV, yielding the bytes of each batch as soon as it is
+    encoded. Each batch is encoded in the thread pool, so a large export
+    does not hold up the other requests.
+    """
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def write_csv(rows: Iterator[Any]) -> bytes:
+            writer.writerows(rows)
+            data = buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            return data
+
+        writer.writerow(COLUMNS)
+        async for batch in batches:
+            yield await run_in_threadpool(write_csv, zip(*(batch[column] for column in COLUMNS)))
+        yield buffer.getvalue().encode()
+        return
+
+    # pyarrow is only imported by exports, keeping it out of API startup
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    def write_arrow(batch: Dict[str, List[Any]]) -> bytes:
+        writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+        return sink.drain()
+
+    try:
+        async for batch in batches:
+            yield await run_in_threadpool(write_arrow, batch)
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,87 @@
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import true
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+from sqlmodel import select
+
+from app.core.config import settings
+from app.db.models import DAO, MetricRun
+
+# (dao_id, refresh interval in seconds or None, latest successful run,
+# latest run whatever its outcome)
+FreshnessRow = Tuple[int, Optional[int], Optional[datetime], Optional[datetime]]
+
+
+def freshness_query() -> Select:
+    """
+    Latest successful run and latest run of every DAO, with its refresh
+    interval; each run is one index lookup in a LATERAL subquery.
+    """
+    succeeded = select(MetricRun.run_timestamp).where(
+        MetricRun.dao_id == DAO.id, MetricRun.succeeded == True
+    ).order_by(MetricRun.run_timestamp.desc()).limit(1).lateral("latest_success")
+    attempted = select(MetricRun.run_timestamp).where(
+        MetricRun.dao_id == DAO.id
+    ).order_by(MetricRun.run_timestamp.desc()).limit(1).lateral("latest_attempt")
+
+    return select(
+        DAO.id, DAO.refresh_interval_seconds, succeeded.c.run_timestamp, attempted.c.run_timestamp
+    ).select_from(DAO).outerjoin(succeeded, true()).outerjoin(attempted, true())
+
+
+def tick_budget(interval_seconds: float) -> int:
+    """Share of REFRESH_BUDGET_PER_HOUR of one scheduler tick, at least one."""
+    return max(1, math.ceil(settings.REFRESH_BUDGET_PER_HOUR * interval_seconds / 3600))
+
+
+def select_due(
+    rows: Iterable[FreshnessRow], now: datetime, budget: Optional[int] = None, jitter: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> List[int]:
+    """
+    DAOs to refresh now, most overdue first.
+
+    A DAO is due once its latest successful run is older than its refresh
+    interval (REFRESH_TARGET_SECONDS by default), shortened by a random
+    fraction of up to ``jitter``: DAOs refreshed together drift apart, so
+    the refreshes spread over the day. A DAO whose latest attempt failed
+    waits REFRESH_RETRY_SECONDS before the next. DAOs without a successful
+    run come first, then by age relative to their interval.
+
+    Args:
+        rows: Freshness of every DAO, as selected by ``freshness_query``
+        now: Current time, timezone-aware
+        budget: Maximum number of DAOs to return, all due DAOs when None
+        jitter: Largest fraction of the interval a refresh may come early
+        rng: Random generator for the jitter
+
+    Returns:
+        IDs of the DAOs to refresh
+    """
+    rng = rng or random.Random()
+    retry_before = now - timedelta(seconds=settings.REFRESH_RETRY_SECONDS)
+    due: List[Tuple[float, int]] = []
+    for dao_id, interval, succeeded_at, attempted_at in rows:
+        failed = attempted_at is not None and attempted_at != succeeded_at
+        if failed and attempted_at > retry_before:
+            continue
+        interval = interval or settings.REFRESH_TARGET_SECONDS
+        if succeeded_at is None:
+            staleness = math.inf
+        else:
+            staleness = (now - succeeded_at).total_seconds() / interval
+            if staleness < 1 - jitter * rng.random():
+                continue
+        due.append((staleness, dao_id))
+
+    due.sort(key=lambda item: (-item[0], item[1]))
+    return [dao_id for _, dao_id in due[:budget]]
+
+
+def find_due_daos(conn: Connection, now: datetime, budget: Optional[int] = None) -> List[int]:
+    """Select the DAOs to refresh now, in one query."""
+    return select_due(conn.execute(freshness_query()).all(), now, budget, settings.REFRESH_JITTER)
@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core import history_cache
+from app.core.config import settings
+from app.db.models import MetricRun, MetricSnapshot
+from app.db.partitions import add_months, month_start
+from app.db.repository import MetricsRepository
+from app.db.runs import as_utc
+
+# Bucket units of the bucketed history, as date_trunc units
+HISTORY_BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(timestamp: datetime, bucket: str) -> datetime:
+    """Start of the UTC bucket of ``timestamp``, as date_trunc computes it."""
+    if bucket == "month":
+        return month_start(timestamp)
+    day = as_utc(timestamp).astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        # ISO weeks start on Monday
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def next_bucket(start: datetime, bucket: str) -> datetime:
+    if bucket == "month":
+        return add_months(start, 1)
+    return start + timedelta(days=7 if bucket == "week" else 1)
+
+
+def bucket_starts(start: datetime, end: datetime, bucket: str) -> List[datetime]:
+    """Starts of the buckets overlapping [start, end)."""
+    starts = []
+    current = bucket_start(start, bucket)
+    while current < end:
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def bucket_points_query(dao_id: int, metric: str, bucket: str, start: datetime) -> Select:
+    """
+    (bucket start, run timestamp, payload) of the latest successful run of
+    each bucket since ``start``.
+
+    This is the run compaction keeps for a bucket, so history older than
+    the daily retention tier reads the same before and after compaction.
+    """
+    if bucket not in HISTORY_BUCKETS:
+        raise ValueError(f"Unknown history bucket: {bucket}")
+    # Rendered inline: with bind parameters, Postgres cannot match the
+    # DISTINCT ON and ORDER BY expressions
+    truncated = func.date_trunc(
+        literal_column(f"'{bucket}'"), func.timezone(literal_column("'UTC'"), MetricRun.run_timestamp)
+    )
+    return select(
+        truncated, MetricRun.run_timestamp, MetricSnapshot.jsonb_payload
+    ).join(
+        MetricRun, and_(
+            MetricSnapshot.run_id == MetricRun.id,
+            MetricSnapshot.run_timestamp == MetricRun.run_timestamp
+        )
+    ).where(
+        and_(
+            MetricSnapshot.dao_id == dao_id,
+            MetricSnapshot.metric_name == metric,
+            # Filter both sides so that only the range's partitions are scanned
+            MetricSnapshot.run_timestamp >= start,
+            MetricRun.run_timestamp >= start,
+            MetricRun.succeeded == True
+        )
+    ).distinct(truncated).order_by(truncated, MetricRun.run_timestamp.desc())
+
+
+def metric_exists_query(dao_id: int, metric: str) -> Select:
+    """Whether the DAO has any snapshot of ``metric``."""
+    return select(MetricSnapshot.id).where(
+        and_(MetricSnapshot.dao_id == dao_id, MetricSnapshot.metric_name == metric)
+    ).limit(1)
+
+
+async def bucketed_history(
+    session: Union[AsyncSession, MetricsRepository],
+    dao_id: int,
+    metric: str,
+    bucket: str,
+    start: datetime,
+    now: Optional[datetime] = None,
+) -> List[Tuple[datetime, Dict[str, Any]]]:
+    """
+    History of a metric with one point per bucket: its latest successful run.
+
+    Closed buckets never change, so they are read from the history cache
+    and only computed on their first request. A single query covers the
+    buckets missing from the cache and the open ones, which are the current
+    bucket and those that ended less than HISTORY_CACHE_GRACE_SECONDS ago.
+
+    Only metrics the DAO has snapshots of are cached, so that requests for
+    made-up metric names cannot fill Redis.
+
+    Args:
+        session: Database session, or the metrics repository of the request
+        dao_id: The ID of the DAO
+        metric: Metric name
+        bucket: One of HISTORY_BUCKETS
+        start: Start of the period; earlier points are left out
+        now: End of the period (the current time by default)
+
+    Returns:
+        (run timestamp, payload) points in time order
+    """
+    start = as_utc(start)
+    now = now or datetime.now(timezone.utc)
+    starts = bucket_starts(start, now, bucket)
+    closes_before = now - timedelta(seconds=settings.HISTORY_CACHE_GRACE_SECONDS)
+    closed = [s for s in starts if next_bucket(s, bucket) <= closes_before]
+
+    points = await history_cache.get_buckets(dao_id, metric, bucket, closed)
+    if not points and (await session.execute(metric_exists_query(dao_id, metric))).first() is None:
+        return []
+    missing = [s for s in closed if s not in points]
+    query_start = missing[0] if missing else next((s for s in starts if s not in points), None)
+
+    if query_start is not None:
+        result = await session.execute(bucket_points_query(dao_id, metric, bucket, query_start))
+        computed = {
+            as_utc(truncated): (run_timestamp, payload)
+            for truncated, run_timestamp, payload in result.all()
+        }
+        await history_cache.put_buckets(
+            dao_id, metric, bucket, {s: computed.get(s) for s in missing}
+        )
+        for s in starts:
+            if s >= query_start and s not in points:
+                points[s] = computed.get(s)
+
+    return [
+        point for point in (points.get(s) for s in starts)
+        if point is not None and point[0] >= start
+    ]
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core import events
+from app.core.config import settings
+from app.db.models import DAO
+from app.db.rollups import extract_numeric_fields
+from app.db.runs import load_run_metrics, resolve_runs
+from app.db.session import async_session
+
+logger = logging.getLogger(__name__)
+
+
+class KPIStore:
+    """
+    Columnar snapshot of the latest numeric KPIs of every DAO.
+
+    Row i of every column belongs to the DAO ``dao_ids[i]``; missing
+    values are NaN. Each field is a "<metric_name>.<key>" name as produced
+    by ``extract_numeric_fields``.
+    """
+
+    def __init__(
+        self,
+        dao_ids: List[int],
+        names: List[str],
+        chain_ids: List[str],
+        columns: Dict[str, np.ndarray],
+        refresh_seconds: float = 0.0,
+    ):
+        self.dao_ids = np.asarray(dao_ids, dtype=np.int64)
+        self.names = np.asarray(names, dtype=object)
+        self.chain_ids = np.asarray(chain_ids, dtype=object)
+        self.columns = columns
+        self.index = {int(dao_id): i for i, dao_id in enumerate(self.dao_ids)}
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at = datetime.utcnow()
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Tuple[int, str, str, str, Dict[str, Any]]], refresh_seconds: float = 0.0
+    ) -> "KPIStore":
+        """
+        Build a store from (dao_id, dao_name, chain_id, metric_name, payload) rows.
+        """
+        daos: Dict[int, Tuple[str, str]] = {}
+        payloads: Dict[int, Dict[str, Any]] = {}
+        for dao_id, name, chain_id, metric_name, payload in rows:
+            daos[dao_id] = (name, chain_id)
+            payloads.setdefault(dao_id, {})[metric_name] = payload
+
+        dao_ids = sorted(daos)
+        values = [extract_numeric_fields(payloads[dao_id]) for dao_id in dao_ids]
+        fields = sorted({field for row in values for field in row})
+
+        columns = {field: np.full(len(dao_ids), np.nan, dtype=np.float64) for field in fields}
+        for i, row in enumerate(values):
+            for field, value in row.items():
+                columns[field][i] = value
+
+        return cls(
+            dao_ids=dao_ids,
+            names=[daos[dao_id][0] for dao_id in dao_ids],
+            chain_ids=[daos[dao_id][1] for dao_id in dao_ids],
+            columns=columns,
+            refresh_seconds=refresh_seconds,
+        )
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "KPIStore":
+        """
+        Load the latest KPIs of every DAO: the DAOs, their latest runs (one
+        index lookup per DAO) and those runs' snapshots, in three queries.
+        """
+        started = time.perf_counter()
+
+        daos = (await session.execute(select(DAO.id, DAO.name, DAO.chain_id))).all()
+        runs = await resolve_runs(session, [dao_id for dao_id, _, _ in daos])
+        metrics = await load_run_metrics(session, runs)
+
+        rows = [
+            (dao_id, name, chain_id, metric_name, payload)
+            for dao_id, name, chain_id in daos
+            for metric_name, payload in metrics.get(dao_id, {}).items()
+        ]
+        return cls.from_rows(rows, refresh_seconds=time.perf_counter() - started)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the arrays of the store."""
+        return int(
+            self.dao_ids.nbytes
+            + self.names.nbytes
+            + self.chain_ids.nbytes
+            + sum(column.nbytes for column in self.columns.values())
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, footprint and refresh time of the store."""
+        return {
+            "dao_count": len(self.dao_ids),
+            "field_count": len(self.columns),
+            "memory_bytes": self.nbytes,
+            "refresh_seconds": round(self.refresh_seconds, 6),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+    def _row(self, i: int, fields: Iterable[str]) -> Dict[str, Any]:
+        values = {}
+        for field in fields:
+            column = self.columns.get(field)
+            value = column[i] if column is not None else np.nan
+            values[field] = None if np.isnan(value) else float(value)
+        return {
+            "id": int(self.dao_ids[i]),
+            "name": self.names[i],
+            "chain_id": self.chain_ids[i],
+            "values": values,
+        }
+
+    def rows(self, dao_ids: List[int], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Latest KPI values of the given DAOs, in the requested order."""
+        fields = fields or list(self.columns)
+        return [self._row(self.index[dao_id], fields) for dao_id in dao_ids if dao_id in self.index]
+
+    def ranking(
+        self,
+        field: str,
+        limit: int = 10,
+        descending: bool = True,
+        chain_id: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank DAOs by a KPI field, optionally filtered by chain and value range.
+
+        DAOs without a value for the field are excluded.
+        """
+        column = self.columns.get(field)
+        if column is None:
+            return []
+
+        mask = ~np.isnan(column)
+        if chain_id is not None:
+            mask &= self.chain_ids == chain_id
+        if min_value is not None:
+            mask &= column >= min_value
+        if max_value is not None:
+            mask &= column <= max_value
+
+        candidates = np.flatnonzero(mask)
+        order = np.argsort(column[candidates], kind="stable")
+        if descending:
+            order = order[::-1]
+
+        return [self._row(i, [field]) for i in candidates[order][:limit]]
+
+
+_store: Optional[KPIStore] = None
+_refresh_handle: Optional[asyncio.TimerHandle] = None
+# Refreshes in progress, referenced until they are done
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+def get_loaded_store() -> Optional[KPIStore]:
+    """The process-wide store, or None when it is disabled or not loaded yet."""
+    return _store
+
+
+async def refresh_store() -> KPIStore:
+    """Reload the process-wide store from the database."""
+    global _store
+    async with async_session() as session:
+        store = await KPIStore.load(session)
+    _store = store
+    logger.info(
+        f"KPI store refreshed: {len(store.dao_ids)} DAOs, {len(store.columns)} fields, "
+        f"{store.nbytes} bytes in {store.refresh_seconds * 1000:.1f} ms"
+    )
+    return store
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    _refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"KPI store refresh failed: {task.exception()!r}")
+
+
+async def _on_event(event: Dict[str, Any]) -> None:
+    """Schedule a refresh once a burst of committed runs has settled."""
+    global _refresh_handle
+    if event.get("event") != events.RUN_COMMITTED or _refresh_handle is not None:
+        return
+
+    def _refresh() -> None:
+        global _refresh_handle
+        _refresh_handle = None
+        task = asyncio.create_task(refresh_store())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_done)
+
+    loop = asyncio.get_running_loop()
+    _refresh_handle = loop.call_later(settings.KPI_STORE_REFRESH_DELAY_SECONDS, _refresh)
+
+
+async def start() -> None:
+    """Load the store and keep it up to date with ingestion events."""
+    await refresh_store()
+    events.subscribe(_on_event)
+
+
+async def stop() -> None:
+    """Cancel the pending and running refreshes, before the engine is disposed."""
+    global _refresh_handle
+    if _refresh_handle is not None:
+        _refresh_handle.cancel()
+        _refresh_handle = None
+    for task in list(_refresh_tasks):
+        task.cancel()
+    await asyncio.gather(*_refresh_tasks, return_exceptions=True)
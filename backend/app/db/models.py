@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, List, Optional
+from sqlalchemy import ForeignKeyConstraint, Index, text
 from sqlmodel import Field, SQLModel, Relationship, JSON, Column, TIMESTAMP
 
 
@@ -16,6 +17,9 @@ class DAO(SQLModel, table=True):
         sa_column=Column(TIMESTAMP(timezone=True)),
         default_factory=datetime.utcnow
     )
+    # Maximum age of the DAO's latest successful run before the scheduler
+    # refreshes it; settings.REFRESH_TARGET_SECONDS when null
+    refresh_interval_seconds: Optional[int] = None
     
     # Relationships
     metric_runs: List["MetricRun"] = Relationship(back_populates="dao")
@@ -25,14 +29,28 @@ class DAO(SQLModel, table=True):
 
 
 class MetricRun(SQLModel, table=True):
-    """Metric run entity model."""
+    """
+    Metric run entity model.
+    
+    Partitioned by run month (see app.db.partitions), so the run timestamp
+    is part of the primary key.
+    """
     
     __tablename__ = "metric_run"
+    __table_args__ = (
+        # Latest successful run of a DAO at or before a point in time
+        Index(
+            "ix_metric_run_dao_id_succeeded_run_timestamp",
+            "dao_id", text("run_timestamp DESC"),
+            postgresql_where=text("succeeded"),
+        ),
+        {"postgresql_partition_by": "RANGE (run_timestamp)"},
+    )
     
-    id: Optional[int] = Field(default=None, primary_key=True)
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     dao_id: int = Field(foreign_key="dao.id", index=True)
     run_timestamp: datetime = Field(
-        sa_column=Column(TIMESTAMP(timezone=True)),
+        sa_column=Column(TIMESTAMP(timezone=True), primary_key=True),
         default_factory=datetime.utcnow
     )
     src_file_path: str
@@ -44,13 +62,26 @@ class MetricRun(SQLModel, table=True):
 
 
 class MetricSnapshot(SQLModel, table=True):
-    """Metric snapshot entity model."""
+    """
+    Metric snapshot entity model.
+    
+    Carries the timestamp of its run, partitioned by run month alongside
+    metric_run; filter on it too so that queries only scan the partitions
+    of the requested period.
+    """
     
     __tablename__ = "metric_snapshot"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["run_id", "run_timestamp"], ["metric_run.id", "metric_run.run_timestamp"], ondelete="CASCADE"
+        ),
+        {"postgresql_partition_by": "RANGE (run_timestamp)"},
+    )
     
-    id: Optional[int] = Field(default=None, primary_key=True)
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     dao_id: int = Field(foreign_key="dao.id", index=True)
-    run_id: int = Field(foreign_key="metric_run.id", index=True)
+    run_id: int = Field(index=True)
+    run_timestamp: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), primary_key=True))
     metric_name: str = Field(index=True)
     jsonb_payload: Dict = Field(sa_column=Column(JSON))
     
@@ -92,4 +123,38 @@ class TokenConfig(SQLModel, table=True):
     )
     
     # Relationships
-    dao: DAO = Relationship(back_populates="token_configs")
\ No newline at end of file
+    dao: DAO = Relationship(back_populates="token_configs")
+
+
+class DAODailyMetric(SQLModel, table=True):
+    """Latest value of a numeric KPI field for a DAO on a given day."""
+    
+    __tablename__ = "dao_daily_metric"
+    __table_args__ = (
+        Index("ix_dao_daily_metric_day_chain", "day", "chain_id"),
+    )
+    
+    dao_id: int = Field(foreign_key="dao.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    metric_field: str = Field(primary_key=True)
+    chain_id: str
+    # The run the value came from; not a foreign key, as retention
+    # compaction may delete the run while the daily value is kept
+    run_id: int
+    value: float
+
+
+class ChainMetricRollup(SQLModel, table=True):
+    """Daily aggregate of a numeric KPI field across the DAOs of a chain."""
+    
+    __tablename__ = "chain_metric_rollup"
+    
+    # Primary key order matches the (chain, field, day range) lookups
+    chain_id: str = Field(primary_key=True)
+    metric_field: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    count: int
+    sum: float
+    mean: float
+    min: float
+    max: float
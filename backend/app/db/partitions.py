@@ -0,0 +1,210 @@
+import logging
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by run month, referenced tables first
+PARTITIONED_TABLES = ("metric_run", "metric_snapshot")
+
+# Suffix of the tables kept aside while converting a database created
+# before partitioning
+UNPARTITIONED_SUFFIX = "_unpartitioned"
+
+_PARTITION_NAME = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(timestamp: datetime) -> datetime:
+    """First instant (UTC) of the month of ``timestamp``."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return datetime(timestamp.year, timestamp.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, datetime]]:
+    """
+    Monthly partitions attached to ``table``, oldest first.
+
+    Returns:
+        (partition name, first instant of its month) tuples
+    """
+    names = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).scalars().all()
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.search(name)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions.append((name, datetime(year, month, 1, tzinfo=timezone.utc)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_partitions(
+    conn: Connection, start: Optional[datetime] = None, months_ahead: Optional[int] = None
+) -> List[str]:
+    """
+    Create the missing monthly partitions of every partitioned table.
+
+    Args:
+        conn: Connection in a transaction
+        start: Oldest timestamp to cover (the current month by default)
+        months_ahead: Months to create past the current one
+            (PARTITION_MONTHS_AHEAD by default)
+
+    Returns:
+        Names of the partitions created
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    current = month_start(datetime.now(timezone.utc))
+    month = month_start(start) if start is not None else current
+    last = add_months(current, months_ahead)
+
+    created = []
+    existing = {
+        table: {name for name, _ in list_partitions(conn, table)} for table in PARTITIONED_TABLES
+    }
+    while month <= last:
+        upper = add_months(month, 1)
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, month)
+            if name in existing[table]:
+                continue
+            # Bounds are formatted from datetimes: DDL takes no bind parameters
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            ))
+            created.append(name)
+        month = upper
+
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+def detach_partitions(conn: Connection, before: datetime) -> List[str]:
+    """
+    Detach the partitions of the months ending before ``before``.
+
+    Detached partitions stay in the database as standalone tables, to be
+    archived (e.g. with pg_dump) and dropped by the operator. They lose
+    their foreign keys: snapshot partitions are detached first and must no
+    longer reference metric_run, and archives never block deleting a DAO.
+
+    Returns:
+        Names of the detached partitions
+    """
+    detached = []
+    for table in reversed(PARTITIONED_TABLES):
+        for name, month in list_partitions(conn, table):
+            if add_months(month, 1) > before:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            foreign_keys = conn.execute(
+                text(
+                    "SELECT conname FROM pg_constraint WHERE contype = 'f' "
+                    "AND conrelid = CAST(:name AS regclass)"
+                ),
+                {"name": name},
+            ).scalars().all()
+            for constraint in foreign_keys:
+                conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+            detached.append(name)
+
+    if detached:
+        logger.info(f"Detached partitions: {', '.join(detached)}")
+    return detached
+
+
+def _relkind(conn: Connection, table: str) -> Optional[str]:
+    return conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar_one_or_none()
+
+
+def rename_unpartitioned_tables(conn: Connection) -> bool:
+    """
+    Set aside metric_run and metric_snapshot if they predate partitioning.
+
+    The tables, their indexes and sequences are renamed with
+    UNPARTITIONED_SUFFIX so that the partitioned tables can be created under
+    the original names, then filled by copy_unpartitioned_tables.
+
+    Returns:
+        Whether the tables were set aside
+    """
+    if _relkind(conn, "metric_run") != "r":
+        return False
+
+    logger.info("Converting metric_run and metric_snapshot to partitioned tables...")
+
+    # Foreign keys can only reference a partitioned table through its whole
+    # primary key, which now includes the run timestamp
+    for table, constraint in conn.execute(text(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+        "WHERE contype = 'f' AND confrelid = CAST('metric_run' AS regclass)"
+    )).all():
+        conn.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"'))
+
+    for table in PARTITIONED_TABLES:
+        indexes = conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": table}
+        ).scalars().all()
+        for index in indexes:
+            conn.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index}{UNPARTITIONED_SUFFIX}"'))
+        sequence = conn.execute(
+            text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}
+        ).scalar_one_or_none()
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {sequence.split('.')[-1]}{UNPARTITIONED_SUFFIX}"))
+        conn.execute(text(f"ALTER TABLE {table} RENAME TO {table}{UNPARTITIONED_SUFFIX}"))
+    return True
+
+
+def copy_unpartitioned_tables(conn: Connection) -> None:
+    """Move the rows set aside by rename_unpartitioned_tables into the partitions."""
+    runs, snapshots = (f"{table}{UNPARTITIONED_SUFFIX}" for table in PARTITIONED_TABLES)
+
+    oldest = conn.execute(text(f"SELECT min(run_timestamp) FROM {runs}")).scalar_one_or_none()
+    ensure_partitions(conn, start=oldest)
+
+    # Runs without a timestamp are filed under the migration time
+    run_count = conn.execute(text(
+        f"INSERT INTO metric_run (id, dao_id, run_timestamp, src_file_path, succeeded) "
+        f"SELECT id, dao_id, COALESCE(run_timestamp, now()), src_file_path, succeeded FROM {runs}"
+    )).rowcount
+    snapshot_count = conn.execute(text(
+        f"INSERT INTO metric_snapshot (id, dao_id, run_id, run_timestamp, metric_name, jsonb_payload) "
+        f"SELECT s.id, s.dao_id, s.run_id, r.run_timestamp, s.metric_name, s.jsonb_payload "
+        f"FROM {snapshots} s JOIN metric_run r ON r.id = s.run_id"
+    )).rowcount
+
+    for table in PARTITIONED_TABLES:
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+        ))
+    conn.execute(text(f"DROP TABLE {snapshots}, {runs}"))
+    logger.info(f"Moved {run_count} runs and {snapshot_count} snapshots into monthly partitions")
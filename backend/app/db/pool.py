@@ -0,0 +1,50 @@
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.core.config import settings
+
+
+def engine_options() -> Dict[str, Any]:
+    """
+    Pool and driver keyword arguments for ``create_async_engine``.
+
+    With DB_POOL_SIZE=0 connections are not pooled in the process at all,
+    which suits deployments where PgBouncer does all the pooling.
+
+    asyncpg prepares every statement under a name of its own, even with
+    its statement caches disabled, and under transaction pooling a name
+    may clash with another client's or the statement may be missing on the
+    next server connection. PgBouncer mode therefore requires PgBouncer
+    1.21 or later with max_prepared_statements set, which tracks prepared
+    statements per client and prepares them on each server connection; the
+    statement caches then stay on.
+    """
+    if settings.DB_POOL_SIZE > 0:
+        options: Dict[str, Any] = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+    else:
+        options = {"poolclass": NullPool}
+    options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    return options
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Current connection counts of ``engine``'s pool."""
+    pool = engine.sync_engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "timeout": pool.timeout(),
+        })
+    return stats
@@ -0,0 +1,193 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|:\w+")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so that executions differing only by
+    parameters, literals or IN-list length share one fingerprint.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _VALUE_LIST.sub("(?+)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class QueryRecord(NamedTuple):
+    """A single SQL statement executed during a profile."""
+
+    fingerprint: str
+    duration: float
+    rowcount: Optional[int]
+
+
+class QueryProfile:
+    """
+    SQL statements executed while the profile is active.
+
+    Counts and total time always cover every statement; individual records
+    are kept up to ``max_records`` so that long requests stay cheap.
+    Statements are also recorded into the enclosing profile, if any, so a
+    test profile sees the statements of the requests it issues.
+    """
+
+    def __init__(self, max_records: int = 500, parent: Optional["QueryProfile"] = None) -> None:
+        self.max_records = max_records
+        self.parent = parent
+        self.records: List[QueryRecord] = []
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def add(self, key: str, duration: float, rowcount: Optional[int]) -> None:
+        self.count += 1
+        self.seconds += duration
+        self.fingerprints[key] += 1
+        if len(self.records) < self.max_records:
+            self.records.append(QueryRecord(key, duration, rowcount))
+        if self.parent is not None:
+            self.parent.add(key, duration, rowcount)
+
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Fingerprints executed at least ``threshold`` times (likely N+1 patterns)."""
+        threshold = threshold or settings.QUERY_N_PLUS_ONE_THRESHOLD
+        return {key: count for key, count in self.fingerprints.items() if count >= threshold}
+
+    def summary(self, top: int = 5) -> str:
+        lines = [f"{self.count} queries in {self.seconds * 1000:.1f} ms"]
+        for key, count in self.fingerprints.most_common(top):
+            lines.append(f"  {count}x {key[:200]}")
+        return "\n".join(lines)
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """The profile recording statements for the current request, if any."""
+    return _current_profile.get()
+
+
+@contextmanager
+def profile(max_records: int = 500) -> Iterator[QueryProfile]:
+    """Record every statement executed in the enclosed block."""
+    query_profile = QueryProfile(max_records=max_records, parent=_current_profile.get())
+    token = _current_profile.set(query_profile)
+    try:
+        yield query_profile
+    finally:
+        _current_profile.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the statement's execution context rather than the connection,
+    # so a statement that raises leaves nothing behind
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    query_profile = _current_profile.get()
+    started = getattr(context, "query_started", None)
+    if query_profile is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    rowcount = cursor.rowcount
+    if rowcount is not None and rowcount < 0:
+        rowcount = None
+    query_profile.add(fingerprint(statement), elapsed, rowcount)
+
+
+def install(engine: Union[Engine, AsyncEngine]) -> None:
+    """Record the statements executed on ``engine`` into the active profile."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware profiling the SQL issued by every HTTP request.
+
+    Requests over the configured query-count or time budget, and requests
+    repeating a statement fingerprint (N+1 patterns), are logged. In DEBUG
+    mode the totals are also returned as response headers. Requests are
+    not profiled at all when QUERY_PROFILER_ENABLED is off.
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with profile() as query_profile:
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(query_profile.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{query_profile.seconds * 1000:.1f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                _report(scope, query_profile)
+
+
+def _report(scope, query_profile: QueryProfile) -> None:
+    """Log requests that exceed the query budget or show N+1 patterns."""
+    request = f"{scope.get('method')} {scope.get('path')}"
+    over_count = query_profile.count > settings.QUERY_BUDGET_COUNT
+    over_time = query_profile.seconds * 1000 > settings.QUERY_BUDGET_MS
+    if over_count or over_time:
+        logger.warning(f"Query budget exceeded by {request}: {query_profile.summary()}")
+
+    for key, count in query_profile.repeated().items():
+        logger.warning(f"Possible N+1 in {request}: {count}x {key[:200]}")
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryProfile]:
+    """
+    Fail when the enclosed block executes more than ``max_queries`` statements.
+
+    Intended for tests guarding hot paths, e.g.::
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            with assert_max_queries(3):
+                response = await client.get("/api/v1/daos")
+    """
+    with profile() as query_profile:
+        yield query_profile
+    assert query_profile.count <= max_queries, (
+        f"Expected at most {max_queries} queries, got {query_profile.summary(top=10)}"
+    )
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import JSON, case, func, literal, type_coerce
+from sqlalchemy.sql import ColumnElement
+
+from app.db.models import MetricSnapshot
+
+# Metric name -> keys to return (None for the whole payload)
+Projection = Dict[str, Optional[Set[str]]]
+
+
+def payload_column(projection: Optional[Projection]) -> ColumnElement:
+    """
+    The snapshot payload column, reduced to the projected keys in SQL.
+
+    Payloads of metrics projected to a few keys are rebuilt with
+    json_build_object, so bulky maps like token_distribution never leave
+    the database. Keys missing from a payload come back as null.
+    """
+    payload = MetricSnapshot.jsonb_payload
+    if not projection:
+        return payload
+
+    whens = []
+    for metric_name, keys in sorted(projection.items()):
+        if keys is None:
+            continue
+        pairs: List[Any] = []
+        for key in sorted(keys):
+            pairs.extend([literal(key), payload[key]])
+        whens.append((MetricSnapshot.metric_name == metric_name, func.json_build_object(*pairs)))
+    if not whens:
+        return payload
+    return type_coerce(case(*whens, else_=payload), JSON)
+
+
+def project_payload(payload: Dict[str, Any], keys: Optional[Set[str]]) -> Dict[str, Any]:
+    """Keep the projected keys of an in-memory payload (e.g. a default)."""
+    if keys is None:
+        return payload
+    return {key: payload.get(key) for key in sorted(keys)}
@@ -0,0 +1,107 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+from app.db.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+# Zero when the replica has replayed everything it received, otherwise the
+# age of the last replayed transaction; NULL on a server that is not a standby
+REPLICATION_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def create_read_only_engine(url: str) -> AsyncEngine:
+    """
+    Create an engine for read-only sessions on ``url``.
+
+    Every statement executes in a read-only transaction, so a write on a
+    read session fails instead of reaching the server. Connections run in
+    autocommit mode with default_transaction_read_only set at connection
+    start, so a read issues no BEGIN/COMMIT round trips. PgBouncer rejects
+    that startup parameter, so in PgBouncer mode sessions open explicit
+    BEGIN READ ONLY transactions instead, at the cost of those round trips.
+    """
+    options = engine_options()
+    if settings.DB_PGBOUNCER:
+        options["execution_options"] = {"postgresql_readonly": True}
+    else:
+        options["isolation_level"] = "AUTOCOMMIT"
+        options["connect_args"] = {"server_settings": {"default_transaction_read_only": "on"}}
+    return create_async_engine(url, echo=settings.DEBUG, future=True, **options)
+
+
+class ReplicaRouter:
+    """
+    Round-robin choice of a read engine, skipping lagging replicas.
+
+    Each replica's lag is measured at most once per ``check_interval``
+    seconds. Replicas lagging more than ``max_lag`` seconds, or whose lag
+    could not be measured, are skipped; when none qualifies the fallback
+    (a read-only engine on the primary) is used.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Tuple[str, AsyncEngine]],
+        fallback: Tuple[str, AsyncEngine],
+        max_lag: Optional[float] = None,
+        check_interval: Optional[float] = None,
+    ) -> None:
+        self.replicas = replicas
+        self.fallback = fallback
+        self.max_lag = settings.DB_REPLICA_MAX_LAG_SECONDS if max_lag is None else max_lag
+        self.check_interval = (
+            settings.DB_REPLICA_LAG_CHECK_SECONDS if check_interval is None else check_interval
+        )
+        self._next = 0
+        # name -> (monotonic time of the last check, lag in seconds or None if unreachable)
+        self._lag: Dict[str, Tuple[float, Optional[float]]] = {}
+
+    async def measure_lag(self, engine: AsyncEngine) -> float:
+        """Replication lag of ``engine``'s server in seconds."""
+        async with engine.connect() as conn:
+            lag = (await conn.execute(REPLICATION_LAG_QUERY)).scalar()
+        return float(lag or 0.0)
+
+    async def lag(self, name: str, engine: AsyncEngine) -> Optional[float]:
+        """Cached lag of a replica, or None if it is unreachable."""
+        now = time.monotonic()
+        checked_at, lag = self._lag.get(name, (None, None))
+        if checked_at is not None and now - checked_at < self.check_interval:
+            return lag
+
+        # Claim the check before awaiting so concurrent requests reuse the old value
+        self._lag[name] = (now, lag)
+        try:
+            lag = await self.measure_lag(engine)
+        except Exception as e:
+            logger.warning(f"Replica {name} is unreachable, reading from the primary: {e}")
+            lag = None
+        else:
+            if lag > self.max_lag:
+                logger.warning(f"Replica {name} lags {lag:.1f}s behind the primary, skipping it")
+        self._lag[name] = (now, lag)
+        return lag
+
+    async def choose(self) -> Tuple[str, AsyncEngine]:
+        """The (name, engine) the next read should use."""
+        count = len(self.replicas)
+        for offset in range(count):
+            index = (self._next + offset) % count
+            name, engine = self.replicas[index]
+            lag = await self.lag(name, engine)
+            if lag is not None and lag <= self.max_lag:
+                self._next = (index + 1) % count
+                return name, engine
+        return self.fallback
+
+    def engines(self) -> Dict[str, AsyncEngine]:
+        return dict([self.fallback, *self.replicas])
@@ -0,0 +1,156 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+from sqlmodel import select
+
+from app.core.batch_loader import BatchLoader
+from app.db.models import DAO
+from app.db.projection import Projection
+from app.db.runs import RunKeys, as_utc, load_run_metrics, resolve_runs
+from app.db.session import read_session
+
+# Hashable form of a projection, to memoize projected metrics
+ProjectionKey = Optional[FrozenSet[Tuple[str, Optional[FrozenSet[str]]]]]
+
+# Repository shared by the sub-requests of a /batch call
+current_repository: ContextVar[Optional["MetricsRepository"]] = ContextVar(
+    "current_repository", default=None
+)
+
+
+def projection_key(projection: Optional[Projection]) -> ProjectionKey:
+    if projection is None:
+        return None
+    return frozenset(
+        (name, frozenset(keys) if keys is not None else None) for name, keys in projection.items()
+    )
+
+
+class MetricsRepository:
+    """
+    DAO and latest-run metric lookups of one request.
+
+    Lookups made concurrently are coalesced into one ``IN`` query per kind
+    (DAOs, latest runs, snapshots) and every result is memoized, so each DAO
+    is read at most once per request whatever the endpoints ask for. Metrics
+    are always those of the DAO's latest successful run, at or before
+    ``as_of`` when given.
+
+    All queries of the request, including those run through ``execute``,
+    share one session, one at a time.
+    """
+
+    def __init__(self, session: Optional[AsyncSession] = None, stack: Optional[AsyncExitStack] = None) -> None:
+        """
+        Args:
+            session: Session to query
+            stack: Opens a read-only session on the first query, when no
+                session is given
+        """
+        self.session = session
+        self._stack = stack
+        self._lock = asyncio.Lock()
+        self._daos: BatchLoader[int, DAO] = BatchLoader(self._load_daos)
+        self._runs: Dict[Optional[datetime], BatchLoader[int, Tuple[int, datetime]]] = {}
+        self._metrics: Dict[Tuple[Optional[datetime], ProjectionKey], BatchLoader[int, Dict[str, Any]]] = {}
+
+    @classmethod
+    @asynccontextmanager
+    async def on_read_session(cls) -> AsyncIterator["MetricsRepository"]:
+        """A repository on a read-only session, checked out on its first query."""
+        async with AsyncExitStack() as stack:
+            yield cls(stack=stack)
+
+    async def _session(self) -> AsyncSession:
+        # Called with the lock held
+        if self.session is None:
+            self.session = await self._stack.enter_async_context(read_session())
+        return self.session
+
+    async def execute(self, statement: Executable) -> Result:
+        """Run a query of the request on the repository's session."""
+        async with self._lock:
+            return await (await self._session()).execute(statement)
+
+    async def _load_daos(self, dao_ids: List[int]) -> Dict[int, DAO]:
+        result = await self.execute(select(DAO).where(DAO.id.in_(dao_ids)))
+        return {dao.id: dao for dao in result.scalars().all()}
+
+    def prime_daos(self, daos: List[DAO]) -> None:
+        """Memoize DAOs loaded by another query, e.g. a filtered list."""
+        for dao in daos:
+            self._daos.prime(dao.id, dao)
+
+    async def get_dao(self, dao_id: int) -> Optional[DAO]:
+        return await self._daos.load(dao_id)
+
+    async def get_daos(self, dao_ids: List[int]) -> Dict[int, DAO]:
+        """
+        Returns:
+            The DAOs found, by ID
+        """
+        return await self._daos.load_many(dao_ids)
+
+    async def get_runs(self, dao_ids: List[int], as_of: Optional[datetime] = None) -> RunKeys:
+        """
+        Latest successful run of each DAO at or before ``as_of``.
+
+        Returns:
+            Run keys of the DAOs that had a successful run by then
+        """
+        as_of = as_utc(as_of) if as_of is not None else None
+        loader = self._runs.get(as_of)
+        if loader is None:
+            async def load_runs(ids: List[int]) -> RunKeys:
+                async with self._lock:
+                    return await resolve_runs(await self._session(), ids, as_of)
+
+            loader = self._runs[as_of] = BatchLoader(load_runs)
+        return await loader.load_many(dao_ids)
+
+    async def get_metrics(
+        self, dao_ids: List[int], as_of: Optional[datetime] = None, projection: Optional[Projection] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Metrics of the latest successful run of each DAO at or before ``as_of``.
+
+        Args:
+            dao_ids: DAOs to load
+            as_of: Point in time (the latest run when None)
+            projection: Metrics and keys to return (all when None)
+
+        Returns:
+            Mapping of each DAO ID to its metric payloads by metric name,
+            empty for DAOs without a run
+        """
+        as_of = as_utc(as_of) if as_of is not None else None
+        key = (as_of, projection_key(projection))
+        loader = self._metrics.get(key)
+        if loader is None:
+            async def load_metrics(ids: List[int]) -> Dict[int, Dict[str, Any]]:
+                runs = await self.get_runs(ids, as_of)
+                async with self._lock:
+                    return await load_run_metrics(await self._session(), runs, projection)
+
+            loader = self._metrics[key] = BatchLoader(load_metrics)
+        metrics = await loader.load_many(dao_ids)
+        return {dao_id: metrics.get(dao_id, {}) for dao_id in dao_ids}
+
+
+async def get_metrics_repository() -> AsyncGenerator[MetricsRepository, None]:
+    """
+    Get the metrics repository of the request, on a read-only session, or
+    the one of the /batch call the request is part of.
+    """
+    repository = current_repository.get()
+    if repository is not None:
+        yield repository
+        return
+    async with MetricsRepository.on_read_session() as repository:
+        yield repository
@@ -0,0 +1,117 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.partitions import month_start
+
+logger = logging.getLogger(__name__)
+
+# Runs to delete from [start, end): all but the latest succeeded run of
+# each DAO per bucket, and every failed run. Both tables are filtered on
+# the run timestamp so that only the partitions of the range are scanned.
+_DOOMED_RUNS = """
+    SELECT id, run_timestamp FROM (
+        SELECT id, run_timestamp, succeeded, row_number() OVER (
+            PARTITION BY dao_id, date_trunc(:bucket, run_timestamp AT TIME ZONE 'UTC')
+            ORDER BY succeeded DESC, run_timestamp DESC, id DESC
+        ) AS rank
+        FROM metric_run
+        WHERE run_timestamp >= :start AND run_timestamp < :end
+    ) ranked
+    WHERE rank > 1 OR NOT succeeded
+"""
+
+_DELETE_SNAPSHOTS = text(f"""
+    DELETE FROM metric_snapshot s USING ({_DOOMED_RUNS}) doomed
+    WHERE s.run_id = doomed.id AND s.run_timestamp = doomed.run_timestamp
+    AND s.run_timestamp >= :start AND s.run_timestamp < :end
+""")
+
+_DELETE_RUNS = text(f"""
+    DELETE FROM metric_run r USING ({_DOOMED_RUNS}) doomed
+    WHERE r.id = doomed.id AND r.run_timestamp = doomed.run_timestamp
+""")
+
+# Runs holding snapshots of another DAO than their own, as the bulk importer
+# used to write them (one run for a whole file). Compaction ranks runs by
+# metric_run.dao_id and would delete the other DAOs' snapshots with them
+_SHARED_RUNS = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM metric_snapshot s JOIN metric_run r
+        ON r.id = s.run_id AND r.run_timestamp = s.run_timestamp
+        WHERE s.dao_id <> r.dao_id
+        AND s.run_timestamp >= :start AND s.run_timestamp < :end
+    )
+""")
+
+# Far enough in the past to cover any run
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def retention_tiers(now: Optional[datetime] = None) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Time ranges of the metric history and the resolution each one keeps.
+
+    Runs of the current day are kept as they are. Before that, one run per
+    day is kept for RETENTION_DAILY_DAYS, then one per week until
+    RETENTION_WEEKLY_DAYS, then one per month. The daily tier starts on a
+    Monday and the monthly tier ends on the first of a month, so that
+    their buckets are never cut short.
+
+    Returns:
+        (bucket, start, end) tuples, bucket being a date_trunc unit
+    """
+    now = now or datetime.now(timezone.utc)
+    today = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    daily_start = today - timedelta(days=settings.RETENTION_DAILY_DAYS)
+    daily_start -= timedelta(days=daily_start.weekday())
+    monthly_end = min(month_start(today - timedelta(days=settings.RETENTION_WEEKLY_DAYS)), daily_start)
+
+    return [
+        ("day", daily_start, today),
+        ("week", monthly_end, daily_start),
+        ("month", _EPOCH, monthly_end),
+    ]
+
+
+def compact_metric_history(conn: Connection, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Downsample the metric history to the resolution of its retention tier.
+
+    The run kept for each DAO and bucket is the latest succeeded one, with
+    all its snapshots, so the history reads as end-of-period values. The
+    per-day KPI table and the chain rollups are left untouched. A tier
+    holding runs shared by several DAOs is skipped until the migration
+    step has split them.
+
+    Args:
+        conn: Connection in a transaction
+        now: Reference time of the tiers (the current time by default)
+
+    Returns:
+        Number of runs deleted per bucket
+    """
+    deleted = {}
+    for bucket, start, end in retention_tiers(now):
+        if start >= end:
+            continue
+        params = {"bucket": bucket, "start": start, "end": end}
+        if conn.execute(_SHARED_RUNS, {"start": start, "end": end}).scalar():
+            logger.error(
+                f"Skipped compaction of the {bucket} tier: it holds runs shared by "
+                f"several DAOs, run the migration step to split them"
+            )
+            continue
+        snapshots = conn.execute(_DELETE_SNAPSHOTS, params).rowcount
+        runs = conn.execute(_DELETE_RUNS, params).rowcount
+        deleted[bucket] = runs
+        logger.info(
+            f"Compacted {bucket} tier [{start.date()}, {end.date()}): "
+            f"deleted {runs} runs and {snapshots} snapshots"
+        )
+    return deleted
@@ -0,0 +1,206 @@
+import math
+from datetime import date
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+from app.db.models import DAO, ChainMetricRollup, DAODailyMetric, MetricRun
+
+# Pseudo chain ID under which the cross-chain (global) rollups are stored;
+# reserved, so no DAO may be on a chain of that ID
+GLOBAL_CHAIN_ID = "all"
+
+_ROLLUP_COLUMNS = ["chain_id", "metric_field", "day", "count", "sum", "mean", "min", "max"]
+
+
+def _aggregates(daily) -> List[Any]:
+    return [
+        func.count(daily.c.value),
+        func.sum(daily.c.value),
+        func.avg(daily.c.value),
+        func.min(daily.c.value),
+        func.max(daily.c.value),
+    ]
+
+
+def extract_numeric_fields(metrics: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Flatten the numeric KPI values of a set of metric payloads.
+
+    Args:
+        metrics: Mapping of metric name to its JSON payload
+
+    Returns:
+        Dictionary keyed by "<metric_name>.<key>" with float values
+    """
+    values = {}
+    for metric_name, payload in metrics.items():
+        if not isinstance(payload, dict):
+            continue
+        for key, value in payload.items():
+            # bool is a subclass of int but is not a KPI value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if not math.isfinite(value):
+                continue
+            values[f"{metric_name}.{key}"] = float(value)
+    return values
+
+
+def check_chain_id(chain_id: str) -> str:
+    """
+    Reject the chain ID reserved for the global rollups.
+
+    A chain of that ID would be merged into the global rollup rows and
+    share their advisory lock.
+
+    Raises:
+        ValueError: If ``chain_id`` is GLOBAL_CHAIN_ID
+    """
+    if chain_id.strip().lower() == GLOBAL_CHAIN_ID:
+        raise ValueError(f"Chain ID {chain_id!r} is reserved for the global rollups")
+    return chain_id
+
+
+def _rollup_lock(chain_id: str, day: date) -> Executable:
+    """
+    Serialize the rollup rows of one chain (or all chains) for one day.
+
+    Under READ COMMITTED, two runs re-aggregating the same rows at once
+    each miss the other's uncommitted daily values, and the later commit
+    would drop the other DAO. The lock is held until the transaction ends,
+    so the second aggregate reads the first one's committed values.
+    """
+    return select(func.pg_advisory_xact_lock(func.hashtext(chain_id), day.toordinal()))
+
+
+def _rollup_upsert(chain_id: str, day: date, fields: List[str]) -> Executable:
+    """Recompute the rollup rows of one chain (or all chains) for one day."""
+    daily = DAODailyMetric.__table__
+    rollup = ChainMetricRollup.__table__
+
+    conditions = [daily.c.day == day, daily.c.metric_field.in_(fields)]
+    if chain_id != GLOBAL_CHAIN_ID:
+        conditions.append(daily.c.chain_id == chain_id)
+
+    aggregate = select(
+        literal(chain_id).label("chain_id"),
+        daily.c.metric_field,
+        daily.c.day,
+        *_aggregates(daily),
+    ).where(*conditions).group_by(daily.c.metric_field, daily.c.day)
+
+    stmt = insert(rollup).from_select(_ROLLUP_COLUMNS, aggregate)
+    return stmt.on_conflict_do_update(
+        index_elements=["chain_id", "metric_field", "day"],
+        set_={
+            "count": stmt.excluded["count"],
+            "sum": stmt.excluded["sum"],
+            "mean": stmt.excluded["mean"],
+            "min": stmt.excluded["min"],
+            "max": stmt.excluded["max"],
+        },
+    )
+
+
+def rollup_statements(dao: DAO, run: MetricRun, metrics: Dict[str, Any]) -> List[Executable]:
+    """
+    Build the statements that fold a metric run into the chain rollups.
+
+    The DAO's value for each field is stored once per day (a later run on
+    the same day replaces it), then only the affected chain and global
+    rollup rows for that day are re-aggregated, each under an advisory
+    lock of its chain and day.
+
+    Args:
+        dao: The DAO the run belongs to
+        run: The metric run being written
+        metrics: Mapping of metric name to payload stored for the run
+
+    Returns:
+        List of statements to execute in the run's transaction
+
+    Raises:
+        ValueError: If the DAO is on the reserved GLOBAL_CHAIN_ID
+    """
+    check_chain_id(dao.chain_id)
+    values = extract_numeric_fields(metrics)
+    if not values:
+        return []
+
+    day = run.run_timestamp.date()
+    daily = DAODailyMetric.__table__
+    upsert = insert(daily).values([
+        {
+            "dao_id": dao.id,
+            "day": day,
+            "metric_field": field,
+            "chain_id": dao.chain_id,
+            "run_id": run.id,
+            "value": value,
+        }
+        for field, value in values.items()
+    ])
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["dao_id", "day", "metric_field"],
+        set_={
+            "chain_id": upsert.excluded.chain_id,
+            "run_id": upsert.excluded.run_id,
+            "value": upsert.excluded.value,
+        },
+        # Never let an older run overwrite a newer one
+        where=upsert.excluded.run_id >= daily.c.run_id,
+    )
+
+    fields = sorted(values)
+    return [
+        upsert,
+        # Chain before global, in every transaction, so the locks never deadlock
+        _rollup_lock(dao.chain_id, day),
+        _rollup_upsert(dao.chain_id, day, fields),
+        _rollup_lock(GLOBAL_CHAIN_ID, day),
+        _rollup_upsert(GLOBAL_CHAIN_ID, day, fields),
+    ]
+
+
+def rebuild_rollup_statements(days: Iterable[date]) -> List[Executable]:
+    """
+    Build the statements that recompute every rollup row of ``days`` from
+    the stored daily values, for bulk loads that write those directly.
+    """
+    days = sorted(set(days))
+    daily = DAODailyMetric.__table__
+    rollup = ChainMetricRollup.__table__
+
+    by_chain = select(
+        daily.c.chain_id, daily.c.metric_field, daily.c.day, *_aggregates(daily)
+    ).where(
+        daily.c.day.in_(days), daily.c.chain_id != GLOBAL_CHAIN_ID
+    ).group_by(daily.c.chain_id, daily.c.metric_field, daily.c.day)
+    overall = select(
+        literal(GLOBAL_CHAIN_ID).label("chain_id"), daily.c.metric_field, daily.c.day, *_aggregates(daily)
+    ).where(daily.c.day.in_(days)).group_by(daily.c.metric_field, daily.c.day)
+
+    return [
+        delete(rollup).where(rollup.c.day.in_(days)),
+        insert(rollup).from_select(_ROLLUP_COLUMNS, by_chain),
+        insert(rollup).from_select(_ROLLUP_COLUMNS, overall),
+    ]
+
+
+def update_rollups_sync(db: Session, dao: DAO, run: MetricRun, metrics: Dict[str, Any]) -> None:
+    """Fold a metric run into the chain rollups using a synchronous session."""
+    for stmt in rollup_statements(dao, run, metrics):
+        db.execute(stmt)
+
+
+async def update_rollups(
+    session: AsyncSession, dao: DAO, run: MetricRun, metrics: Dict[str, Any]
+) -> None:
+    """Fold a metric run into the chain rollups using an async session."""
+    for stmt in rollup_statements(dao, run, metrics):
+        await session.execute(stmt)
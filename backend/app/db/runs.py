@@ -0,0 +1,149 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select, text, true, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.db.models import DAO, MetricRun, MetricSnapshot
+from app.db.projection import Projection, payload_column
+
+logger = logging.getLogger(__name__)
+
+# DAO ID -> (run ID, run timestamp)
+RunKeys = Dict[int, Tuple[int, datetime]]
+
+# Gives every DAO whose snapshots sit in another DAO's run a copy of that
+# run, and moves its snapshots and daily values to the copy. Older bulk
+# imports wrote one run per file, under the last DAO's id
+_SPLIT_SHARED_RUNS = text("""
+    WITH shared AS (
+        SELECT run_id, run_timestamp, dao_id,
+            nextval(pg_get_serial_sequence('metric_run', 'id')) AS new_id
+        FROM (
+            SELECT DISTINCT s.run_id, s.run_timestamp, s.dao_id
+            FROM metric_snapshot s JOIN metric_run r
+            ON r.id = s.run_id AND r.run_timestamp = s.run_timestamp
+            WHERE s.dao_id <> r.dao_id
+        ) pairs
+    ), created AS (
+        INSERT INTO metric_run (id, dao_id, run_timestamp, src_file_path, succeeded)
+        SELECT shared.new_id, shared.dao_id, r.run_timestamp, r.src_file_path, r.succeeded
+        FROM shared JOIN metric_run r ON r.id = shared.run_id AND r.run_timestamp = shared.run_timestamp
+        RETURNING id
+    ), moved AS (
+        UPDATE metric_snapshot s SET run_id = shared.new_id FROM shared, created
+        WHERE created.id = shared.new_id
+        AND s.run_id = shared.run_id AND s.run_timestamp = shared.run_timestamp
+        AND s.dao_id = shared.dao_id
+        RETURNING s.id
+    ), daily AS (
+        UPDATE dao_daily_metric d SET run_id = shared.new_id FROM shared
+        WHERE d.dao_id = shared.dao_id AND d.run_id = shared.run_id
+        RETURNING d.dao_id
+    )
+    SELECT (SELECT count(*) FROM created), (SELECT count(*) FROM moved)
+""")
+
+
+def split_shared_runs(conn: Connection) -> Tuple[int, int]:
+    """
+    Give each DAO its own run where older imports shared one between DAOs.
+
+    Runs are looked up by ``metric_run.dao_id`` (latest and point-in-time
+    reads, compaction), which misses or misattributes the snapshots of
+    shared runs. Idempotent: once split, no run is shared.
+
+    Returns:
+        Number of runs created and of snapshots moved to them
+    """
+    created, moved = conn.execute(_SPLIT_SHARED_RUNS).one()
+    if created:
+        logger.info(f"Split shared runs: created {created} runs and moved {moved} snapshots to them")
+    return created, moved
+
+
+def as_utc(timestamp: datetime) -> datetime:
+    """Timestamps without a timezone are taken as UTC."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def latest_runs_query(dao_ids: List[int], as_of: Optional[datetime] = None) -> Select:
+    """
+    (dao_id, run id, run timestamp) of the latest successful run of each
+    DAO at or before ``as_of``.
+
+    Each DAO is resolved by one lookup on the partial index over
+    (dao_id, run_timestamp DESC) WHERE succeeded, in a single LATERAL
+    query, rather than by scanning its runs.
+    """
+    conditions = [MetricRun.dao_id == DAO.id, MetricRun.succeeded == True]
+    if as_of is not None:
+        conditions.append(MetricRun.run_timestamp <= as_utc(as_of))
+    latest = select(MetricRun.id, MetricRun.run_timestamp).where(
+        *conditions
+    ).order_by(MetricRun.run_timestamp.desc()).limit(1).lateral("latest_run")
+
+    return select(DAO.id, latest.c.id, latest.c.run_timestamp).select_from(DAO).join(
+        latest, true()
+    ).where(DAO.id.in_(dao_ids))
+
+
+async def resolve_runs(
+    session: AsyncSession, dao_ids: List[int], as_of: Optional[datetime] = None
+) -> RunKeys:
+    """
+    Find the latest successful run of each DAO at or before ``as_of``.
+
+    Args:
+        session: Database session
+        dao_ids: DAOs to resolve
+        as_of: Point in time (the latest run when None)
+
+    Returns:
+        Run keys of the DAOs that had a successful run by then
+    """
+    if not dao_ids:
+        return {}
+
+    result = await session.execute(latest_runs_query(dao_ids, as_of))
+    return {dao_id: (run_id, run_timestamp) for dao_id, run_id, run_timestamp in result.all()}
+
+
+async def load_run_metrics(
+    session: AsyncSession, runs: RunKeys, projection: Optional[Projection] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Load the snapshots of resolved runs in one query.
+
+    Args:
+        session: Database session
+        runs: Run keys as returned by resolve_runs
+        projection: Metrics and keys to return (all when None)
+
+    Returns:
+        Mapping of DAO ID to its metric payloads by metric name
+    """
+    metrics: Dict[int, Dict[str, Any]] = {dao_id: {} for dao_id in runs}
+    if not runs:
+        return metrics
+
+    keys = [(dao_id, run_id, run_timestamp) for dao_id, (run_id, run_timestamp) in runs.items()]
+    query = select(MetricSnapshot.dao_id, MetricSnapshot.metric_name, payload_column(projection)).where(
+        and_(
+            tuple_(MetricSnapshot.dao_id, MetricSnapshot.run_id, MetricSnapshot.run_timestamp).in_(keys),
+            # Lets the planner skip the partitions of other months
+            MetricSnapshot.run_timestamp.in_({run_timestamp for _, _, run_timestamp in keys}),
+        )
+    )
+    if projection:
+        query = query.where(MetricSnapshot.metric_name.in_(list(projection)))
+
+    result = await session.execute(query)
+    for dao_id, metric_name, payload in result.all():
+        metrics[dao_id][metric_name] = payload
+    return metrics
@@ -1,16 +1,25 @@
-from typing import AsyncGenerator, Generator
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, Generator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.core.instrumentation import observe_pool_checkout
+from app.db import models, partitions, runs  # noqa: F401 (models registers the tables on SQLModel.metadata)
+from app.db.pool import engine_options
+from app.db.replicas import ReplicaRouter, create_read_only_engine
 
 # Create async SQLAlchemy engine
 engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI, 
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    **engine_options()
 )
 
 # Create async session factory
@@ -22,20 +31,103 @@ async_session = sessionmaker(
     autoflush=False
 )
 
+# Read-only engines for GET requests: the configured replicas, with a
+# read-only engine on the primary as fallback
+replica_router = ReplicaRouter(
+    replicas=[
+        (f"replica_{i}", create_read_only_engine(url))
+        for i, url in enumerate(settings.SQLALCHEMY_REPLICA_URIS)
+    ],
+    fallback=("primary_read", create_read_only_engine(settings.SQLALCHEMY_DATABASE_URI)),
+)
+
+
+def all_engines() -> Dict[str, AsyncEngine]:
+    """Every async engine of the API by pool name, for instrumentation."""
+    return {"primary": engine, **replica_router.engines()}
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """Create the indexes of the models that do not exist yet."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def create_missing_columns(conn: Connection) -> None:
+    """Add the nullable model columns that existing tables do not have yet."""
+    inspector = inspect(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable or column.server_default is not None:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'))
+
+
+def upgrade_schema(conn: Connection) -> None:
+    """
+    Bring the schema up to date on a synchronous connection, for init_db
+    and tools that write to a database of their own.
+    """
+    # Set aside metric tables created before partitioning
+    converting = partitions.rename_unpartitioned_tables(conn)
+    
+    # Create all tables if they don't exist, and the nullable columns
+    # and indexes added to existing tables since they were created
+    SQLModel.metadata.create_all(conn)
+    create_missing_columns(conn)
+    create_missing_indexes(conn)
+    partitions.ensure_partitions(conn)
+    
+    if converting:
+        partitions.copy_unpartitioned_tables(conn)
+    
+    # Runs of older bulk imports held the snapshots of several DAOs
+    runs.split_shared_runs(conn)
+
 
 async def init_db() -> None:
     """Initialize the database."""
     async with engine.begin() as conn:
-        # Create all tables if they don't exist
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
     async with async_session() as session:
         try:
+            # Check out the connection up front to measure the pool wait
+            started = time.perf_counter()
+            await session.connection()
+            observe_pool_checkout("primary", time.perf_counter() - started)
+            
             yield session
             await session.commit()
         except Exception:
             await session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+
+@asynccontextmanager
+async def read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session on a replica, or on the primary when no replica is fresh.
+
+    The session runs in autocommit mode: there is nothing to commit or roll
+    back, and writes are rejected by the server.
+    """
+    name, read_engine = await replica_router.choose()
+    async with AsyncSession(read_engine, expire_on_commit=False, autoflush=False) as session:
+        started = time.perf_counter()
+        await session.connection()
+        observe_pool_checkout(name, time.perf_counter() - started)
+
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only database session for endpoints that do not write."""
+    async with read_session() as session:
+        yield session
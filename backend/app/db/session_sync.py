@@ -5,6 +5,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.db.partitions import ensure_partitions
 
 # Create synchronous SQLAlchemy engine for Celery
 sync_engine = create_engine(
@@ -24,6 +25,8 @@ SyncSessionLocal = sessionmaker(
 def init_db_sync() -> None:
     """Initialize the database synchronously."""
     SQLModel.metadata.create_all(bind=sync_engine)
+    with sync_engine.begin() as conn:
+        ensure_partitions(conn)
 
 
 def get_db_sync() -> Generator:
@@ -1,9 +1,12 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import dao, metrics, enhanced_metrics
+from app.api.v1 import addresses, batch, dao, metrics, enhanced_metrics, export, kpis, rollups, stream, tasks
+from app.core import events, instrumentation, response_cache, tracing
 from app.core.config import settings
-from app.db.session import init_db
+from app.db import address_index, dao_index, kpi_store, profiler
+from app.db.pool import pool_stats
+from app.db.session import all_engines
 
 app = FastAPI(
     title="DAO Portal API",
@@ -14,6 +17,10 @@ app = FastAPI(
     redoc_url=f"{settings.API_PREFIX}/redoc",
 )
 
+# Serve DAO documents precompressed from Redis; added before CORS so that
+# cached responses still get the CORS headers of each request
+app.add_middleware(response_cache.ResponseCacheMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -23,15 +30,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database on startup
+# Trace requests, SQL statements and the Celery tasks they queue
+if tracing.setup_tracing("dao-portal-api"):
+    tracing.instrument_app(app)
+    tracing.instrument_engines(*all_engines().values())
+    tracing.instrument_celery()
+
+# Expose Prometheus metrics on /metrics
+instrumentation.setup(app, engines=all_engines())
+
+# Profile the SQL of every request; added last so that it wraps the
+# Prometheus middleware, which reads the request's profile
+for db_engine in all_engines().values():
+    profiler.install(db_engine)
+app.add_middleware(profiler.QueryProfilerMiddleware)
+
+# Initialize in-process state on startup; the schema is created by the
+# one-off migration step (python -m app.scripts.migrate), not by every worker
 @app.on_event("startup")
 async def startup_event():
-    await init_db()
+    if settings.KPI_STORE_ENABLED:
+        await kpi_store.start()
+    if settings.ADDRESS_INDEX_ENABLED:
+        await address_index.start()
+    if settings.DAO_INDEX_ENABLED:
+        await dao_index.start()
+    events.start_listener()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # No more events, then no refresh left to run against a disposed engine
+    await events.stop_listener()
+    await kpi_store.stop()
+    await address_index.stop()
+    await dao_index.stop()
 
 # Include routers - Note that we're using API_PREFIX directly without adding /daos
 app.include_router(dao.router, prefix=settings.API_PREFIX, tags=["DAOs"])
 app.include_router(metrics.router, prefix=settings.API_PREFIX, tags=["Metrics"])
 app.include_router(enhanced_metrics.router, prefix=settings.API_PREFIX, tags=["Enhanced Metrics"])
+app.include_router(rollups.router, prefix=settings.API_PREFIX, tags=["Rollups"])
+app.include_router(kpis.router, prefix=settings.API_PREFIX, tags=["KPIs"])
+app.include_router(tasks.router, prefix=settings.API_PREFIX, tags=["Tasks"])
+app.include_router(stream.router, prefix=settings.API_PREFIX, tags=["Events"])
+app.include_router(export.router, prefix=settings.API_PREFIX, tags=["Export"])
+app.include_router(batch.router, prefix=settings.API_PREFIX, tags=["Batch"])
+app.include_router(addresses.router, prefix=settings.API_PREFIX, tags=["Addresses"])
 
 @app.get("/")
 async def root():
@@ -41,6 +85,10 @@ async def root():
 async def health():
     return {"status": "healthy", "message": "DAO Portal API is running"}
 
+@app.get("/health/db")
+async def health_db():
+    return {name: pool_stats(db_engine) for name, db_engine in all_engines().items()}
+
 @app.get(f"{settings.API_PREFIX}")
 async def api_root():
     return {"message": "Welcome to DAO Portal API V1"}
@@ -0,0 +1,51 @@
+# app/scripts/backfill_rollups.py
+import asyncio
+import logging
+
+from sqlmodel import select
+
+from app.db.session import init_db, async_session
+from app.db.models import DAO, MetricRun, MetricSnapshot
+from app.db.rollups import update_rollups
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("rollup_backfill")
+
+async def backfill_rollups() -> None:
+    """
+    Rebuild the chain rollups from the existing metric run history
+    
+    Runs are replayed in ID order so that the latest run of each day wins,
+    exactly as when they are folded in incrementally.
+    """
+    await init_db()
+    
+    async with async_session() as db:
+        run_query = select(MetricRun, DAO).join(
+            DAO, MetricRun.dao_id == DAO.id
+        ).where(MetricRun.succeeded == True).order_by(MetricRun.id)
+        runs = (await db.execute(run_query)).all()
+        
+        logger.info(f"Replaying {len(runs)} metric runs...")
+        
+        for run, dao in runs:
+            snapshot_query = select(MetricSnapshot).where(
+                MetricSnapshot.run_id == run.id,
+                MetricSnapshot.run_timestamp == run.run_timestamp
+            )
+            snapshots = (await db.execute(snapshot_query)).scalars().all()
+            
+            metrics = {snapshot.metric_name: snapshot.jsonb_payload for snapshot in snapshots}
+            await update_rollups(db, dao, run, metrics)
+            
+            # Commit after each run
+            await db.commit()
+        
+        logger.info(f"Successfully replayed {len(runs)} metric runs")
+
+if __name__ == "__main__":
+    asyncio.run(backfill_rollups())
@@ -0,0 +1,59 @@
+# app/scripts/export_metrics.py
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app.db.export import FORMATS, encode_export, export_connection, iter_export_batches
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("metrics_export")
+
+async def export_metrics(args: argparse.Namespace) -> None:
+    """
+    Stream the metric history matching the filters into a local file
+
+    Same long format as GET /api/v1/export, without going through the API.
+    """
+    started = time.perf_counter()
+    size = 0
+
+    with open(args.output, "wb") as f:
+        async with export_connection() as conn:
+            batches = iter_export_batches(
+                conn,
+                dao_ids=args.dao_ids,
+                chain_id=args.chain_id,
+                metrics=args.metrics,
+                start=args.start,
+                end=args.end,
+                batch_size=args.batch_size,
+            )
+            async for chunk in encode_export(batches, args.format):
+                f.write(chunk)
+                size += len(chunk)
+
+    logger.info(f"Exported {size} bytes to {args.output} in {time.perf_counter() - started:.1f}s")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the DAO metric history")
+    parser.add_argument("output", type=Path, help="File to write")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--dao-ids", type=lambda v: [int(i) for i in v.split(",")],
+                        help="Comma-separated DAO IDs (all by default)")
+    parser.add_argument("--chain-id", help="Only DAOs of this chain")
+    parser.add_argument("--metrics", type=lambda v: v.split(","),
+                        help="Comma-separated metric names (all by default)")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Only runs at or after this time")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Only runs before this time")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Snapshots per batch")
+    asyncio.run(export_metrics(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,10 @@ from typing import Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, Session
 
+from app.core import events, response_cache
 from app.db.session import init_db, async_session
 from app.db.models import DAO, MetricSnapshot, MetricRun
+from app.db.rollups import check_chain_id, update_rollups
 
 # Set up logging
 logging.basicConfig(
@@ -38,12 +40,8 @@ async def import_data(file_path: str) -> None:
         return
     
     async with async_session() as db:
-        # Create a MetricRun to track this import
-        run = MetricRun(
-            src_file_path=file_path,
-            run_timestamp=datetime.utcnow(),
-            succeeded=True
-        )
+        # All runs of this import share its timestamp
+        run_timestamp = datetime.utcnow()
         
         # Process each DAO in the JSON data
         logger.info(f"Processing {len(data)} DAOs...")
@@ -58,22 +56,35 @@ async def import_data(file_path: str) -> None:
             query = select(DAO).where(DAO.name == dao_name)
             result = await db.execute(query)
             dao = result.scalar_one_or_none()
+            created = dao is None
             
             # Create or update the DAO
             if dao:
                 logger.info(f"DAO already exists: {dao_name} (ID: {dao.id})")
             else:
+                chain_id = str(dao_data.get("chain_id", 1))
+                try:
+                    check_chain_id(chain_id)
+                except ValueError as e:
+                    logger.warning(f"Skipping DAO {dao_name}: {e}")
+                    continue
                 logger.info(f"Creating new DAO: {dao_name}")
                 dao = DAO(
                     name=dao_name,
-                    chain_id=str(dao_data.get("chain_id", 1)),
+                    chain_id=chain_id,
                     description=f"{dao_name} is a decentralized autonomous organization."
                 )
                 db.add(dao)
                 await db.flush()  # Generate ID
             
-            # Set the DAO ID in the run
-            run.dao_id = dao.id
+            # Create a MetricRun per DAO to track this import, so that the
+            # DAO's runs can be looked up by dao_id
+            run = MetricRun(
+                dao_id=dao.id,
+                src_file_path=file_path,
+                run_timestamp=run_timestamp,
+                succeeded=True
+            )
             db.add(run)
             await db.flush()  # Generate ID for the run
             
@@ -92,13 +103,21 @@ async def import_data(file_path: str) -> None:
                     snapshot = MetricSnapshot(
                         dao_id=dao.id,
                         run_id=run.id,
+                        run_timestamp=run.run_timestamp,
                         metric_name=metric_name,
                         jsonb_payload=payload
                     )
                     db.add(snapshot)
             
+            # Fold the run into the per-chain daily rollups
+            await update_rollups(db, dao, run, metric_categories)
+            
             # Commit after each DAO
             await db.commit()
+            await response_cache.invalidate(dao.id)
+            if created:
+                await events.publish(events.DAOS_CHANGED, dao_id=dao.id)
+            await events.publish(events.RUN_COMMITTED, dao_id=dao.id, run_id=run.id)
         
         logger.info(f"Successfully processed {len(data)} DAOs")
 
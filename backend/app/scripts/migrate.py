@@ -0,0 +1,26 @@
+# app/scripts/migrate.py
+import asyncio
+import logging
+
+from app.db.session import init_db
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("dao_migrate")
+
+async def migrate() -> None:
+    """
+    Bring the database schema up to date
+    
+    Run once per deployment before starting the API processes, which no
+    longer create the schema themselves.
+    """
+    logger.info("Creating missing tables, columns and indexes...")
+    await init_db()
+    logger.info("Database schema is up to date")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
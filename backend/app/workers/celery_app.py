@@ -1,7 +1,19 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
+from kombu import Exchange, Queue
 
+from app.core import tracing
 from app.core.config import settings
+from app.workers.producer import (
+    BULK_QUEUE,
+    FETCH_METRICS_FOR_ALL_DAOS,
+    FETCH_METRICS_FOR_DAO,
+    FETCH_METRICS_FOR_DAO_BULK,
+    INTERACTIVE_QUEUE,
+    MAINTAIN_METRIC_HISTORY,
+    SCHEDULE_STALE_REFRESHES,
+)
 
 # Create Celery app
 celery_app = Celery(
@@ -23,12 +35,44 @@ celery_app.conf.update(
     task_time_limit=60 * 60,  # 1 hour
     task_soft_time_limit=60 * 30,  # 30 minutes
     worker_prefetch_multiplier=1,
+    # Polls and the scheduled jobs get queues of their own, so that workers
+    # started with -Q interactive are never busy with refreshes. Workers
+    # started without -Q consume both
+    task_queues=tuple(
+        Queue(queue, Exchange(queue, type="direct"), routing_key=queue)
+        for queue in (INTERACTIVE_QUEUE, BULK_QUEUE)
+    ),
+    task_default_queue=INTERACTIVE_QUEUE,
+    task_routes={
+        FETCH_METRICS_FOR_DAO: {"queue": INTERACTIVE_QUEUE},
+        FETCH_METRICS_FOR_DAO_BULK: {"queue": BULK_QUEUE},
+        FETCH_METRICS_FOR_ALL_DAOS: {"queue": BULK_QUEUE},
+        MAINTAIN_METRIC_HISTORY: {"queue": BULK_QUEUE},
+        SCHEDULE_STALE_REFRESHES: {"queue": BULK_QUEUE},
+    },
 )
 
 # Configure periodic tasks (cron jobs)
 celery_app.conf.beat_schedule = {
-    "fetch-all-metrics-daily": {
-        "task": "app.workers.tasks.fetch_metrics_for_all_daos",
-        "schedule": crontab(hour=2, minute=0),  # Run at 2:00 AM every day
+    # Refresh stale DAOs a few at a time around the clock, rather than all
+    # of them at 2:00 AM (fetch_metrics_for_all_daos remains for manual use)
+    "refresh-stale-daos": {
+        "task": SCHEDULE_STALE_REFRESHES,
+        "schedule": settings.REFRESH_SCHEDULER_INTERVAL_SECONDS,
+    },
+    "maintain-metric-history-daily": {
+        "task": MAINTAIN_METRIC_HISTORY,
+        "schedule": crontab(hour=4, minute=0),  # Run at 4:00 AM every day
     },
-}
\ No newline at end of file
+}
+
+
+@worker_process_init.connect(weak=False)
+def init_worker_tracing(*args, **kwargs) -> None:
+    """Set up tracing in each worker process, after the pool has forked."""
+    if tracing.setup_tracing("dao-portal-worker"):
+        # Imported here so that producers of this app don't load the sync DB engine
+        from app.db.session_sync import sync_engine
+        
+        tracing.instrument_celery()
+        tracing.instrument_engines(sync_engine)
@@ -0,0 +1,207 @@
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import redis
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Names under which the worker registers its tasks (see app.workers.tasks)
+FETCH_METRICS_FOR_DAO = "fetch_metrics_for_dao"
+FETCH_METRICS_FOR_ALL_DAOS = "fetch_metrics_for_all_daos"
+MAINTAIN_METRIC_HISTORY = "maintain_metric_history"
+SCHEDULE_STALE_REFRESHES = "schedule_stale_refreshes"
+# Per-DAO fetch of scheduled refreshes, rate limited apart from user polls
+FETCH_METRICS_FOR_DAO_BULK = "fetch_metrics_for_dao_bulk"
+
+# User-triggered tasks, consumed by workers kept free for them
+INTERACTIVE_QUEUE = "interactive"
+# Scheduled fan-outs and maintenance
+BULK_QUEUE = "bulk"
+
+_client: Optional[redis.Redis] = None
+
+
+def send_task(
+    name: str,
+    args: Optional[List[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    **options: Any
+):
+    """
+    Queue a Celery task by name without importing the task modules.
+
+    The API only needs to publish messages, so Celery itself is loaded on
+    the first dispatch rather than when the routers are imported.
+    
+    Args:
+        name: Registered task name
+        args: Positional task arguments
+        kwargs: Keyword task arguments
+        **options: Extra apply_async options (queue, countdown, ...)
+    
+    Returns:
+        The AsyncResult of the queued task
+    """
+    from app.workers.celery_app import celery_app
+    
+    return celery_app.send_task(name, args=args, kwargs=kwargs, **options)
+
+
+
+def _inflight_key(dedupe_key: str) -> str:
+    return f"dao_portal:tasks:{dedupe_key}:inflight"
+
+
+def _recent_key(dedupe_key: str) -> str:
+    return f"dao_portal:tasks:{dedupe_key}:recent"
+
+
+# KEYS: in-flight and recent key, then those of the work that also
+# covers this one; ARGV: new task ID, in-flight TTL.
+# Returns the ID of the task queued, running or just finished, or claims
+# the in-flight key for the new task and returns nil
+_CLAIM_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    local existing = redis.call('GET', key)
+    if existing then
+        return existing
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return false
+"""
+
+# KEYS: in-flight and recent key; ARGV: task ID, debounce seconds.
+# Only the task holding the in-flight key releases it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+if tonumber(ARGV[2]) > 0 then
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+end
+return 0
+"""
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def send_task_once(
+    name: str,
+    dedupe_key: str,
+    args: Optional[List[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    covered_by: Sequence[str] = (),
+    **options: Any
+) -> Tuple[str, bool]:
+    """
+    ``send_task_once_sync`` from async code.
+    
+    Runs in the thread pool, so that neither Redis nor the broker block
+    the event loop.
+    """
+    return await run_in_threadpool(
+        send_task_once_sync, name, dedupe_key, args=args, kwargs=kwargs, covered_by=covered_by, **options
+    )
+
+
+def send_task_once_sync(
+    name: str,
+    dedupe_key: str,
+    args: Optional[List[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    covered_by: Sequence[str] = (),
+    **options: Any
+) -> Tuple[str, bool]:
+    """
+    Queue a task unless an equivalent one is queued, running or just finished.
+    
+    The ID of the queued task is kept in Redis under ``dedupe_key`` until
+    the worker calls ``task_finished``, then for TASK_DEBOUNCE_SECONDS more;
+    meanwhile callers get that task's ID instead of queueing another one.
+    Without Redis the task is always queued.
+    
+    Args:
+        name: Registered task name
+        dedupe_key: Identity of the work, e.g. the task name and DAO ID
+        args: Positional task arguments
+        kwargs: Keyword task arguments
+        covered_by: Dedupe keys of other work that makes this task
+            redundant while queued, running or just finished
+        **options: Extra apply_async options (queue, countdown, ...)
+    
+    Returns:
+        The task ID and whether it belongs to an existing task
+    """
+    task_id = str(uuid.uuid4())
+    keys = [_inflight_key(dedupe_key), _recent_key(dedupe_key)]
+    for key in covered_by:
+        keys += [_inflight_key(key), _recent_key(key)]
+    claimed = False
+    try:
+        existing = _redis().eval(
+            _CLAIM_SCRIPT, len(keys), *keys, task_id, settings.TASK_INFLIGHT_TTL_SECONDS
+        )
+        if existing is not None:
+            return existing.decode(), True
+        claimed = True
+    except redis.RedisError as e:
+        logger.warning(f"Failed to deduplicate {name} task: {str(e)}")
+    
+    try:
+        send_task(name, args=args, kwargs=kwargs, task_id=task_id, **options)
+    except Exception:
+        if claimed:
+            try:
+                _redis().eval(_RELEASE_SCRIPT, 2, *keys[:2], task_id, 0)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to release task deduplication of {dedupe_key}: {str(e)}")
+        raise
+    return task_id, False
+
+
+def task_finished(dedupe_key: str, task_id: str) -> None:
+    """
+    Release the deduplication of ``dedupe_key`` and start its debounce window.
+    
+    Called by the worker when a task finishes, whether or not it was queued
+    through ``send_task_once``. The in-flight key is only deleted when it
+    still holds ``task_id``, in one atomic step.
+    """
+    keys = [_inflight_key(dedupe_key), _recent_key(dedupe_key)]
+    try:
+        _redis().eval(_RELEASE_SCRIPT, len(keys), *keys, task_id, settings.TASK_DEBOUNCE_SECONDS)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to release task deduplication of {dedupe_key}: {str(e)}")
+
+
+def get_task_status(task_id: str) -> Dict[str, Any]:
+    """
+    Get the state of a task from the result backend.
+    
+    Unknown task IDs are reported as PENDING, like queued ones.
+    
+    Args:
+        task_id: The Celery task ID
+    
+    Returns:
+        The task ID, its state and, once finished, its result
+    """
+    from app.workers.celery_app import celery_app
+    
+    result = celery_app.AsyncResult(task_id)
+    status = {"task_id": task_id, "status": result.state, "ready": result.ready()}
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+    return status
@@ -1,16 +1,32 @@
 import json
 import logging
 import os
-from datetime import datetime
+import random
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from sqlmodel import select
 from sqlalchemy.orm import Session
 
-from app.db.session_sync import get_db_sync
+from app.core import events, history_cache, response_cache, tracing
+from app.core.config import settings
+from app.db.freshness import find_due_daos, tick_budget
+from app.db.partitions import add_months, detach_partitions, ensure_partitions, month_start
+from app.db.retention import compact_metric_history
+from app.db.session_sync import get_db_sync, sync_engine
 from app.db.models import DAO, MetricRun, MetricSnapshot
+from app.db.rollups import update_rollups_sync
 from app.workers.celery_app import celery_app
+from app.workers.producer import (
+    FETCH_METRICS_FOR_ALL_DAOS,
+    FETCH_METRICS_FOR_DAO,
+    FETCH_METRICS_FOR_DAO_BULK,
+    MAINTAIN_METRIC_HISTORY,
+    SCHEDULE_STALE_REFRESHES,
+    send_task_once_sync,
+    task_finished,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -20,15 +36,49 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name="fetch_metrics_for_dao")
+@celery_app.task(name=FETCH_METRICS_FOR_DAO)
 def fetch_metrics_for_dao(dao_id: int, data_dir: str = "/data") -> Dict[str, Any]:
     """
-    Fetch metrics for a specific DAO.
+    Fetch metrics for a specific DAO, as requested by a user poll.
     
     Args:
         dao_id: The ID of the DAO
         data_dir: The directory containing JSON metric files
     
+    Returns:
+        Dict with task execution status and details
+    """
+    return fetch_metrics(
+        dao_id, data_dir, fetch_metrics_for_dao.request.id, f"{FETCH_METRICS_FOR_DAO}:{dao_id}"
+    )
+
+
+@celery_app.task(name=FETCH_METRICS_FOR_DAO_BULK, rate_limit=settings.CELERY_BULK_RATE_LIMIT or None)
+def fetch_metrics_for_dao_bulk(dao_id: int, data_dir: str = "/data") -> Dict[str, Any]:
+    """
+    Fetch metrics for a specific DAO, as queued by a scheduled refresh.
+    
+    Same work as fetch_metrics_for_dao, on the bulk queue and rate limited
+    by CELERY_BULK_RATE_LIMIT; a separate task since Celery rate limits
+    apply to every message of a task, polls included.
+    """
+    return fetch_metrics(
+        dao_id, data_dir, fetch_metrics_for_dao_bulk.request.id, f"{FETCH_METRICS_FOR_DAO_BULK}:{dao_id}"
+    )
+
+
+def fetch_metrics(
+    dao_id: int, data_dir: str, task_id: Optional[str], dedupe_key: str
+) -> Dict[str, Any]:
+    """
+    Load the metric file of a DAO into a new run.
+    
+    Args:
+        dao_id: The ID of the DAO
+        data_dir: The directory containing JSON metric files
+        task_id: ID of the Celery task running the fetch, if any
+        dedupe_key: Deduplication key the task was queued under
+    
     Returns:
         Dict with task execution status and details
     """
@@ -38,37 +88,38 @@ def fetch_metrics_for_dao(dao_id: int, data_dir: str = "/data") -> Dict[str, Any
     db = next(get_db_sync())
     
     try:
-        # Get DAO
-        dao = db.query(DAO).filter(DAO.id == dao_id).first()
-        if not dao:
-            logger.error(f"DAO ID {dao_id} not found")
-            return {"error": "DAO not found", "status": "failed"}
-        
-        # Create metric run
-        metric_run = MetricRun(
-            dao_id=dao.id,
-            run_timestamp=datetime.utcnow(),
-            src_file_path="",
-            succeeded=False
-        )
-        db.add(metric_run)
-        db.commit()
-        db.refresh(metric_run)
+        # Get DAO and create metric run
+        with tracing.span("load_dao", dao_id=dao_id):
+            dao = db.query(DAO).filter(DAO.id == dao_id).first()
+            if not dao:
+                logger.error(f"DAO ID {dao_id} not found")
+                return {"error": "DAO not found", "status": "failed"}
+            
+            metric_run = MetricRun(
+                dao_id=dao.id,
+                run_timestamp=datetime.utcnow(),
+                src_file_path="",
+                succeeded=False
+            )
+            db.add(metric_run)
+            db.commit()
+            db.refresh(metric_run)
         
         # Find the appropriate JSON file
-        data_path = Path(data_dir)
-        src_file_path = None
-        
-        # Look for files matching the DAO name
-        for file_path in data_path.glob(f"*{dao.name}*.json"):
-            src_file_path = str(file_path)
-            break
-        
-        # If no file found, try chain_id
-        if not src_file_path:
-            for file_path in data_path.glob(f"*{dao.chain_id}*.json"):
+        with tracing.span("find_metric_file", data_dir=data_dir):
+            data_path = Path(data_dir)
+            src_file_path = None
+            
+            # Look for files matching the DAO name
+            for file_path in data_path.glob(f"*{dao.name}*.json"):
                 src_file_path = str(file_path)
                 break
+            
+            # If no file found, try chain_id
+            if not src_file_path:
+                for file_path in data_path.glob(f"*{dao.chain_id}*.json"):
+                    src_file_path = str(file_path)
+                    break
         
         if not src_file_path:
             logger.error(f"No JSON metric file found for DAO: {dao.name}")
@@ -85,26 +136,36 @@ def fetch_metrics_for_dao(dao_id: int, data_dir: str = "/data") -> Dict[str, Any
         db.commit()
         
         # Process the JSON file
-        with open(src_file_path, "r") as f:
-            data = json.load(f)
-        
-        # Extract metrics from the JSON file
-        processed_metrics = process_metrics_from_json(data)
+        with tracing.span("parse_metric_file", file_path=src_file_path):
+            with open(src_file_path, "r") as f:
+                data = json.load(f)
+            
+            # Extract metrics from the JSON file
+            processed_metrics = process_metrics_from_json(data)
         
         # Save metrics to database
-        for metric_name, payload in processed_metrics.items():
-            metric_snapshot = MetricSnapshot(
-                dao_id=dao.id,
-                run_id=metric_run.id,
-                metric_name=metric_name,
-                jsonb_payload=payload
-            )
-            db.add(metric_snapshot)
+        with tracing.span("insert_snapshots", metrics_count=len(processed_metrics)):
+            for metric_name, payload in processed_metrics.items():
+                metric_snapshot = MetricSnapshot(
+                    dao_id=dao.id,
+                    run_id=metric_run.id,
+                    run_timestamp=metric_run.run_timestamp,
+                    metric_name=metric_name,
+                    jsonb_payload=payload
+                )
+                db.add(metric_snapshot)
+            
+            # Mark the run as succeeded
+            metric_run.succeeded = True
+            db.add(metric_run)
+            
+            # Fold the run into the per-chain daily rollups in the same transaction
+            update_rollups_sync(db, dao, metric_run, processed_metrics)
+            db.commit()
         
-        # Mark the run as succeeded
-        metric_run.succeeded = True
-        db.add(metric_run)
-        db.commit()
+        # Let API processes refresh their derived state
+        response_cache.invalidate_sync(dao.id)
+        events.publish_sync(events.RUN_COMMITTED, dao_id=dao.id, run_id=metric_run.id)
         
         logger.info(f"Successfully processed metrics for DAO: {dao.name}")
         return {
@@ -124,6 +185,9 @@ def fetch_metrics_for_dao(dao_id: int, data_dir: str = "/data") -> Dict[str, Any
         }
     finally:
         db.close()
+        # Let a new fetch of this kind be queued once the debounce window ends
+        if task_id:
+            task_finished(dedupe_key, task_id)
 
 
 def process_metrics_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -163,11 +227,14 @@ def process_metrics_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
     return metrics
 
 
-@celery_app.task(name="fetch_metrics_for_all_daos")
+@celery_app.task(name=FETCH_METRICS_FOR_ALL_DAOS)
 def fetch_metrics_for_all_daos() -> Dict[str, Any]:
     """
     Fetch metrics for all DAOs in the database.
     
+    Fetches are queued with the scheduler's dedupe keys, so DAOs with a
+    scheduled fetch or a poll queued, running or just finished are skipped.
+    
     Returns:
         Dict with task execution status and details
     """
@@ -184,13 +251,23 @@ def fetch_metrics_for_all_daos() -> Dict[str, Any]:
         if dao_count == 0:
             return {"status": "success", "message": "No DAOs found to process"}
         
-        # Queue individual tasks for each DAO
+        # Queue individual tasks for each DAO, on the rate-limited bulk queue
+        queued = skipped = 0
         for dao in daos:
-            fetch_metrics_for_dao.delay(dao.id)
+            _, deduplicated = send_task_once_sync(
+                FETCH_METRICS_FOR_DAO_BULK,
+                f"{FETCH_METRICS_FOR_DAO_BULK}:{dao.id}",
+                args=[dao.id],
+                covered_by=[f"{FETCH_METRICS_FOR_DAO}:{dao.id}"],
+            )
+            queued += not deduplicated
+            skipped += deduplicated
         
         return {
             "status": "success",
-            "message": f"Queued metric fetching for {dao_count} DAOs"
+            "message": f"Queued metric fetching for {queued} of {dao_count} DAOs",
+            "queued": queued,
+            "skipped": skipped,
         }
     
     except Exception as e:
@@ -200,4 +277,106 @@ def fetch_metrics_for_all_daos() -> Dict[str, Any]:
             "status": "failed"
         }
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@celery_app.task(name=SCHEDULE_STALE_REFRESHES)
+def schedule_stale_refreshes() -> Dict[str, Any]:
+    """
+    Queue refreshes of the DAOs whose data is older than their target.
+    
+    Runs every REFRESH_SCHEDULER_INTERVAL_SECONDS and queues at most the
+    tick's share of REFRESH_BUDGET_PER_HOUR, most stale first; each fetch
+    starts at a random point of the tick, so ingestion load stays smooth.
+    DAOs with a scheduled fetch or a poll queued, running or just finished
+    are skipped and do not count against the budget. Scheduled fetches
+    have dedupe keys of their own, so polls never wait for them.
+    
+    Returns:
+        Dict with the number of DAOs queued and skipped
+    """
+    interval = settings.REFRESH_SCHEDULER_INTERVAL_SECONDS
+    budget = tick_budget(interval)
+    
+    try:
+        with sync_engine.connect() as conn:
+            due = find_due_daos(conn, datetime.now(timezone.utc))
+        
+        queued = skipped = 0
+        for dao_id in due:
+            if queued == budget:
+                break
+            _, deduplicated = send_task_once_sync(
+                FETCH_METRICS_FOR_DAO_BULK,
+                f"{FETCH_METRICS_FOR_DAO_BULK}:{dao_id}",
+                args=[dao_id],
+                covered_by=[f"{FETCH_METRICS_FOR_DAO}:{dao_id}"],
+                countdown=random.uniform(0, interval),
+            )
+            queued += not deduplicated
+            skipped += deduplicated
+        
+        logger.info(f"Queued refreshes of {queued} stale DAOs (budget {budget})")
+        return {
+            "status": "success",
+            "queued": queued,
+            "skipped": skipped,
+            "budget": budget,
+        }
+    
+    except Exception as e:
+        logger.error(f"Error scheduling stale refreshes: {str(e)}")
+        return {
+            "error": str(e),
+            "status": "failed"
+        }
+
+
+@celery_app.task(name=MAINTAIN_METRIC_HISTORY)
+def maintain_metric_history() -> Dict[str, Any]:
+    """
+    Create upcoming partitions, compact and detach old metric history.
+    
+    Each step runs in its own transaction, so that new partitions exist
+    even if compaction fails.
+    
+    Returns:
+        Dict with the partitions created and detached and the runs deleted
+    """
+    logger.info("Maintaining metric history partitions")
+    
+    try:
+        with sync_engine.begin() as conn:
+            created = ensure_partitions(conn)
+        
+        deleted = {}
+        if settings.RETENTION_ENABLED:
+            with sync_engine.begin() as conn:
+                deleted = compact_metric_history(conn)
+        
+        detached = []
+        if settings.RETENTION_DETACH_MONTHS > 0:
+            now = datetime.now(timezone.utc)
+            cutoff = add_months(month_start(now), -settings.RETENTION_DETACH_MONTHS)
+            with sync_engine.begin() as conn:
+                detached = detach_partitions(conn, before=cutoff)
+        
+        # Compaction keeps the latest run of each day, which is also the
+        # latest of its week and month, so only the coarser tiers and
+        # detached months change buckets closed in the history cache
+        if deleted.get("week") or deleted.get("month") or detached:
+            history_cache.invalidate_sync()
+        
+        return {
+            "status": "success",
+            "created_partitions": created,
+            "deleted_runs": deleted,
+            "detached_partitions": detached,
+        }
+    
+    except Exception as e:
+        logger.error(f"Error maintaining metric history: {str(e)}")
+        return {
+            "error": str(e),
+            "status": "failed"
+        }
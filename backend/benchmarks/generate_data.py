@@ -0,0 +1,225 @@
+"""
+Synthetic data generator for the benchmark suite.
+
+Creates N DAOs x M daily runs x 5 metric categories in the configured
+Postgres database. Payloads are derived from the real records of
+dao_data.json with seeded random drift, so the same arguments always
+produce the same data.
+
+Usage:
+    python -m benchmarks.generate_data --daos 500 --runs 90 --seed 42
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from sqlalchemy import create_engine, delete, select
+
+from app.core import events, history_cache
+from app.core.config import settings
+from app.db.models import DAO, DAODailyMetric, MetricRun, MetricSnapshot
+from app.db.partitions import ensure_partitions
+from app.db.rollups import extract_numeric_fields, rebuild_rollup_statements
+from app.db.session import upgrade_schema
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("benchmark_generator")
+
+METRIC_CATEGORIES = [
+    "network_participation",
+    "accumulated_funds",
+    "voting_efficiency",
+    "decentralisation",
+    "health_metrics",
+]
+
+DEFAULT_TEMPLATE = Path(__file__).resolve().parents[2] / "dao_data.json"
+
+
+def drift(value: Any, rng: random.Random, spread: float) -> Any:
+    """Randomly perturb every number in a payload, keeping its type and shape."""
+    if isinstance(value, bool) or isinstance(value, str) or value is None:
+        return value
+    if isinstance(value, int):
+        return max(0, round(value * rng.uniform(1 - spread, 1 + spread)))
+    if isinstance(value, float):
+        return value * rng.uniform(1 - spread, 1 + spread)
+    if isinstance(value, dict):
+        return {key: drift(item, rng, spread) for key, item in value.items()}
+    if isinstance(value, list):
+        return [drift(item, rng, spread) for item in value]
+    return value
+
+
+def load_templates(path: Path) -> List[Dict[str, Any]]:
+    with open(path, "r") as f:
+        records = json.load(f)
+    return [record for record in records if all(c in record for c in METRIC_CATEGORIES)]
+
+
+def reset(conn, prefix: str) -> Set[date]:
+    """
+    Remove every DAO previously generated with ``prefix``, and its history.
+
+    Returns:
+        Days of the daily values removed, whose rollups are now stale
+    """
+    dao_ids = select(DAO.id).where(DAO.name.like(f"{prefix}-%"))
+    days = set(conn.execute(
+        delete(DAODailyMetric.__table__).where(DAODailyMetric.dao_id.in_(dao_ids))
+        .returning(DAODailyMetric.__table__.c.day)
+    ).scalars())
+    conn.execute(delete(MetricSnapshot.__table__).where(MetricSnapshot.dao_id.in_(dao_ids)))
+    conn.execute(delete(MetricRun.__table__).where(MetricRun.dao_id.in_(dao_ids)))
+    conn.execute(delete(DAO.__table__).where(DAO.id.in_(dao_ids)))
+    return days
+
+
+def generate(
+    database_url: str,
+    dao_count: int,
+    run_count: int,
+    seed: int,
+    template_path: Path,
+    prefix: str = "bench",
+    spread: float = 0.05,
+) -> None:
+    """
+    Generate ``dao_count`` DAOs with ``run_count`` daily runs each.
+
+    Args:
+        database_url: Synchronous SQLAlchemy URL of the target database
+        dao_count: Number of DAOs to create
+        run_count: Number of daily runs per DAO, ending today
+        seed: Random seed, the same seed yields the same data
+        template_path: JSON file with real DAO records to derive payloads from
+        prefix: Name prefix of generated DAOs; previous ones are replaced
+        spread: Maximum relative day-to-day drift of numeric values
+    """
+    rng = random.Random(seed)
+    templates = load_templates(template_path)
+    engine = create_engine(database_url)
+    # The migration step's schema, with the partitions and indexes the
+    # benchmarked endpoints depend on
+    with engine.begin() as conn:
+        upgrade_schema(conn)
+
+    # Anchor timestamps to midnight so repeated runs produce identical rows
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        stale_days = reset(conn, prefix)
+        ensure_partitions(conn, start=today - timedelta(days=run_count))
+
+    for i in range(dao_count):
+        template = templates[i % len(templates)]
+        chain_id = str(template["chain_id"])
+        with engine.begin() as conn:
+            dao_id = conn.execute(
+                DAO.__table__.insert().returning(DAO.__table__.c.id),
+                {
+                    "name": f"{prefix}-{i:06d}-{template['dao_name']}",
+                    "chain_id": chain_id,
+                    "description": f"Synthetic DAO derived from {template['dao_name']}",
+                    "created_at": today - timedelta(days=run_count),
+                },
+            ).scalar_one()
+
+            timestamps = [today - timedelta(days=run_count - 1 - j) for j in range(run_count)]
+            runs = conn.execute(
+                MetricRun.__table__.insert().values([
+                    {
+                        "dao_id": dao_id,
+                        "run_timestamp": timestamp,
+                        "src_file_path": str(template_path),
+                        "succeeded": True,
+                    }
+                    for timestamp in timestamps
+                ]).returning(MetricRun.__table__.c.id, MetricRun.__table__.c.run_timestamp)
+            ).all()
+
+            snapshots = []
+            daily_values = []
+            payloads = {category: template[category] for category in METRIC_CATEGORIES}
+            for run_id, run_timestamp in runs:
+                # Each day drifts from the previous one, like real history
+                payloads = {
+                    category: drift(payload, rng, spread) for category, payload in payloads.items()
+                }
+                for category, payload in payloads.items():
+                    snapshots.append({
+                        "dao_id": dao_id,
+                        "run_id": run_id,
+                        "run_timestamp": run_timestamp,
+                        "metric_name": category,
+                        "jsonb_payload": payload,
+                    })
+                # One run per day, so each run is its day's value
+                for field, value in extract_numeric_fields(payloads).items():
+                    daily_values.append({
+                        "dao_id": dao_id,
+                        "day": run_timestamp.date(),
+                        "metric_field": field,
+                        "chain_id": chain_id,
+                        "run_id": run_id,
+                        "value": value,
+                    })
+            conn.execute(MetricSnapshot.__table__.insert(), snapshots)
+            if daily_values:
+                conn.execute(DAODailyMetric.__table__.insert(), daily_values)
+
+        if (i + 1) % 100 == 0:
+            logger.info(f"Generated {i + 1}/{dao_count} DAOs")
+
+    # Aggregated once at the end: folding in each run would re-aggregate
+    # its whole day every time
+    stale_days.update((today - timedelta(days=j)).date() for j in range(run_count))
+    with engine.begin() as conn:
+        for stmt in rebuild_rollup_statements(stale_days):
+            conn.execute(stmt)
+
+    # The generated runs are in the past, in buckets the history cache
+    # may hold for replaced DAOs
+    history_cache.invalidate_sync()
+    events.publish_sync(events.DAOS_CHANGED)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Generated {dao_count} DAOs x {run_count} runs x {len(METRIC_CATEGORIES)} metrics "
+        f"in {elapsed:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic DAO metric history")
+    parser.add_argument("--daos", type=int, default=100, help="Number of DAOs")
+    parser.add_argument("--runs", type=int, default=30, help="Daily runs per DAO")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--prefix", default="bench", help="Name prefix of generated DAOs")
+    parser.add_argument("--template", type=Path, default=DEFAULT_TEMPLATE,
+                        help="JSON file with real DAO records")
+    parser.add_argument("--database-url", default=settings.SQLALCHEMY_DATABASE_URI_SYNC,
+                        help="Synchronous database URL (defaults to the app settings)")
+    args = parser.parse_args()
+
+    generate(
+        database_url=args.database_url,
+        dao_count=args.daos,
+        run_count=args.runs,
+        seed=args.seed,
+        template_path=args.template,
+        prefix=args.prefix,
+    )
+
+
+if __name__ == "__main__":
+    main()
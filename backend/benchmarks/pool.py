@@ -0,0 +1,128 @@
+"""
+Connection pool benchmark.
+
+Runs the same concurrent read workload directly against Postgres with
+different pool sizes and reports throughput, latency percentiles and the
+time spent waiting for a connection, to size DB_POOL_SIZE and
+DB_MAX_OVERFLOW for a given worker concurrency.
+
+Usage:
+    python -m benchmarks.pool --pool-sizes 1 2 5 10 20 --concurrency 50 --duration 10
+    python -m benchmarks.pool --pgbouncer --database-url postgresql+asyncpg://...@pgbouncer:6432/dao_portal
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from benchmarks.run import percentile
+
+# Latest snapshots of one DAO, as read by the detail endpoints
+QUERY = text(
+    "SELECT metric_name, jsonb_payload FROM metric_snapshot "
+    "WHERE dao_id = (SELECT dao_id FROM metric_snapshot ORDER BY id DESC LIMIT 1) "
+    "ORDER BY id DESC LIMIT 5"
+)
+
+
+async def run_pool_size(
+    database_url: str,
+    pool_size: int,
+    max_overflow: int,
+    concurrency: int,
+    duration: float,
+    pgbouncer: bool,
+) -> Dict[str, Any]:
+    """Run ``concurrency`` query loops for ``duration`` seconds on a fresh pool."""
+    # Reads behind PgBouncer run in BEGIN READ ONLY transactions
+    execution_options = {"postgresql_readonly": True} if pgbouncer else {}
+    engine = create_async_engine(
+        database_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=60,
+        execution_options=execution_options,
+    )
+    latencies: List[float] = []
+    waits: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with engine.connect() as conn:
+                waits.append(time.perf_counter() - started)
+                await conn.execute(QUERY)
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        # Open the pool's connections before measuring
+        async with engine.connect() as conn:
+            await conn.execute(QUERY)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    waits_ms = sorted(wait * 1000 for wait in waits)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "queries": len(latencies),
+        "throughput_qps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies_ms, 0.50), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "checkout_p95_ms": round(percentile(waits_ms, 0.95), 3),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    results = []
+    for pool_size in args.pool_sizes:
+        result = await run_pool_size(
+            args.database_url, pool_size, args.max_overflow, args.concurrency,
+            args.duration, args.pgbouncer,
+        )
+        print(json.dumps(result))
+        results.append(result)
+    return {
+        "meta": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "pgbouncer": args.pgbouncer,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark throughput at different pool sizes")
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--max-overflow", type=int, default=0,
+                        help="Overflow per pool; 0 makes the pool size a hard limit")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent query loops")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per pool size")
+    parser.add_argument("--pgbouncer", action="store_true",
+                        help="Run the reads in read-only transactions, as DB_PGBOUNCER does")
+    parser.add_argument("--database-url", default=settings.SQLALCHEMY_DATABASE_URI,
+                        help="Async database URL (defaults to the app settings)")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
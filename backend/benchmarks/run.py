@@ -0,0 +1,213 @@
+"""
+Load-test scenarios for the DAO Portal API.
+
+Each scenario issues a fixed number of requests with a fixed concurrency
+against a running API and reports latency percentiles and throughput as
+JSON, so results can be stored per commit and compared.
+
+Usage:
+    python -m benchmarks.run --base-url http://localhost:8000/api/v1 \\
+        --requests 500 --concurrency 20 --output results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.run --baseline results/old.json --output results/new.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+METRIC_CATEGORIES = [
+    "network_participation",
+    "accumulated_funds",
+    "voting_efficiency",
+    "decentralisation",
+    "health_metrics",
+]
+
+# Each scenario maps (rng, dao_ids) to the path of one request
+SCENARIOS: Dict[str, Callable[[random.Random, List[int]], str]] = {
+    "daos_list": lambda rng, ids: f"/daos?limit=100&offset={rng.randrange(0, max(len(ids) - 100, 1))}",
+    "dao_detail": lambda rng, ids: f"/daos/{rng.choice(ids)}",
+    "enhanced_metrics": lambda rng, ids: f"/daos/{rng.choice(ids)}/enhanced_metrics",
+    "multi": lambda rng, ids: "/daos/metrics/multi?dao_ids=" + ",".join(
+        str(dao_id) for dao_id in rng.sample(ids, min(5, len(ids)))
+    ),
+    "history": lambda rng, ids: (
+        f"/daos/{rng.choice(ids)}/metrics/history"
+        f"?metric={rng.choice(METRIC_CATEGORIES)}&period=90d"
+    ),
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linearly interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms) and throughput (requests/s) of a scenario."""
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_ms": round(percentile(values, 0.50), 3),
+        "p95_ms": round(percentile(values, 0.95), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "max_ms": round(values[-1], 3) if values else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+async def fetch_dao_ids(client: httpx.AsyncClient, prefix: Optional[str]) -> List[int]:
+    """Page through /daos to collect the IDs the scenarios will target."""
+    dao_ids: List[int] = []
+    offset = 0
+    while True:
+        response = await client.get("/daos", params={"limit": 100, "offset": offset})
+        response.raise_for_status()
+        items = response.json()["items"]
+        dao_ids.extend(
+            item["id"] for item in items if prefix is None or item["name"].startswith(f"{prefix}-")
+        )
+        offset += len(items)
+        if not items or offset >= response.json()["total_count"]:
+            return dao_ids
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_path: Callable[[random.Random, List[int]], str],
+    dao_ids: List[int],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Issue ``requests`` requests with ``concurrency`` workers and summarize them."""
+    rng = random.Random(seed)
+    paths = [make_path(rng, dao_ids) for _ in range(warmup + requests)]
+    for path in paths[:warmup]:
+        await client.get(path)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for path in paths[warmup:]:
+        queue.put_nowait(path)
+
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            path = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Any]) -> str:
+    """Human readable relative change of every scenario against a baseline run."""
+    lines = [f"{'scenario':<18}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>10}"]
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            before = previous[key]
+            changes.append(f"{(current[key] - before) / before * 100:+.1f}%" if before else "n/a")
+        lines.append(f"{name:<18}" + "".join(f"{change:>10}" for change in changes))
+    return "\n".join(lines)
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        dao_ids = await fetch_dao_ids(client, args.prefix)
+        if not dao_ids:
+            raise SystemExit("No DAOs found; run benchmarks.generate_data first")
+
+        scenarios = {}
+        for name in args.scenarios:
+            scenarios[name] = await run_scenario(
+                client, SCENARIOS[name], dao_ids, args.requests, args.concurrency, args.warmup, args.seed
+            )
+            print(f"{name}: {json.dumps(scenarios[name])}")
+
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "base_url": args.base_url,
+            "dao_count": len(dao_ids),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API benchmark scenarios")
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", default="bench",
+                        help="Only target DAOs created by the generator with this prefix")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            print(compare(json.load(f), results))
+
+
+if __name__ == "__main__":
+    main()
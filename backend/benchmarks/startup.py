@@ -0,0 +1,90 @@
+"""
+Import-time and startup benchmark for the API.
+
+Boots the app in fresh interpreters (as a new gunicorn worker would),
+measuring the time to import app.main and to run its startup handlers,
+and fails when the median exceeds the budget.
+
+Usage:
+    python -m benchmarks.startup --repeat 5 --budget-ms 800
+    python -m benchmarks.startup --importtime  # slowest imports of app.main
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Executed in a fresh interpreter for every sample
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def boot():
+    await app.main.app.router.startup()
+    ready = time.perf_counter()
+    await app.main.app.router.shutdown()
+    return ready
+
+ready = asyncio.run(boot())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - started) * 1000,
+    "modules": len(sys.modules),
+    "celery_loaded": "celery" in sys.modules,
+}))
+"""
+
+
+def sample() -> Dict[str, Any]:
+    output = subprocess.check_output([sys.executable, "-c", CHILD], text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> List[str]:
+    """Cumulative import times of app.main as reported by -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        rows.append((int(cumulative), module.strip()))
+    return [f"{us / 1000:8.1f} ms  {module}" for us, module in sorted(rows, reverse=True)[:top]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API import and startup time")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=800.0,
+                        help="Maximum median import + startup time")
+    parser.add_argument("--importtime", action="store_true",
+                        help="Print the slowest imports instead of timing startup")
+    args = parser.parse_args()
+
+    if args.importtime:
+        print("\n".join(slowest_imports(25)))
+        return
+
+    samples = [sample() for _ in range(args.repeat)]
+    report = {
+        "import_ms_median": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "startup_ms_median": round(statistics.median(s["startup_ms"] for s in samples), 1),
+        "modules": samples[-1]["modules"],
+        "celery_loaded": samples[-1]["celery_loaded"],
+        "budget_ms": args.budget_ms,
+    }
+    print(json.dumps(report, indent=2))
+
+    if report["startup_ms_median"] > args.budget_ms:
+        sys.exit(f"Startup budget exceeded: {report['startup_ms_median']} ms > {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,15 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-from sqlmodel import select, SQLModel
+from sqlmodel import select
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 # Import models (adjust path if needed)
 from app.db.models import DAO, MetricRun, MetricSnapshot
+from app.db.rollups import check_chain_id, update_rollups
+from app.db.session import init_db
+from app.core import events, response_cache
 from app.core.config import settings
 
 # Create async engine
@@ -24,9 +27,8 @@ async def import_data(file_path: str):
     """Import DAO data from a JSON file."""
     print(f"Importing data from {file_path}...")
     
-    # Create tables if they don't exist
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    # Bring the schema up to date, partitions included
+    await init_db()
     
     # Read JSON file
     with open(file_path, 'r') as f:
@@ -48,6 +50,11 @@ async def import_data(file_path: str):
             # If DAO doesn't exist, create it
             if not dao:
                 chain_id = str(dao_data.get('chain_id', ''))
+                try:
+                    check_chain_id(chain_id)
+                except ValueError as e:
+                    print(f"Skipping DAO {dao_name}: {e}")
+                    continue
                 description = f"DAO on chain ID {chain_id}"
                 
                 dao = DAO(
@@ -59,6 +66,7 @@ async def import_data(file_path: str):
                 session.add(dao)
                 await session.commit()
                 await session.refresh(dao)
+                await events.publish(events.DAOS_CHANGED, dao_id=dao.id)
                 print(f"Created new DAO: {dao_name} (ID: {dao.id})")
             else:
                 print(f"Found existing DAO: {dao_name} (ID: {dao.id})")
@@ -87,12 +95,19 @@ async def import_data(file_path: str):
                 metric = MetricSnapshot(
                     dao_id=dao.id,
                     run_id=metric_run.id,
+                    # Part of the key of the partitioned snapshot table
+                    run_timestamp=metric_run.run_timestamp,
                     metric_name=metric_name,
                     jsonb_payload=payload
                 )
                 session.add(metric)
             
+            # Fold the run into the per-chain daily rollups
+            await update_rollups(session, dao, metric_run, metrics_to_store)
+            
             await session.commit()
+            await response_cache.invalidate(dao.id)
+            await events.publish(events.RUN_COMMITTED, dao_id=dao.id, run_id=metric_run.id)
             print(f"Added metrics for {dao_name}")
         
         print(f"Successfully imported {len(data)} DAOs")
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1 import addresses
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.db import address_index
+from app.db.address_index import AddressIndex
+
+ROWS = [
+    ("0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984", 1, "token", "governance", "UNI"),
+    ("0x408ED6354d4973f66138C91495F2f2FCbd8724C3", 1, "contract", "governor", "Governor Bravo"),
+    ("0x7Fc66500c84A76Ad7e9c93437bFc5Ac33E2DDaE9", 2, "token", "governance", "AAVE"),
+    ("0x7fc66500c84a76ad7e9c93437bfc5ac33e2ddae9", 3, "contract", "bridge", "AAVE bridge"),
+]
+
+
+def test_lookup_normalizes_case_and_reports_unknown_addresses():
+    index = AddressIndex.from_rows(ROWS)
+
+    matches, unknown = index.lookup([
+        " 0x1F9840A85D5AF5BF1D1762F925BDADDC4201F984",
+        "0x7fc66500c84a76ad7e9c93437bfc5ac33e2ddae9",
+        "0xdead",
+        "0xDEAD",
+    ])
+
+    assert matches == {
+        "0x1f9840a85d5af5bf1d1762f925bdaddc4201f984": [
+            {"dao_id": 1, "kind": "token", "type": "governance", "name": "UNI"},
+        ],
+        "0x7fc66500c84a76ad7e9c93437bfc5ac33e2ddae9": [
+            {"dao_id": 2, "kind": "token", "type": "governance", "name": "AAVE"},
+            {"dao_id": 3, "kind": "contract", "type": "bridge", "name": "AAVE bridge"},
+        ],
+    }
+    assert unknown == ["0xdead"]
+    assert index.stats()["address_count"] == 3
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    known = [f"0x{i:040x}" for i in range(2000)]
+    bloom = BloomFilter.from_values(known, error_rate=0.01)
+
+    assert all(address in bloom for address in known)
+    false_positives = sum(f"0x{i:040x}" in bloom for i in range(2000, 12000))
+    assert false_positives < 300
+    assert bloom.to_dict()["bits"] == bloom.bits
+
+
+@pytest.mark.asyncio
+async def test_index_is_reloaded_periodically(monkeypatch):
+    reloads = []
+
+    async def refresh_index():
+        reloads.append(1)
+
+    monkeypatch.setattr(address_index, "refresh_index", refresh_index)
+    monkeypatch.setattr(address_index.events, "subscribe", lambda handler: None)
+    monkeypatch.setattr(settings, "ADDRESS_INDEX_RELOAD_SECONDS", 0.01)
+
+    await address_index.start()
+    await asyncio.sleep(0.05)
+    await address_index.stop()
+    loaded = len(reloads)
+    await asyncio.sleep(0.03)
+
+    # Loaded at startup, then reloaded until stopped
+    assert loaded >= 3
+    assert len(reloads) == loaded
+
+
+def test_endpoints_are_unavailable_without_the_index(monkeypatch):
+    monkeypatch.setattr(addresses, "get_loaded_index", lambda: None)
+
+    with pytest.raises(HTTPException) as error:
+        addresses.get_address_index()
+    assert error.value.status_code == 503
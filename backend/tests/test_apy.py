@@ -31,9 +31,7 @@ async def test_root_endpoint():
         response = await client.get("/")
         assert response.status_code == 200
         data = response.json()
-        assert "name" in data
-        assert "version" in data
-        assert "environment" in data
+        assert data["message"] == "Welcome to DAO Portal API"
 
 
 @pytest.mark.asyncio
@@ -43,9 +41,7 @@ async def test_health_check():
         response = await client.get("/health")
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "ok"
-        assert "version" in data
-        assert "environment" in data
+        assert data["status"] == "healthy"
 
 
 # Note: For a complete test suite, we would use a test database
@@ -0,0 +1,76 @@
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.api.v1 import batch
+from app.core.config import settings
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.state.calls = []
+
+    @app.get(f"{settings.API_PREFIX}/daos/{{dao_id}}")
+    async def get_dao(dao_id: int, fields: str = ""):
+        app.state.calls.append(dao_id)
+        if dao_id == 404:
+            raise HTTPException(status_code=404, detail="DAO not found")
+        return {"id": dao_id, "fields": fields}
+
+    app.include_router(batch.router, prefix=settings.API_PREFIX)
+    return app
+
+
+async def post_batch(app: FastAPI, requests) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(f"{settings.API_PREFIX}/batch", json={"requests": requests})
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_every_response_in_order():
+    app = make_app()
+    response = await post_batch(app, [
+        {"id": "a", "path": "/daos/1?fields=name"},
+        {"id": "missing", "path": "/daos/404"},
+        {"id": "b", "path": "/daos/2"},
+        {"id": "a-again", "path": "/daos/1?fields=name"},
+    ])
+
+    assert response.status_code == 200
+    assert response.json()["responses"] == [
+        {"id": "a", "status": 200, "body": {"id": 1, "fields": "name"}},
+        {"id": "missing", "status": 404, "body": {"detail": "DAO not found"}},
+        {"id": "b", "status": 200, "body": {"id": 2, "fields": ""}},
+        {"id": "a-again", "status": 200, "body": {"id": 1, "fields": "name"}},
+    ]
+    # Identical sub-requests run once
+    assert sorted(app.state.calls) == [1, 2, 404]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sub_request", [
+    {"id": "x", "path": "/daos/1", "method": "POST"},
+    {"id": "x", "path": "/events?dao_ids=1"},
+    {"id": "x", "path": "/batch"},
+    {"id": "x", "path": "http://example.com/daos/1"},
+    {"id": "x", "path": "/%65vents"},
+    {"id": "x", "path": "/./events"},
+    {"id": "x", "path": "/%65xport?format=csv"},
+    {"id": "x", "path": "/daos/../export"},
+    {"id": "x", "path": "//example.com/daos/1"},
+])
+async def test_batch_rejects_unbatchable_requests(sub_request):
+    response = await post_batch(make_app(), [sub_request])
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatches_decoded_paths_once():
+    app = make_app()
+    response = await post_batch(app, [
+        {"id": "plain", "path": "/daos/1"},
+        {"id": "encoded", "path": "/daos/%31"},
+    ])
+
+    assert [r["body"] for r in response.json()["responses"]] == [{"id": 1, "fields": ""}] * 2
+    assert app.state.calls == [1]
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.core.batch_loader import BatchLoader
+
+
+class Recorder:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, keys):
+        self.calls.append(sorted(keys))
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        return {key: key * 10 for key in keys if key != 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced_and_memoized():
+    batch_fn = Recorder()
+    loader = BatchLoader(batch_fn)
+
+    one, many, missing = await asyncio.gather(
+        loader.load(1), loader.load_many([2, 1, 3]), loader.load(0)
+    )
+
+    assert one == 10
+    assert many == {2: 20, 1: 10, 3: 30}
+    assert missing is None
+    assert batch_fn.calls == [[0, 1, 2, 3]]
+
+    # Loaded keys are not loaded again, primed ones are never loaded
+    loader.prime(4, 40)
+    assert await loader.load_many([3, 4, 5]) == {3: 30, 4: 40, 5: 50}
+    assert batch_fn.calls == [[0, 1, 2, 3], [5]]
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_are_not_memoized():
+    batch_fn = Recorder(fail=True)
+    loader = BatchLoader(batch_fn)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    batch_fn.fail = False
+    assert await loader.load(1) == 10
+    assert batch_fn.calls == [[1, 2], [1]]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.api.v1 import dao as dao_api
+from app.db import dao_index
+from app.db.dao_index import DAOIndex
+
+DAOS = [
+    (1, "Uniswap", "1"),
+    (2, "Aave", "1"),
+    (3, "Arbitrum DAO", "42161"),
+    (4, "Gnosis", "100"),
+    (5, "Optimism Collective", "10"),
+    (6, "bench-000009-dYdX", "1"),
+]
+
+
+def names(index: DAOIndex, query: str, limit: int = 10):
+    return [dao["name"] for dao in index.suggest(query, limit)]
+
+
+def test_name_prefixes_rank_before_word_prefixes_and_substrings():
+    index = DAOIndex(DAOS)
+
+    assert names(index, "a") == ["Aave", "Arbitrum DAO"]
+    assert names(index, "  UNI") == ["Uniswap"]
+    # "dao" starts the second word of Arbitrum DAO
+    assert names(index, "dao") == ["Arbitrum DAO"]
+    assert names(index, "dydx") == ["bench-000009-dYdX"]
+    # Substring of three characters or more
+    assert names(index, "swap") == ["Uniswap"]
+    assert names(index, "sw") == []
+    assert names(index, "") == []
+
+
+def test_chain_ids_match_after_names_and_limit_applies():
+    index = DAOIndex(DAOS)
+
+    assert names(index, "42161") == ["Arbitrum DAO"]
+    # Exact chain ID first, then chains by prefix, shortest names first
+    assert names(index, "10") == ["Optimism Collective", "Gnosis"]
+    assert names(index, "100") == ["Gnosis"]
+    assert names(index, "1", limit=2) == ["Aave", "Uniswap"]
+    assert names(index, "1") == ["Aave", "Uniswap", "bench-000009-dYdX", "Gnosis", "Optimism Collective"]
+    assert index.suggest("uni")[0] == {"id": 1, "name": "Uniswap", "chain_id": "1"}
+
+
+@pytest.mark.asyncio
+async def test_suggestions_fall_back_to_the_database_without_an_index(monkeypatch):
+    queries = []
+
+    async def suggest_from_database(query, limit):
+        queries.append((query, limit))
+        return []
+
+    async def load(session):
+        raise AssertionError("no transient index is built")
+
+    monkeypatch.setattr(dao_api, "get_loaded_index", lambda: None)
+    monkeypatch.setattr(dao_api, "suggest_from_database", suggest_from_database)
+    monkeypatch.setattr(DAOIndex, "load", load)
+
+    assert await dao_api.suggest_daos("uni", 5) == []
+    assert queries == [("uni", 5)]
+
+    monkeypatch.setattr(dao_api, "get_loaded_index", lambda: DAOIndex(DAOS))
+    assert await dao_api.suggest_daos("uni", 5) == [{"id": 1, "name": "Uniswap", "chain_id": "1"}]
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_the_running_refresh(monkeypatch):
+    started = asyncio.Event()
+
+    async def refresh_index():
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(dao_index, "refresh_index", refresh_index)
+    monkeypatch.setattr(dao_index.settings, "DAO_INDEX_REFRESH_DELAY_SECONDS", 0)
+
+    await dao_index._on_event({"event": dao_index.events.DAOS_CHANGED})
+    await asyncio.wait_for(started.wait(), 1)
+    assert len(dao_index._refresh_tasks) == 1
+
+    await dao_index.stop()
+
+    assert not dao_index._refresh_tasks
+    assert dao_index._refresh_handle is None
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from app.db.export import COLUMNS, encode_export, flatten_payload
+
+
+def test_flatten_payload_splits_numbers_and_text():
+    payload = {
+        "largest_holder_percent": 12.5,
+        "on_chain_automation": "Yes",
+        "token_distribution": {"top_10": 40, "others": 60},
+        "verified": True,
+        "tags": ["defi"],
+        "missing": None,
+    }
+
+    assert list(flatten_payload(payload)) == [
+        ("largest_holder_percent", 12.5, None),
+        ("on_chain_automation", None, "Yes"),
+        ("token_distribution.top_10", 40.0, None),
+        ("token_distribution.others", 60.0, None),
+        ("verified", None, "true"),
+        ("tags", None, '["defi"]'),
+    ]
+
+
+async def _batches():
+    for run_id in (1, 2):
+        yield {
+            "dao_id": [1], "dao_name": ["Uniswap"], "chain_id": ["1"], "run_id": [run_id],
+            "run_timestamp": [None], "metric_name": ["accumulated_funds"],
+            "field": ["treasury_value_usd"], "value": [1.5 * run_id], "value_text": [None],
+        }
+
+
+@pytest.mark.asyncio
+async def test_csv_export_has_one_header_and_a_row_per_field():
+    data = b"".join([chunk async for chunk in encode_export(_batches(), "csv")]).decode()
+
+    lines = data.splitlines()
+    assert lines[0] == ",".join(COLUMNS)
+    assert lines[1:] == [
+        "1,Uniswap,1,1,,accumulated_funds,treasury_value_usd,1.5,",
+        "1,Uniswap,1,2,,accumulated_funds,treasury_value_usd,3.0,",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_writes_a_row_group_per_batch():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = b"".join([chunk async for chunk in encode_export(_batches(), "parquet")])
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().column("value").to_pylist() == [1.5, 3.0]
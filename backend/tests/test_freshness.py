@@ -0,0 +1,50 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.db.freshness import freshness_query, select_due, tick_budget
+from app.db.session import engine
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+DAY = 24 * 3600
+
+
+def hours_ago(hours: float) -> datetime:
+    return NOW - timedelta(hours=hours)
+
+
+def test_only_stale_daos_are_due_most_stale_first():
+    rows = [
+        (1, None, hours_ago(2), hours_ago(2)),        # fresh
+        (2, None, hours_ago(30), hours_ago(30)),      # 1.25 days old
+        (3, 3600, hours_ago(3), hours_ago(3)),        # 3 intervals old
+        (4, None, None, None),                        # never fetched
+        (5, None, hours_ago(48), hours_ago(0.5)),     # failed just now
+        (6, None, None, hours_ago(2)),                # failed an hour+ ago
+    ]
+    assert settings.REFRESH_TARGET_SECONDS == DAY and settings.REFRESH_RETRY_SECONDS == 3600
+
+    assert select_due(rows, NOW, budget=10) == [4, 6, 3, 2]
+    assert select_due(rows, NOW, budget=2) == [4, 6]
+    assert select_due(rows, NOW) == [4, 6, 3, 2]
+
+
+def test_jitter_brings_refreshes_forward_by_at_most_its_fraction():
+    rows = [(dao_id, None, hours_ago(22), hours_ago(22)) for dao_id in range(100)]
+
+    assert select_due(rows, NOW, budget=100, jitter=0.0) == []
+    due = select_due(rows, NOW, budget=100, jitter=0.2, rng=random.Random(1))
+    # Due when 22h >= 24h * (1 - 0.2 * u), i.e. for u >= 5/12
+    assert 40 < len(due) < 80
+    assert select_due(rows, NOW, budget=100, jitter=0.05, rng=random.Random(1)) == []
+
+
+def test_tick_budget_spreads_the_hourly_budget():
+    assert tick_budget(300) == -(-settings.REFRESH_BUDGET_PER_HOUR * 300 // 3600)
+    assert tick_budget(0) == 1
+
+
+def test_freshness_query_uses_one_lateral_lookup_per_run_kind():
+    sql = str(freshness_query().compile(engine))
+    assert sql.count("LATERAL") == 2
+    assert "LEFT OUTER JOIN" in sql
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fakeredis import aioredis as fake_aioredis
+from sqlalchemy.dialects import postgresql
+
+from app.core import history_cache
+from app.core.config import settings
+from app.db.history import bucket_start, bucket_starts, bucketed_history
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_buckets_match_date_trunc():
+    timestamp = utc(2025, 4, 17, 15, 30)  # a Thursday
+    assert bucket_start(timestamp, "day") == utc(2025, 4, 17)
+    assert bucket_start(timestamp, "week") == utc(2025, 4, 14)
+    assert bucket_start(timestamp, "month") == utc(2025, 4, 1)
+    assert bucket_starts(utc(2025, 1, 15), utc(2025, 3, 1), "month") == [utc(2025, 1, 1), utc(2025, 2, 1)]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeSession:
+    """Returns one run at noon of every day since the query's start."""
+
+    def __init__(self, metrics=("holders",)):
+        self.metrics = metrics
+        self.starts = []
+
+    async def execute(self, query):
+        params = query.compile(dialect=postgresql.dialect()).params
+        if "run_timestamp_1" not in params:
+            # Whether the DAO has snapshots of the metric
+            return FakeResult([(1,)] if params["metric_name_1"] in self.metrics else [])
+        start = params["run_timestamp_1"]
+        self.starts.append(start)
+        days = (utc(2025, 4, 17) - start).days + 1
+        return FakeResult([
+            (day, day + timedelta(hours=12), {"holders": day.day})
+            for day in (start + timedelta(days=i) for i in range(days))
+        ])
+
+
+@pytest.mark.asyncio
+async def test_closed_buckets_are_only_computed_once(monkeypatch):
+    cache = {}
+
+    async def get_buckets(dao_id, metric, bucket, starts):
+        return {start: cache[start] for start in starts if start in cache}
+
+    async def put_buckets(dao_id, metric, bucket, points):
+        cache.update(points)
+
+    monkeypatch.setattr(history_cache, "get_buckets", get_buckets)
+    monkeypatch.setattr(history_cache, "put_buckets", put_buckets)
+    monkeypatch.setattr(settings, "HISTORY_CACHE_GRACE_SECONDS", 3600)
+    session = FakeSession()
+    now = utc(2025, 4, 17, 15, 0)
+
+    first = await bucketed_history(session, 1, "holders", "day", utc(2025, 4, 10, 6), now=now)
+    second = await bucketed_history(session, 1, "holders", "day", utc(2025, 4, 10, 6), now=now)
+
+    assert first == second
+    assert [payload["holders"] for _, payload in first] == list(range(10, 18))
+    # The first request computes every bucket, later ones only the open one
+    assert session.starts == [utc(2025, 4, 10), utc(2025, 4, 17)]
+    assert sorted(cache) == [utc(2025, 4, day) for day in range(10, 17)]
+
+
+@pytest.mark.asyncio
+async def test_only_metrics_with_snapshots_are_cached(monkeypatch):
+    cache = {}
+
+    async def put_buckets(dao_id, metric, bucket, points):
+        cache[metric] = points
+
+    monkeypatch.setattr(history_cache, "put_buckets", put_buckets)
+    session = FakeSession()
+    now = utc(2025, 4, 17, 15, 0)
+
+    assert await bucketed_history(session, 1, "made_up", "day", utc(2025, 4, 10), now=now) == []
+    assert session.starts == []
+    await bucketed_history(session, 1, "holders", "day", utc(2025, 4, 10), now=now)
+    assert list(cache) == ["holders"]
+
+
+@pytest.mark.asyncio
+async def test_cached_buckets_expire(monkeypatch):
+    client = fake_aioredis.FakeRedis()
+    monkeypatch.setattr(history_cache, "_async_client", client)
+    monkeypatch.setattr(settings, "HISTORY_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "HISTORY_CACHE_TTL_SECONDS", 600)
+    point = (utc(2025, 4, 10, 12), {"holders": 10})
+
+    await history_cache.put_buckets(1, "holders", "day", {utc(2025, 4, 10): point, utc(2025, 4, 11): None})
+
+    assert 0 < await client.ttl(history_cache.cache_key(1, "holders", "day")) <= 600
+    assert await history_cache.get_buckets(1, "holders", "day", [utc(2025, 4, 10), utc(2025, 4, 11)]) == {
+        utc(2025, 4, 10): point, utc(2025, 4, 11): None
+    }
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from app.api.history import encode_columns, encode_delta, encode_rows
+
+POINTS = [
+    (datetime(2025, 4, 1, tzinfo=timezone.utc), {"holders": 10, "token_distribution": {"a": 0.5, "b": 0.5}, "chain": "ethereum"}),
+    (datetime(2025, 4, 2, tzinfo=timezone.utc), {"holders": 12, "token_distribution": {"a": 0.5, "b": 0.5}, "chain": "ethereum"}),
+    (datetime(2025, 4, 3, tzinfo=timezone.utc), {"holders": 12, "token_distribution": {"a": 0.6}, "chain": "ethereum"}),
+]
+
+
+def test_columns_split_numeric_and_text_fields():
+    history = encode_columns(POINTS)
+
+    assert history["timestamps"] == [timestamp for timestamp, _ in POINTS]
+    assert history["fields"] == {
+        "holders": [10.0, 12.0, 12.0],
+        "token_distribution.a": [0.5, 0.5, 0.6],
+        "token_distribution.b": [0.5, 0.5, None],
+    }
+    assert history["text_fields"] == {"chain": ["ethereum"] * 3}
+
+
+def test_delta_only_carries_changed_fields():
+    history = encode_delta(POINTS)
+
+    first, second, third = history["changes"]
+    assert first == {"holders": 10.0, "token_distribution.a": 0.5, "token_distribution.b": 0.5, "chain": "ethereum"}
+    assert second == {"holders": 12.0}
+    assert third == {"token_distribution.a": 0.6, "token_distribution.b": None}
+
+
+def test_rows_keep_the_full_payload():
+    assert encode_rows(POINTS)[2] == {"timestamp": POINTS[2][0], "data": POINTS[2][1]}
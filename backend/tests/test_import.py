@@ -0,0 +1,67 @@
+import json
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.rollups import rebuild_rollup_statements
+
+import import_dao_data
+
+
+@pytest.fixture
+def database():
+    """Synchronous engine on the configured database; skips without one."""
+    engine = create_engine(settings.SQLALCHEMY_DATABASE_URI_SYNC, connect_args={"connect_timeout": 2})
+    try:
+        engine.connect().close()
+    except OperationalError:
+        pytest.skip("No database to import into")
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_legacy_importer_writes_partitioned_snapshots(database, tmp_path):
+    name = f"test-import-{uuid.uuid4().hex[:8]}"
+    records = [{
+        "dao_name": name,
+        "chain_id": "1",
+        "accumulated_funds": {"treasury_value_usd": 1000.0},
+        "network_participation": {"participation_rate": 12.5},
+    }]
+    path = tmp_path / "dao_data.json"
+    path.write_text(json.dumps(records))
+
+    try:
+        await import_dao_data.import_data(str(path))
+
+        with database.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT s.metric_name, s.run_timestamp = r.run_timestamp FROM metric_snapshot s "
+                "JOIN metric_run r ON r.id = s.run_id AND r.dao_id = s.dao_id "
+                "JOIN dao d ON d.id = s.dao_id WHERE d.name = :name AND r.succeeded"
+            ), {"name": name}).all()
+        # Every category is stored, empty ones included, in the run's partition
+        assert sorted(rows) == [
+            ("accumulated_funds", True), ("decentralisation", True), ("health_metrics", True),
+            ("network_participation", True), ("voting_efficiency", True),
+        ]
+    finally:
+        await import_dao_data.engine.dispose()
+        await db_session.engine.dispose()
+        with database.begin() as conn:
+            dao_id = conn.execute(text("SELECT id FROM dao WHERE name = :name"), {"name": name}).scalar()
+            if dao_id is not None:
+                days = conn.execute(
+                    text("DELETE FROM dao_daily_metric WHERE dao_id = :id RETURNING day"), {"id": dao_id}
+                ).scalars().all()
+                for table in ("metric_snapshot", "metric_run"):
+                    conn.execute(text(f"DELETE FROM {table} WHERE dao_id = :id"), {"id": dao_id})
+                conn.execute(text("DELETE FROM dao WHERE id = :id"), {"id": dao_id})
+                if days:
+                    for statement in rebuild_rollup_statements(days):
+                        conn.execute(statement)
@@ -0,0 +1,124 @@
+import asyncio
+import math
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1 import kpis
+from app.db import kpi_store
+from app.db.kpi_store import KPIStore
+from app.db.models import DAO
+
+ROWS = [
+    (1, "Uniswap", "1", "accumulated_funds", {"treasury_value_usd": 2087864352.5}),
+    (1, "Uniswap", "1", "network_participation", {"participation_rate": 5.47}),
+    (2, "Aave", "1", "accumulated_funds", {"treasury_value_usd": 150000000.0}),
+    (3, "Arbitrum", "42161", "accumulated_funds", {"treasury_value_usd": 3500000000.0}),
+    (3, "Arbitrum", "42161", "network_participation", {"participation_rate": 1.2}),
+]
+
+
+def test_columns_are_aligned_with_dao_ids():
+    store = KPIStore.from_rows(ROWS)
+
+    assert store.dao_ids.tolist() == [1, 2, 3]
+    assert sorted(store.columns) == [
+        "accumulated_funds.treasury_value_usd",
+        "network_participation.participation_rate",
+    ]
+    participation = store.columns["network_participation.participation_rate"]
+    assert participation[0] == 5.47
+    assert math.isnan(participation[1])
+    assert store.stats()["memory_bytes"] == store.nbytes > 0
+
+
+def test_ranking_orders_and_filters():
+    store = KPIStore.from_rows(ROWS)
+    field = "accumulated_funds.treasury_value_usd"
+
+    assert [row["id"] for row in store.ranking(field)] == [3, 1, 2]
+    assert [row["id"] for row in store.ranking(field, descending=False, limit=2)] == [2, 1]
+    assert [row["id"] for row in store.ranking(field, chain_id="1")] == [1, 2]
+    assert [row["id"] for row in store.ranking(field, min_value=1e9, max_value=3e9)] == [1]
+    assert store.ranking("unknown.field") == []
+
+
+def test_rows_skip_missing_values_and_daos():
+    store = KPIStore.from_rows(ROWS)
+
+    rows = store.rows([2, 99], ["network_participation.participation_rate"])
+
+    assert rows == [{
+        "id": 2,
+        "name": "Aave",
+        "chain_id": "1",
+        "values": {"network_participation.participation_rate": None},
+    }]
+
+
+class FakeRepository:
+    """Serves the DAOs and latest metrics of ROWS."""
+
+    def __init__(self):
+        self.requested = []
+
+    async def get_daos(self, dao_ids):
+        self.requested.append(dao_ids)
+        return {
+            dao_id: DAO(id=dao_id, name=name, chain_id=chain_id)
+            for dao_id, name, chain_id, _, _ in ROWS if dao_id in dao_ids
+        }
+
+    async def get_metrics(self, dao_ids):
+        metrics = {}
+        for dao_id, _, _, metric_name, payload in ROWS:
+            if dao_id in dao_ids:
+                metrics.setdefault(dao_id, {})[metric_name] = payload
+        return metrics
+
+
+@pytest.mark.asyncio
+async def test_disabled_store_reads_only_the_requested_daos(monkeypatch):
+    monkeypatch.setattr(kpis, "get_loaded_store", lambda: None)
+    repository = FakeRepository()
+
+    rows = await kpis.get_latest_kpis("3, 1, 99", None, repository)
+
+    assert repository.requested == [[3, 1, 99]]
+    assert rows == KPIStore.from_rows(ROWS).rows([3, 1])
+    with pytest.raises(HTTPException) as error:
+        kpis.get_kpi_store()
+    assert error.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_event_refreshes_are_kept_until_done_and_log_failures(monkeypatch, caplog):
+    async def refresh_store():
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(kpi_store, "refresh_store", refresh_store)
+    monkeypatch.setattr(kpi_store.settings, "KPI_STORE_REFRESH_DELAY_SECONDS", 0)
+
+    await kpi_store._on_event({"event": kpi_store.events.RUN_COMMITTED})
+    await asyncio.sleep(0.01)
+
+    assert not kpi_store._refresh_tasks
+    assert "database down" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_the_pending_refresh(monkeypatch):
+    refreshes = []
+
+    async def refresh_store():
+        refreshes.append(1)
+
+    monkeypatch.setattr(kpi_store, "refresh_store", refresh_store)
+    monkeypatch.setattr(kpi_store.settings, "KPI_STORE_REFRESH_DELAY_SECONDS", 0.01)
+
+    await kpi_store._on_event({"event": kpi_store.events.RUN_COMMITTED})
+    await kpi_store.stop()
+    await asyncio.sleep(0.03)
+
+    assert refreshes == []
+    assert kpi_store._refresh_handle is None
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.core.config import settings
+from app.db.models import MetricRun, MetricSnapshot
+from app.db.partitions import add_months, month_start, partition_name
+from app.db.retention import retention_tiers
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_metric_tables_are_partitioned_by_run_timestamp():
+    for model in (MetricRun, MetricSnapshot):
+        ddl = str(CreateTable(model.__table__).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY RANGE (run_timestamp)" in ddl
+        assert "PRIMARY KEY (id, run_timestamp)" in ddl
+
+
+def test_monthly_partition_bounds():
+    assert month_start(datetime(2025, 4, 30, 23, 59)) == utc(2025, 4, 1)
+    assert add_months(utc(2025, 11, 1), 3) == utc(2026, 2, 1)
+    assert add_months(utc(2025, 1, 1), -1) == utc(2024, 12, 1)
+    assert partition_name("metric_run", utc(2025, 4, 1)) == "metric_run_y2025m04"
+
+
+def test_retention_tiers_cover_the_history_without_gaps(monkeypatch):
+    monkeypatch.setattr(settings, "RETENTION_DAILY_DAYS", 90)
+    monkeypatch.setattr(settings, "RETENTION_WEEKLY_DAYS", 365)
+
+    tiers = retention_tiers(utc(2025, 6, 15, 12, 30))
+
+    assert [bucket for bucket, _, _ in tiers] == ["day", "week", "month"]
+    (_, daily_start, today), (_, weekly_start, weekly_end), (_, _, monthly_end) = tiers
+    assert today == utc(2025, 6, 15)
+    # The daily tier starts on the Monday on or before 90 days ago
+    assert daily_start == utc(2025, 3, 17) and daily_start.weekday() == 0
+    assert weekly_end == daily_start
+    assert weekly_start == monthly_end == utc(2024, 6, 1)
@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.profiler import (
+    QueryProfilerMiddleware,
+    assert_max_queries,
+    current_profile,
+    fingerprint,
+    install,
+    profile,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    install(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE dao (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO dao (id, name) VALUES (1, 'Uniswap'), (2, 'Aave')"))
+    return engine
+
+
+def test_fingerprint_normalizes_parameters_and_literals():
+    assert fingerprint(
+        "SELECT *\n  FROM dao WHERE id = %(id_1)s AND name = 'Uniswap' LIMIT 10"
+    ) == "SELECT * FROM dao WHERE id = ? AND name = ? LIMIT ?"
+    assert fingerprint(
+        "SELECT * FROM dao WHERE id IN ($1, $2, $3)"
+    ) == "SELECT * FROM dao WHERE id IN (?+)"
+
+
+def test_profile_records_statements_and_flags_repeats(engine):
+    with profile() as query_profile:
+        with engine.connect() as conn:
+            for dao_id in (1, 2, 1, 2, 1):
+                conn.execute(text("SELECT name FROM dao WHERE id = :id"), {"id": dao_id}).all()
+
+    assert query_profile.count == 5
+    assert query_profile.seconds > 0
+    assert query_profile.repeated(threshold=5) == {"SELECT name FROM dao WHERE id = ?": 5}
+    assert query_profile.repeated(threshold=6) == {}
+
+
+def test_nested_profiles_propagate_to_parent(engine):
+    with profile() as outer:
+        with profile() as inner:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+    assert inner.count == outer.count == 1
+
+
+def test_assert_max_queries(engine):
+    with assert_max_queries(1):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with pytest.raises(AssertionError, match="Expected at most 1 queries"):
+        with assert_max_queries(1):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+
+def test_failed_statements_do_not_leak_start_times(engine):
+    with profile() as query_profile:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+            assert "query_started" not in conn.info
+
+    assert query_profile.count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enabled", [True, False])
+async def test_middleware_skips_profiling_when_disabled(monkeypatch, enabled):
+    monkeypatch.setattr(settings, "QUERY_PROFILER_ENABLED", enabled)
+    profiles = []
+
+    async def app(scope, receive, send):
+        profiles.append(current_profile())
+
+    await QueryProfilerMiddleware(app)({"type": "http", "method": "GET", "path": "/"}, None, None)
+
+    assert (profiles[0] is not None) == enabled
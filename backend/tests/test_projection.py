@@ -0,0 +1,38 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.utils import parse_projection
+from app.db.projection import payload_column, project_payload
+
+
+def test_parse_projection_merges_fields_and_metrics():
+    assert parse_projection() is None
+    assert parse_projection(
+        fields="accumulated_funds.treasury_value_usd, accumulated_funds.total_supply,health_metrics",
+        metrics="decentralisation",
+    ) == {
+        "decentralisation": None,
+        "accumulated_funds": {"treasury_value_usd", "total_supply"},
+        "health_metrics": None,
+    }
+    # A whole metric wins over some of its keys
+    assert parse_projection(fields="health_metrics.total_volume,health_metrics") == {"health_metrics": None}
+
+
+@pytest.mark.parametrize("fields", ["accumulated_funds.", ".treasury_value_usd", " , "])
+def test_parse_projection_rejects_malformed_fields(fields):
+    with pytest.raises(HTTPException) as error:
+        parse_projection(fields=fields)
+    assert error.value.status_code == 400
+
+
+def test_payload_column_only_builds_projected_keys():
+    column = payload_column({"accumulated_funds": {"treasury_value_usd"}, "health_metrics": None})
+    sql = str(column.compile(dialect=postgresql.dialect()))
+
+    assert "json_build_object" in sql
+    assert sql.count("WHEN") == 1
+
+    assert project_payload({"a": 1, "b": 2}, {"b", "c"}) == {"b": 2, "c": None}
+    assert project_payload({"a": 1}, None) == {"a": 1}
@@ -0,0 +1,47 @@
+import pytest
+
+from app.db.replicas import ReplicaRouter
+
+
+class StubRouter(ReplicaRouter):
+    """Router with scripted lags instead of queries; an exception marks a replica down."""
+
+    def __init__(self, lags, **kwargs):
+        super().__init__(
+            replicas=[(name, name) for name in lags],
+            fallback=("primary_read", "primary_read"),
+            **kwargs,
+        )
+        self.lags = lags
+        self.checks = 0
+
+    async def measure_lag(self, engine):
+        self.checks += 1
+        lag = self.lags[engine]
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+@pytest.mark.asyncio
+async def test_round_robin_over_fresh_replicas():
+    router = StubRouter({"replica_0": 0.0, "replica_1": 0.5}, max_lag=5, check_interval=60)
+
+    chosen = [(await router.choose())[0] for _ in range(4)]
+
+    assert chosen == ["replica_0", "replica_1", "replica_0", "replica_1"]
+    # Lags are cached for the check interval
+    assert router.checks == 2
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_unreachable_replicas_fall_back_to_primary():
+    router = StubRouter(
+        {"replica_0": 30.0, "replica_1": ConnectionRefusedError()}, max_lag=5, check_interval=60
+    )
+
+    assert (await router.choose())[0] == "primary_read"
+
+    router.lags["replica_0"] = 1.0
+    router.check_interval = 0
+    assert (await router.choose())[0] == "replica_0"
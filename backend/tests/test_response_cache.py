@@ -0,0 +1,127 @@
+import gzip
+import json
+
+import fakeredis
+import httpx
+import pytest
+from fakeredis import aioredis as fake_aioredis
+
+from app.core import response_cache
+from app.core.config import settings
+from app.core.response_cache import (
+    ENCODERS,
+    ResponseCacheMiddleware,
+    cache_key,
+    encode_variants,
+    is_cacheable,
+    negotiate,
+)
+
+
+def test_negotiate_prefers_zstd_then_brotli_and_honours_q_values():
+    assert negotiate("") == "identity"
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip, deflate, br, zstd") == ("zstd" if "zstd" in ENCODERS else "br")
+    assert negotiate("zstd;q=0, br;q=0.5, gzip;q=0.4") == ("br" if "br" in ENCODERS else "gzip")
+    assert negotiate("*;q=0") == "identity"
+
+
+def test_encode_variants_only_compresses_large_bodies():
+    assert encode_variants(b"{}") == {"identity": b"{}"}
+
+    body = b'{"name": "Uniswap"}' * 100
+    variants = encode_variants(body)
+    assert set(variants) == {"identity", *ENCODERS}
+    assert gzip.decompress(variants["gzip"]) == body
+
+
+def test_cache_key_ignores_query_parameter_order():
+    assert cache_key("/api/v1/daos", b"limit=10&skip=0") == cache_key("/api/v1/daos", b"skip=0&limit=10")
+
+
+def test_only_dao_documents_are_cacheable():
+    def scope(path, method="GET"):
+        return {"type": "http", "method": method, "path": path}
+
+    assert is_cacheable(scope("/api/v1/daos"))
+    assert is_cacheable(scope("/api/v1/daos/1"))
+    assert is_cacheable(scope("/api/v1/daos/1/enhanced_metrics"))
+    assert not is_cacheable(scope("/api/v1/daos/1/metrics"))
+    assert not is_cacheable(scope("/api/v1/daos/1/poll", "POST"))
+
+
+@pytest.fixture
+def cached_app(monkeypatch):
+    """A JSON app behind the cache middleware, on fake Redis, counting renders."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", "")
+    monkeypatch.setattr(response_cache, "_async_client", fake_aioredis.FakeRedis(server=server))
+    monkeypatch.setattr(response_cache, "_sync_client", fakeredis.FakeRedis(server=server))
+    renders = []
+
+    async def app(scope, receive, send):
+        renders.append(scope["path"])
+        body = json.dumps({"path": scope["path"], "render": len(renders), "pad": "x" * 300}).encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+    client = httpx.AsyncClient(app=ResponseCacheMiddleware(app), base_url="http://test")
+    return client, renders
+
+
+@pytest.mark.asyncio
+async def test_middleware_stores_then_serves_and_revalidates(cached_app):
+    client, renders = cached_app
+    path = f"{settings.API_PREFIX}/daos/1"
+
+    miss = await client.get(path, headers={"accept-encoding": "gzip"})
+    hit = await client.get(path, headers={"accept-encoding": "gzip"})
+    assert (miss.headers["x-cache"], hit.headers["x-cache"]) == ("MISS", "HIT")
+    assert hit.headers["content-encoding"] == "gzip"
+    assert hit.json() == miss.json()
+    assert renders == [path]
+
+    # Each encoding is its own representation, with its own strong ETag
+    identity = await client.get(path, headers={"accept-encoding": "identity"})
+    assert identity.headers["etag"] != hit.headers["etag"]
+    not_modified = await client.get(
+        path, headers={"accept-encoding": "gzip", "if-none-match": hit.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    changed = await client.get(
+        path, headers={"accept-encoding": "gzip", "if-none-match": identity.headers["etag"]}
+    )
+    assert changed.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_invalidation_retires_only_the_dao_and_list_entries(cached_app):
+    client, renders = cached_app
+    paths = [f"{settings.API_PREFIX}/daos", f"{settings.API_PREFIX}/daos/1", f"{settings.API_PREFIX}/daos/2"]
+    for path in paths:
+        await client.get(path)
+
+    response_cache.invalidate_sync(1)
+
+    assert [(await client.get(path)).headers["x-cache"] for path in paths] == ["MISS", "MISS", "HIT"]
+
+    await response_cache.invalidate()
+
+    assert [(await client.get(path)).headers["x-cache"] for path in paths] == ["MISS", "MISS", "MISS"]
+    assert len(renders) == 8
+
+
+@pytest.mark.asyncio
+async def test_responses_are_not_stored_while_replicas_catch_up(cached_app, monkeypatch):
+    client, renders = cached_app
+    path = f"{settings.API_PREFIX}/daos/1"
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", "postgresql+asyncpg://replica/db")
+    monkeypatch.setattr(settings, "DB_REPLICA_MAX_LAG_SECONDS", 60)
+
+    response_cache.invalidate_sync(1)
+
+    assert [(await client.get(path)).headers["x-cache"] for _ in range(2)] == ["MISS", "MISS"]
+    assert (await client.get(f"{settings.API_PREFIX}/daos/2")).headers["x-cache"] == "MISS"
+    assert (await client.get(f"{settings.API_PREFIX}/daos/2")).headers["x-cache"] == "HIT"
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import DAO, MetricRun
+from app.db.rollups import (
+    GLOBAL_CHAIN_ID,
+    check_chain_id,
+    extract_numeric_fields,
+    rebuild_rollup_statements,
+    rollup_statements,
+)
+
+
+def test_extract_numeric_fields():
+    """Only finite, non-boolean scalars are kept and keyed by category."""
+    metrics = {
+        "network_participation": {"participation_rate": 5.4, "total_members": 393314},
+        "decentralisation": {
+            "on_chain_automation": "Yes",
+            "token_distribution": {"0-1": 10},
+            "largest_holder_percent": 37.1,
+        },
+        "health_metrics": {"activity_ratio": float("nan"), "flag": True},
+    }
+
+    assert extract_numeric_fields(metrics) == {
+        "network_participation.participation_rate": 5.4,
+        "network_participation.total_members": 393314.0,
+        "decentralisation.largest_holder_percent": 37.1,
+    }
+
+
+def test_rollup_statements_touch_chain_and_global_rows():
+    """A run updates its DAO's daily values, then locks and updates its chain and the global rollup."""
+    dao = DAO(id=1, name="Uniswap", chain_id="1")
+    run = MetricRun(id=7, dao_id=1, run_timestamp=datetime(2025, 4, 6, 17, 38), src_file_path="")
+
+    statements = rollup_statements(dao, run, {"accumulated_funds": {"treasury_value_usd": 1.0}})
+    compiled = [stmt.compile(dialect=postgresql.dialect()) for stmt in statements]
+
+    assert len(compiled) == 5
+    assert str(compiled[0]).startswith("INSERT INTO dao_daily_metric")
+    assert "pg_advisory_xact_lock(hashtext(" in str(compiled[1])
+    assert list(compiled[1].params.values()) == ["1", run.run_timestamp.date().toordinal()]
+    assert compiled[2].params["param_1"] == "1"
+    assert "dao_daily_metric.chain_id" in str(compiled[2])
+    assert list(compiled[3].params.values())[0] == GLOBAL_CHAIN_ID
+    assert compiled[4].params["param_1"] == GLOBAL_CHAIN_ID
+    assert "dao_daily_metric.chain_id" not in str(compiled[4])
+
+
+def test_rollup_statements_without_numeric_fields():
+    dao = DAO(id=1, name="Uniswap", chain_id="1")
+    run = MetricRun(id=7, dao_id=1, run_timestamp=datetime(2025, 4, 6), src_file_path="")
+
+    assert rollup_statements(dao, run, {"decentralisation": {"token_distribution": {}}}) == []
+
+
+def test_the_global_chain_id_is_reserved():
+    dao = DAO(id=1, name="Everywhere", chain_id="All")
+    run = MetricRun(id=7, dao_id=1, run_timestamp=datetime(2025, 4, 6), src_file_path="")
+
+    assert check_chain_id("10") == "10"
+    with pytest.raises(ValueError):
+        check_chain_id(GLOBAL_CHAIN_ID)
+    with pytest.raises(ValueError):
+        rollup_statements(dao, run, {"accumulated_funds": {"treasury_value_usd": 1.0}})
+
+
+def test_rebuild_rollup_statements_replace_the_days_rows():
+    days = [datetime(2025, 4, 7).date(), datetime(2025, 4, 6).date(), datetime(2025, 4, 7).date()]
+
+    statements = rebuild_rollup_statements(days)
+    compiled = [stmt.compile(dialect=postgresql.dialect()) for stmt in statements]
+
+    assert str(compiled[0]).startswith("DELETE FROM chain_metric_rollup")
+    assert compiled[0].params["day_1"] == sorted(set(days))
+    assert "GROUP BY dao_daily_metric.chain_id" in str(compiled[1])
+    assert GLOBAL_CHAIN_ID in compiled[2].params.values()
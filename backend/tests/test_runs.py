@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.runs import as_utc, latest_runs_query
+
+
+def test_latest_runs_query_looks_up_each_dao_in_the_run_index():
+    query = latest_runs_query([1, 2], as_of=datetime(2025, 4, 1))
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "JOIN LATERAL" in sql
+    assert "metric_run.dao_id = dao.id" in sql
+    assert "metric_run.run_timestamp <= %(run_timestamp_1)s" in sql
+    assert compiled.params["run_timestamp_1"] == datetime(2025, 4, 1, tzinfo=timezone.utc)
+    assert "ORDER BY metric_run.run_timestamp DESC" in sql
+    assert "LIMIT %(param_1)s" in sql and compiled.params["param_1"] == 1
+
+
+def test_naive_as_of_is_utc():
+    assert as_utc(datetime(2025, 4, 1)) == datetime(2025, 4, 1, tzinfo=timezone.utc)
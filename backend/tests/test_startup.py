@@ -0,0 +1,15 @@
+import json
+import subprocess
+import sys
+
+
+def test_api_import_does_not_load_worker_stack():
+    """Routers dispatch tasks by name, so booting the API must not import Celery."""
+    code = (
+        "import json, sys; import app.main; "
+        "print(json.dumps([m for m in ('celery', 'app.workers.tasks', 'app.db.session_sync') "
+        "if m in sys.modules]))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+
+    assert json.loads(output.strip().splitlines()[-1]) == []
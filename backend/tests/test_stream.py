@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from app.api.v1.stream import event_stream
+from app.core import events
+
+
+@pytest.mark.asyncio
+async def test_stream_only_forwards_events_of_requested_daos(monkeypatch):
+    # No Redis here: events are put on the stream queues directly
+    monkeypatch.setattr(events, "start_listener", lambda: None)
+
+    stream = event_stream({1})
+    assert await stream.__anext__() == "retry: 5000\n\n"
+
+    for queue in events._streams:
+        queue.put_nowait({"event": events.RUN_COMMITTED, "dao_id": 2, "run_id": 10})
+        queue.put_nowait({"event": events.RUN_COMMITTED, "dao_id": 1, "run_id": 11})
+
+    message = await stream.__anext__()
+    assert message.startswith("event: run_committed\ndata: ")
+    assert json.loads(message.split("data: ", 1)[1]) == {
+        "event": "run_committed", "dao_id": 1, "run_id": 11,
+    }
+
+    await stream.aclose()
+    assert not events._streams
@@ -0,0 +1,152 @@
+from contextlib import nullcontext
+
+import fakeredis
+import pytest
+
+from app.core.config import settings
+from app.workers import producer
+from app.workers.producer import FETCH_METRICS_FOR_DAO, FETCH_METRICS_FOR_DAO_BULK
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Tasks sent to the broker, with Redis on a fake server."""
+    monkeypatch.setattr(producer, "_client", fakeredis.FakeRedis())
+    calls = []
+    monkeypatch.setattr(producer, "send_task", lambda name, **options: calls.append((name, options)))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_send_task_once_returns_the_queued_task_until_it_finishes(sent, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_DEBOUNCE_SECONDS", 0)
+
+    task_id, deduplicated = await producer.send_task_once("fetch", "fetch:1", args=[1])
+    assert not deduplicated
+    assert await producer.send_task_once("fetch", "fetch:1", args=[1]) == (task_id, True)
+    assert (await producer.send_task_once("fetch", "fetch:2", args=[2]))[1] is False
+    assert [options["task_id"] for _, options in sent] == [task_id, sent[1][1]["task_id"]]
+
+    producer.task_finished("fetch:1", task_id)
+
+    new_id, deduplicated = await producer.send_task_once("fetch", "fetch:1", args=[1])
+    assert not deduplicated and new_id != task_id
+
+
+def test_send_task_once_sync_shares_the_async_deduplication(sent, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_DEBOUNCE_SECONDS", 0)
+
+    task_id, deduplicated = producer.send_task_once_sync("fetch", "fetch:1", args=[1])
+    assert not deduplicated
+    assert producer.send_task_once_sync("fetch", "fetch:1", args=[1]) == (task_id, True)
+
+    producer.task_finished("fetch:1", task_id)
+    assert producer.send_task_once_sync("fetch", "fetch:1", args=[1])[1] is False
+    assert len(sent) == 2
+
+
+def test_covering_work_deduplicates_without_being_deduplicated(sent, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_DEBOUNCE_SECONDS", 0)
+
+    poll_id, _ = producer.send_task_once_sync("poll", "poll:1")
+    assert producer.send_task_once_sync("bulk", "bulk:1", covered_by=["poll:1"]) == (poll_id, True)
+
+    producer.task_finished("poll:1", poll_id)
+    bulk_id, deduplicated = producer.send_task_once_sync("bulk", "bulk:1", covered_by=["poll:1"])
+    assert not deduplicated
+    # A poll never waits for a scheduled fetch
+    assert producer.send_task_once_sync("poll", "poll:1")[1] is False
+    assert [name for name, _ in sent] == ["poll", "bulk", "poll"]
+
+
+@pytest.mark.asyncio
+async def test_finished_tasks_are_debounced(sent, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_DEBOUNCE_SECONDS", 30)
+
+    task_id, _ = await producer.send_task_once("fetch", "fetch:1")
+    producer.task_finished("fetch:1", task_id)
+
+    assert await producer.send_task_once("fetch", "fetch:1") == (task_id, True)
+    assert len(sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_task_finished_only_releases_its_own_task(sent, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_DEBOUNCE_SECONDS", 0)
+
+    task_id, _ = await producer.send_task_once("fetch", "fetch:1")
+    # An older task of the same key, e.g. queued while Redis was down
+    producer.task_finished("fetch:1", "older-task")
+
+    assert await producer.send_task_once("fetch", "fetch:1") == (task_id, True)
+
+
+@pytest.mark.asyncio
+async def test_failed_send_releases_the_key_and_keeps_its_error(sent, monkeypatch):
+    send = producer.send_task
+
+    def fail(name, **options):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(producer, "send_task", fail)
+    with pytest.raises(ConnectionError):
+        await producer.send_task_once("fetch", "fetch:1")
+
+    # Redis failing on the release must not hide the broker error
+    client = producer._client
+    claim = client.eval
+
+    def claim_then_fail(script, *args):
+        if script == producer._RELEASE_SCRIPT:
+            raise producer.redis.ConnectionError("redis down")
+        return claim(script, *args)
+
+    monkeypatch.setattr(client, "eval", claim_then_fail)
+    with pytest.raises(ConnectionError, match="broker down"):
+        producer.send_task_once_sync("fetch", "fetch:2")
+
+    monkeypatch.setattr(client, "eval", claim)
+    monkeypatch.setattr(producer, "send_task", send)
+    assert (await producer.send_task_once("fetch", "fetch:1"))[1] is False
+
+
+def test_scheduler_spends_its_budget_on_daos_not_in_flight(sent, monkeypatch):
+    from app.workers import tasks
+
+    monkeypatch.setattr(tasks, "send_task_once_sync", producer.send_task_once_sync)
+    monkeypatch.setattr(tasks, "sync_engine", type("Engine", (), {"connect": lambda self: nullcontext()})())
+    monkeypatch.setattr(tasks, "find_due_daos", lambda conn, now: [1, 2, 3, 4, 5])
+    monkeypatch.setattr(tasks, "tick_budget", lambda interval: 2)
+    # DAO 1 was just polled, DAO 2 has a scheduled fetch pending
+    producer.send_task_once_sync(FETCH_METRICS_FOR_DAO, f"{FETCH_METRICS_FOR_DAO}:1", args=[1])
+    producer.send_task_once_sync(FETCH_METRICS_FOR_DAO_BULK, f"{FETCH_METRICS_FOR_DAO_BULK}:2", args=[2])
+    sent.clear()
+
+    result = tasks.schedule_stale_refreshes()
+
+    assert (result["queued"], result["skipped"]) == (2, 2)
+    assert [options["args"] for _, options in sent] == [[3], [4]]
+
+
+def test_refresh_of_all_daos_skips_daos_in_flight(sent, monkeypatch):
+    from app.workers import tasks
+
+    class Session:
+        def query(self, model):
+            return type("Query", (), {"all": lambda self: [tasks.DAO(id=dao_id) for dao_id in (1, 2, 3)]})()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(settings, "TASK_DEBOUNCE_SECONDS", 0)
+    monkeypatch.setattr(tasks, "send_task_once_sync", producer.send_task_once_sync)
+    monkeypatch.setattr(tasks, "get_db_sync", lambda: iter([Session()]))
+    # DAO 1 was just polled, DAO 2 has a scheduled fetch pending
+    producer.send_task_once_sync(FETCH_METRICS_FOR_DAO, f"{FETCH_METRICS_FOR_DAO}:1", args=[1])
+    producer.send_task_once_sync(FETCH_METRICS_FOR_DAO_BULK, f"{FETCH_METRICS_FOR_DAO_BULK}:2", args=[2])
+    sent.clear()
+
+    result = tasks.fetch_metrics_for_all_daos()
+
+    assert (result["queued"], result["skipped"]) == (1, 2)
+    assert [(name, options["args"]) for name, options in sent] == [(FETCH_METRICS_FOR_DAO_BULK, [3])]
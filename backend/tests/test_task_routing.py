@@ -0,0 +1,32 @@
+import pytest
+
+from app.workers.celery_app import celery_app
+from app.workers.producer import (
+    BULK_QUEUE,
+    FETCH_METRICS_FOR_ALL_DAOS,
+    FETCH_METRICS_FOR_DAO,
+    FETCH_METRICS_FOR_DAO_BULK,
+    INTERACTIVE_QUEUE,
+    MAINTAIN_METRIC_HISTORY,
+    SCHEDULE_STALE_REFRESHES,
+)
+
+
+@pytest.mark.parametrize("task_name, queue", [
+    (FETCH_METRICS_FOR_DAO, INTERACTIVE_QUEUE),
+    (FETCH_METRICS_FOR_DAO_BULK, BULK_QUEUE),
+    (FETCH_METRICS_FOR_ALL_DAOS, BULK_QUEUE),
+    (MAINTAIN_METRIC_HISTORY, BULK_QUEUE),
+    (SCHEDULE_STALE_REFRESHES, BULK_QUEUE),
+    ("unrouted_task", INTERACTIVE_QUEUE),
+])
+def test_tasks_are_routed_to_their_queue(task_name, queue):
+    route = celery_app.amqp.router.route({}, task_name)
+    assert route["queue"].name == queue
+
+
+def test_only_the_bulk_fetch_is_rate_limited():
+    from app.workers import tasks
+
+    assert tasks.fetch_metrics_for_dao_bulk.rate_limit
+    assert tasks.fetch_metrics_for_dao.rate_limit is None
@@ -4,7 +4,7 @@
 import React from 'react';
 import { useParams } from 'next/navigation';
 import { SingleDAOCharts } from '../../../components/charts/SingleDAOCharts';
-import { useDAO } from '../../../lib/hooks/useDAO';
+import { useDAOPage } from '../../../lib/hooks/useDAOPage';
 import { Card, CardContent, CardHeader, CardTitle } from '../../../components/ui/card';
 import { Button } from '../../../components/ui/button';
 import Link from 'next/link';
@@ -23,7 +23,7 @@ import {
 export default function DAODetail() {
   const { id } = useParams();
   const daoId = parseInt(id as string, 10);
-  const { data: dao, isLoading, error } = useDAO(daoId);
+  const { data: dao, isLoading, error } = useDAOPage(daoId);
   const { isDAOSelected, toggleDAOSelection } = useDAOSelection();
 
   if (isLoading) {
@@ -2,6 +2,8 @@
 import React, { useState, useEffect } from 'react';
 import { Checkbox } from '../ui/checkbox';
 import { useDAOs } from '../../lib/hooks/useDAOs';
+import { useDAOSuggestions } from '../../lib/hooks/useDAOSuggestions';
+import type { DAOSuggestion } from '../../lib/api-clients';
 
 interface MultiDAOSelectorProps {
   selectedDAOs: number[];
@@ -16,6 +18,8 @@ export const MultiDAOSelector: React.FC<MultiDAOSelectorProps> = ({
 }) => {
   const { data, isLoading, error } = useDAOs();
   const [searchTerm, setSearchTerm] = useState('');
+  // Searches every DAO, not only the page loaded above
+  const { data: suggestions } = useDAOSuggestions(searchTerm, Math.min(maxItems, 50));
   
   useEffect(() => {
     // Auto-select first 5 DAOs if nothing is selected yet
@@ -27,7 +31,8 @@ export const MultiDAOSelector: React.FC<MultiDAOSelectorProps> = ({
   if (isLoading) return <div>Loading DAOs...</div>;
   if (error) return <div className="text-red-500">Error loading DAOs</div>;
 
-  const filteredDAOs = data?.filter(dao => 
+  // Filter the loaded DAOs locally until the suggestions arrive
+  const filteredDAOs: DAOSuggestion[] = (searchTerm.trim() && suggestions) || data?.filter(dao => 
     dao.name.toLowerCase().includes(searchTerm.toLowerCase())
   ) || [];
 
@@ -69,6 +69,48 @@ export const EnhancedMetricsSchema = z.object({
 
 export type EnhancedMetrics = z.infer<typeof EnhancedMetricsSchema>;
 
+// Metric History Types (columns encoding: one array per field, aligned with timestamps)
+export const MetricHistoryColumnsSchema = z.object({
+  dao_id: z.number(),
+  dao_name: z.string(),
+  metric: z.string(),
+  bucket: z.enum(['day', 'week', 'month']).nullable(),
+  encoding: z.literal('columns'),
+  history: z.object({
+    timestamps: z.array(z.string()),
+    fields: z.record(z.array(z.number().nullable())),
+    text_fields: z.record(z.array(z.string().nullable())),
+  }),
+});
+
+export type MetricHistoryColumns = z.infer<typeof MetricHistoryColumnsSchema>;
+
+// Batch Types
+export interface BatchSubRequest {
+  id: string;
+  // Path under the API prefix, with its query string
+  path: string;
+}
+
+export const BatchResponseSchema = z.object({
+  responses: z.array(z.object({
+    id: z.string(),
+    status: z.number(),
+    body: z.any(),
+  })),
+});
+
+export type BatchResponse = z.infer<typeof BatchResponseSchema>;
+
+// Typeahead Types
+export const DAOSuggestionSchema = z.object({
+  id: z.number(),
+  name: z.string(),
+  chain_id: z.string(),
+});
+
+export type DAOSuggestion = z.infer<typeof DAOSuggestionSchema>;
+
 // API Functions
 export async function getDAOs(
   params: {
@@ -114,6 +156,38 @@ export async function getDAOMetrics(
   return MetricResponseSchema.parse(data);
 }
 
+export async function getDAOMetricHistory(
+  id: number,
+  params: {
+    metric: string;
+    period?: string;
+    // One point per bucket; past buckets are cached server-side
+    bucket?: 'day' | 'week' | 'month';
+  }
+): Promise<MetricHistoryColumns> {
+  const queryParams = new URLSearchParams({ metric: params.metric, encoding: 'columns' });
+  
+  if (params.period) queryParams.append('period', params.period);
+  if (params.bucket) queryParams.append('bucket', params.bucket);
+  
+  const data = await fetchApi<MetricHistoryColumns>(`/daos/${id}/metrics/history?${queryParams.toString()}`);
+  return MetricHistoryColumnsSchema.parse(data);
+}
+
+// Rows of { timestamp, [field]: value } as expected by recharts' `data` prop
+export function historyToChartData(
+  history: MetricHistoryColumns['history'],
+  fields: string[] = Object.keys(history.fields)
+): Array<Record<string, string | number | null>> {
+  return history.timestamps.map((timestamp, i) => {
+    const row: Record<string, string | number | null> = { timestamp };
+    for (const field of fields) {
+      row[field] = history.fields[field]?.[i] ?? null;
+    }
+    return row;
+  });
+}
+
 export async function getEnhancedMetrics(id: number): Promise<EnhancedMetrics> {
   const data = await fetchApi<EnhancedMetrics>(`/daos/${id}/enhanced-metrics`);
   return EnhancedMetricsSchema.parse(data);
@@ -127,4 +201,23 @@ export async function pollDAOMetrics(id: number): Promise<{ task_id: string; sta
   return fetchApi<{ task_id: string; status: string; message: string }>(`/daos/${id}/poll`, {
     method: 'POST',
   });
-}
\ No newline at end of file
+}
+
+// Run several GET requests in one round trip; results are keyed by request id
+export async function batchRequests(
+  requests: BatchSubRequest[]
+): Promise<Record<string, { status: number; body: any }>> {
+  const data = await fetchApi<BatchResponse>('/batch', {
+    method: 'POST',
+    body: JSON.stringify({ requests }),
+  });
+  const { responses } = BatchResponseSchema.parse(data);
+  return Object.fromEntries(responses.map(({ id, status, body }) => [id, { status, body }]));
+}
+
+// DAOs matching a typed name or chain ID, best first, from the server's in-memory index
+export async function suggestDAOs(q: string, limit = 10): Promise<DAOSuggestion[]> {
+  const queryParams = new URLSearchParams({ q, limit: limit.toString() });
+  const data = await fetchApi<DAOSuggestion[]>(`/daos/suggest?${queryParams.toString()}`);
+  return z.array(DAOSuggestionSchema).parse(data);
+}
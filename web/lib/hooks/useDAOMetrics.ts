@@ -1,7 +1,15 @@
 // lib/hooks/useDAOMetrics.ts
-import { useQuery } from '@tanstack/react-query';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
+import { useMetricsEvents } from './useMetricsEvents';
 
 export function useDAOMetrics(id: number) {
+  const queryClient = useQueryClient();
+
+  // Refetch when ingestion commits new metrics for this DAO, instead of polling
+  useMetricsEvents(id ? [id] : null, () => {
+    queryClient.invalidateQueries({ queryKey: ['dao', id, 'metrics'] });
+  });
+
   return useQuery({
     queryKey: ['dao', id, 'metrics'],
     queryFn: async () => {
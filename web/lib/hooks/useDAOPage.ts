@@ -0,0 +1,30 @@
+// lib/hooks/useDAOPage.ts
+import { useQuery, useQueryClient } from '@tanstack/react-query';
+import { batchRequests } from '../api-clients';
+
+// Loads the DAO and its enhanced metrics in one batch request, and seeds the
+// caches of useDAO and useDAOMetrics so that the page's charts render
+// without fetching again
+export function useDAOPage(id: number) {
+  const queryClient = useQueryClient();
+
+  return useQuery({
+    queryKey: ['dao', id],
+    queryFn: async () => {
+      const results = await batchRequests([
+        { id: 'dao', path: `/daos/${id}` },
+        { id: 'metrics', path: `/daos/${id}/enhanced_metrics` },
+      ]);
+
+      if (results.metrics.status === 200) {
+        queryClient.setQueryData(['dao', id, 'metrics'], results.metrics.body);
+      }
+      if (results.dao.status !== 200) {
+        throw new Error(`API returned ${results.dao.status}: ${JSON.stringify(results.dao.body)}`);
+      }
+      return results.dao.body;
+    },
+    enabled: Boolean(id),
+    retry: 1, // Only retry once to avoid flooding with requests
+  });
+}
@@ -0,0 +1,17 @@
+// lib/hooks/useDAOSuggestions.ts
+import { useQuery } from '@tanstack/react-query';
+import { suggestDAOs } from '../api-clients';
+import { useDebounce } from './useDebounce';
+
+// Typeahead suggestions for a search input; keystrokes are debounced and
+// each distinct query is fetched once
+export function useDAOSuggestions(searchTerm: string, limit = 10) {
+  const q = useDebounce(searchTerm.trim(), 150);
+
+  return useQuery({
+    queryKey: ['dao-suggestions', q, limit],
+    queryFn: () => suggestDAOs(q, limit),
+    enabled: q.length > 0,
+    staleTime: 60 * 1000,
+  });
+}
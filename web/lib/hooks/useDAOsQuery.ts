@@ -1,7 +1,8 @@
 "use client"
 
-import { useQuery } from '@tanstack/react-query';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { useDebounce } from './useDebounce';
+import { useMetricsEvents } from './useMetricsEvents';
 
 interface DAO {
   id: number;
@@ -142,6 +143,12 @@ export function useDAOsQuery(options: UseDAOsOptions = {}) {
     enabled: !options.searchQuery || debouncedSearchQuery === options.searchQuery
   });
   
+  // Refetch the list when ingestion commits new metrics for a listed DAO
+  const queryClient = useQueryClient();
+  useMetricsEvents(data ? data.items.map(dao => dao.id) : null, () => {
+    queryClient.invalidateQueries({ queryKey: ['daos'] });
+  });
+  
   return {
     data: data?.items || null,
     totalCount: data?.total_count || 0,
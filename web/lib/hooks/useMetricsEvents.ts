@@ -0,0 +1,60 @@
+"use client"
+
+import { useEffect, useRef } from 'react';
+
+export interface RunCommittedEvent {
+  event: 'run_committed';
+  dao_id: number;
+  run_id: number;
+}
+
+/**
+ * Subscribe to the API's Server-Sent Events stream and call `onRunCommitted`
+ * whenever a new metric run is committed for one of `daoIds` (all DAOs when
+ * `daoIds` is undefined). Events arriving within `coalesceMs` of each other
+ * are delivered as one call, so a batch import triggers a single refetch.
+ * Pass `null` to stay disconnected, e.g. until the DAO IDs are known.
+ */
+export function useMetricsEvents(
+  daoIds: number[] | null | undefined,
+  onRunCommitted: (daoIds: number[]) => void,
+  coalesceMs = 1000
+) {
+  const callbackRef = useRef(onRunCommitted);
+  callbackRef.current = onRunCommitted;
+
+  // Reconnect only when the set of DAO IDs changes, not on every render
+  const idsKey = daoIds === undefined ? '*' : daoIds === null ? null : [...daoIds].sort((a, b) => a - b).join(',');
+
+  useEffect(() => {
+    if (idsKey === null || idsKey === '' || typeof window === 'undefined' || !('EventSource' in window)) {
+      return;
+    }
+
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
+    const query = idsKey === '*' ? '' : `?dao_ids=${idsKey}`;
+    const source = new EventSource(`${apiUrl}/events${query}`);
+
+    let pending = new Set<number>();
+    let timer: ReturnType<typeof setTimeout> | null = null;
+
+    source.addEventListener('run_committed', (message) => {
+      const event: RunCommittedEvent = JSON.parse((message as MessageEvent).data);
+      pending.add(event.dao_id);
+      if (timer === null) {
+        timer = setTimeout(() => {
+          const changed = Array.from(pending);
+          pending = new Set<number>();
+          timer = null;
+          callbackRef.current(changed);
+        }, coalesceMs);
+      }
+    });
+
+    // EventSource reconnects by itself after errors
+    return () => {
+      if (timer !== null) clearTimeout(timer);
+      source.close();
+    };
+  }, [idsKey, coalesceMs]);
+}